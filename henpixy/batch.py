@@ -0,0 +1,367 @@
+"""
+Henpixy em lote: aplica um pipeline de ferramentas a vários arquivos, sem interface gráfica
+
+Uso:
+    henpixy-batch pipeline.json "entrada/*.png" -o saida [-j 8] [--format png]
+
+Este módulo não importa o PySide6 e pode ser usado em servidores sem display.
+Os processos do pool decodificam, processam e gravam os arquivos eles mesmos;
+imagens já carregadas na memória (process_images) são transferidas por
+memória compartilhada.
+"""
+
+import argparse
+import glob
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from henpixy.core.loaders import save_image
+from henpixy.core.pipeline import Pipeline
+from henpixy.core.prefetch import PrefetchReader
+from henpixy.core.shared_image import SharedImage
+
+# Tarefas enviadas ao pool por processo, além das em execução: limita a
+# quantidade de arquivos em andamento sem deixar os processos ociosos
+PENDING_PER_WORKER = 2
+
+# Arquivos por tarefa do pool: cada processo decodifica os próximos arquivos
+# de sua tarefa enquanto processa o atual
+FILES_PER_TASK = 4
+
+# Pipeline de cada processo do pool, criado uma única vez por init_worker: as
+# tabelas de busca compostas (Pipeline.apply_stage) são reaproveitadas entre os arquivos
+_worker_pipeline = None
+
+def init_worker(pipeline_data):
+    """
+    Prepara um processo do pool (executado uma vez por processo)
+    
+    Args:
+        pipeline_data (dict): A descrição do pipeline (Pipeline.to_dict)
+    """
+    global _worker_pipeline
+    _worker_pipeline = Pipeline.from_dict(pipeline_data)
+
+def process_files(tasks):
+    """
+    Decodifica, processa e grava um grupo de arquivos (executado nos processos do pool)
+    
+    Enquanto um arquivo é processado e gravado, os seguintes do grupo já são
+    lidos e decodificados por uma thread (PrefetchReader). Apenas os caminhos
+    e as estatísticas atravessam a fronteira entre os processos; as imagens
+    são lidas e gravadas pelo próprio processo.
+    
+    Args:
+        tasks (list): Pares (arquivo de entrada, arquivo de saída)
+    
+    Returns:
+        list: Para cada arquivo, (pixels processados, tempo de processamento e
+              gravação em segundos, mensagem de erro ou None)
+    """
+    results = []
+    with PrefetchReader([input_path for input_path, _ in tasks]) as reader:
+        for (_, image, error), (_, output_path) in zip(reader, tasks):
+            if error is not None:
+                results.append((0, 0.0, str(error)))
+                continue
+            
+            start = time.perf_counter()
+            try:
+                save_image(_worker_pipeline.apply(image), output_path)
+            except Exception as e:
+                results.append((0, 0.0, str(e)))
+                continue
+            results.append((image.width * image.height, time.perf_counter() - start, None))
+    return results
+
+def process_shared(descriptor):
+    """
+    Aplica o pipeline a uma imagem em memória compartilhada (executado nos processos do pool)
+    
+    Args:
+        descriptor (tuple): O descritor do bloco com a imagem de entrada
+    
+    Returns:
+        tuple: O descritor de um novo bloco com o resultado, a ser liberado por quem o receber
+    """
+    source = SharedImage.attach(descriptor)
+    try:
+        result = _worker_pipeline.apply(source.to_image())
+        output = SharedImage.create(result)
+        # O resultado pode usar os pixels do bloco de entrada (pipeline sem efeito)
+        del result
+    finally:
+        source.close()
+    
+    output.close()
+    return output.descriptor
+
+def expand_inputs(patterns):
+    """
+    Expande os padrões glob de entrada
+    
+    Args:
+        patterns (list): Padrões glob ou caminhos de arquivos
+    
+    Returns:
+        list: Os arquivos encontrados, sem repetições, na ordem dos padrões
+    """
+    files = []
+    seen = set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                files.append(path)
+    return files
+
+def output_path_for(input_path, output_dir, output_format=None, suffix=""):
+    """
+    Define o arquivo de saída de um arquivo de entrada
+    
+    Args:
+        input_path (str): Arquivo de entrada
+        output_dir (str): Diretório de saída
+        output_format (str, optional): Extensão de saída (por exemplo, "png"). Se
+                                       None, mantém a extensão da entrada.
+        suffix (str): Texto acrescentado ao nome do arquivo
+    
+    Returns:
+        str: O caminho do arquivo de saída
+    """
+    base, extension = os.path.splitext(os.path.basename(input_path))
+    if output_format:
+        extension = "." + output_format.lstrip(".")
+    return os.path.join(output_dir, f"{base}{suffix}{extension}")
+
+def is_same_file(first_path, second_path):
+    """
+    Verifica se dois caminhos levam ao mesmo arquivo
+    
+    Args:
+        first_path (str): O primeiro caminho
+        second_path (str): O segundo caminho, que pode ainda não existir
+    
+    Returns:
+        bool: True se os caminhos forem iguais ou indicarem o mesmo arquivo existente
+    """
+    if os.path.normcase(os.path.abspath(first_path)) == os.path.normcase(os.path.abspath(second_path)):
+        return True
+    try:
+        return os.path.samefile(first_path, second_path)
+    except OSError:
+        return False
+
+def run_batch(pipeline, tasks, workers=None, quiet=False):
+    """
+    Processa os arquivos em paralelo em um pool de processos
+    
+    Os arquivos são enviados ao pool em grupos de até FILES_PER_TASK (ver
+    process_files) e aos poucos (no máximo PENDING_PER_WORKER grupos por
+    processo além dos em execução), de modo que a decodificação, o
+    processamento e a gravação de arquivos diferentes se sobrepõem sem
+    acumular resultados na memória.
+    
+    Args:
+        pipeline (Pipeline): O pipeline
+        tasks (list): Pares (arquivo de entrada, arquivo de saída)
+        workers (int, optional): Quantidade de processos. Se None, usa os.cpu_count().
+        quiet (bool): Se True, não exibe uma linha por arquivo
+    
+    Returns:
+        dict: Estatísticas com "processed", "failed", "pixels" e "elapsed" (segundos)
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"processed": 0, "failed": 0, "pixels": 0, "elapsed": 0.0}
+    
+    # Grupos menores quando há poucos arquivos, para ocupar todos os processos
+    total = len(tasks)
+    group_size = max(1, min(FILES_PER_TASK, math.ceil(total / workers)))
+    groups = (tasks[start:start + group_size] for start in range(0, total, group_size))
+    
+    start = time.perf_counter()
+    pending = {}
+    done_count = 0
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(pipeline.to_dict(),)) as executor:
+        while True:
+            # Mantém o pool abastecido
+            while len(pending) < workers * (1 + PENDING_PER_WORKER):
+                group = next(groups, None)
+                if group is None:
+                    break
+                future = executor.submit(process_files, group)
+                pending[future] = group
+            
+            if not pending:
+                break
+            
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                group = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    # Falha do processo inteiro: todos os arquivos do grupo falharam
+                    results = [(0, 0.0, str(e))] * len(group)
+                
+                for (input_path, output_path), (pixels, seconds, error) in zip(group, results):
+                    done_count += 1
+                    if error is not None:
+                        stats["failed"] += 1
+                        print(f"Erro ao processar {input_path}: {error}", file=sys.stderr)
+                        continue
+                    
+                    stats["processed"] += 1
+                    stats["pixels"] += pixels
+                    if not quiet:
+                        print(f"[{done_count}/{total}] {input_path} -> {output_path} ({seconds:.2f} s)")
+    
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+def process_images(pipeline, images, workers=None):
+    """
+    Aplica o pipeline em paralelo a imagens já carregadas na memória
+    
+    Os pixels de cada imagem são copiados para um bloco de memória
+    compartilhada (SharedImage) e o resultado volta da mesma forma, de modo
+    que apenas os descritores dos blocos são serializados entre os processos.
+    Como em run_batch, no máximo PENDING_PER_WORKER imagens por processo
+    aguardam na fila além das em execução.
+    
+    Args:
+        pipeline (Pipeline): O pipeline
+        images (iterable): As imagens, em um dos modos de SHAREABLE_MODES
+        workers (int, optional): Quantidade de processos. Se None, usa os.cpu_count().
+    
+    Yields:
+        PIL.Image.Image: Os resultados, na ordem das imagens de entrada
+    
+    Raises:
+        ValueError: Se uma imagem estiver em um modo não suportado
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = []
+    remaining = iter(images)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(pipeline.to_dict(),)) as executor:
+        try:
+            while True:
+                # Mantém o pool abastecido
+                while len(pending) < workers * (1 + PENDING_PER_WORKER):
+                    image = next(remaining, None)
+                    if image is None:
+                        break
+                    source = SharedImage.create(image)
+                    pending.append((executor.submit(process_shared, source.descriptor), source))
+                
+                if not pending:
+                    break
+                
+                # Os resultados são entregues em ordem
+                future, source = pending.pop(0)
+                try:
+                    output = SharedImage.attach(future.result())
+                finally:
+                    source.unlink()
+                result = output.read_image()
+                output.unlink()
+                yield result
+        finally:
+            # Interrupção ou erro: libera os blocos ainda pendentes
+            for future, source in pending:
+                future.cancel()
+                if not future.cancelled() and future.exception() is None:
+                    SharedImage.attach(future.result()).unlink()
+                source.unlink()
+
+def format_throughput(stats):
+    """
+    Formata as estatísticas de um processamento em lote
+    
+    Args:
+        stats (dict): As estatísticas retornadas por run_batch
+    
+    Returns:
+        str: O resumo, com arquivos por segundo e megapixels por segundo
+    """
+    elapsed = max(stats["elapsed"], 1e-9)
+    return (f"{stats['processed']} arquivo(s) processado(s), {stats['failed']} com erro, "
+            f"em {stats['elapsed']:.2f} s: {stats['processed'] / elapsed:.2f} arquivos/s, "
+            f"{stats['pixels'] / elapsed / 1e6:.2f} MP/s")
+
+def build_parser():
+    """
+    Cria o analisador dos argumentos da linha de comando
+    
+    Returns:
+        argparse.ArgumentParser: O analisador
+    """
+    parser = argparse.ArgumentParser(
+        prog="henpixy-batch",
+        description="Aplica um pipeline de ferramentas do Henpixy a vários arquivos de imagem."
+    )
+    parser.add_argument("pipeline", help="Arquivo JSON ou YAML com os passos do pipeline")
+    parser.add_argument("inputs", nargs="+", help="Arquivos ou padrões glob de entrada (use aspas)")
+    parser.add_argument("-o", "--output-dir", required=True, help="Diretório de saída")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Quantidade de processos (padrão: número de CPUs)")
+    parser.add_argument("-f", "--format", default=None,
+                        help="Extensão dos arquivos de saída (padrão: a mesma da entrada)")
+    parser.add_argument("-s", "--suffix", default="", help="Texto acrescentado ao nome dos arquivos de saída")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Exibe apenas o resumo final")
+    return parser
+
+def main(argv=None):
+    """
+    Ponto de entrada do henpixy-batch
+    
+    Args:
+        argv (list, optional): Argumentos da linha de comando. Se None, usa sys.argv.
+    
+    Returns:
+        int: O código de saída (0 se todos os arquivos foram processados)
+    """
+    args = build_parser().parse_args(argv)
+    
+    try:
+        pipeline = Pipeline.load(args.pipeline)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler o pipeline: {e}", file=sys.stderr)
+        return 2
+    
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("Nenhum arquivo de entrada encontrado.", file=sys.stderr)
+        return 2
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    # Arquivos de diretórios diferentes com o mesmo nome teriam a mesma saída
+    tasks = []
+    outputs = {}
+    for input_path in inputs:
+        output_path = output_path_for(input_path, args.output_dir, args.format, args.suffix)
+        if is_same_file(input_path, output_path):
+            print(f"A saída de {input_path} sobrescreveria o próprio arquivo de entrada; "
+                  "use --suffix, --format ou outro diretório de saída.", file=sys.stderr)
+            return 2
+        if output_path in outputs:
+            print(f"Ignorando {input_path}: a saída {output_path} já é usada por {outputs[output_path]}",
+                  file=sys.stderr)
+            continue
+        outputs[output_path] = input_path
+        tasks.append((input_path, output_path))
+    
+    stats = run_batch(pipeline, tasks, args.jobs, args.quiet)
+    print(format_throughput(stats))
+    return 0 if stats["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Gravação de arquivos em uma thread de segundo plano
+"""
+
+import queue
+import threading
+
+class BackgroundWriter:
+    """
+    Executa tarefas de gravação em disco, em ordem, fora da thread da interface
+    
+    As tarefas são funções enfileiradas com submit e executadas por uma única
+    thread, na ordem de chegada. A fila tem tamanho limitado: quando há
+    MAX_PENDING_TASKS tarefas pendentes, submit bloqueia até que uma delas
+    termine, o que limita a memória ocupada por imagens aguardando gravação.
+    """
+    
+    MAX_PENDING_TASKS = 8
+    
+    def __init__(self, name="henpixy-writer", max_pending=None):
+        """
+        Inicializa a thread de gravação
+        
+        Args:
+            name (str): Nome da thread
+            max_pending (int, optional): Quantidade máxima de tarefas pendentes.
+                                         Se None, usa MAX_PENDING_TASKS.
+        """
+        self._queue = queue.Queue(maxsize=max_pending or self.MAX_PENDING_TASKS)
+        
+        # Thread daemon: não impede o encerramento do processo; quem precisar
+        # garantir a gravação deve chamar flush
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def submit(self, func, *args, **kwargs):
+        """
+        Enfileira uma tarefa de gravação
+        
+        Bloqueia enquanto a fila estiver cheia.
+        
+        Args:
+            func (callable): A função a ser executada
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+        """
+        self._queue.put((func, args, kwargs))
+    
+    def flush(self):
+        """Aguarda a conclusão de todas as tarefas enfileiradas."""
+        self._queue.join()
+    
+    def pending(self):
+        """
+        Retorna a quantidade aproximada de tarefas pendentes
+        
+        Returns:
+            int: A quantidade de tarefas na fila
+        """
+        return self._queue.unfinished_tasks
+    
+    def _run(self):
+        """Laço da thread de gravação."""
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"Erro na gravação em segundo plano: {e}")
+            finally:
+                self._queue.task_done()
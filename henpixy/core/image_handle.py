@@ -0,0 +1,113 @@
+"""
+Referências imutáveis a imagens com cópia sob demanda (copy-on-write)
+"""
+
+import numpy as np
+from PIL import Image
+
+from henpixy.core.loaders import image_from_array
+from henpixy.tools.image_utils import attach_pixel_array, get_image_nbytes, get_native_layout, get_pixel_array
+
+# Modos cujos pixels o Image.frombuffer usa diretamente, sem cópia
+SHARED_MODES = ('L', 'P', 'RGBA', 'CMYK', 'I;16', 'I;16L', 'I;16B')
+
+# Tamanho aproximado (bytes) das faixas de linhas copiadas ao criar um handle
+COPY_BAND_BYTES = 4 * 1024 * 1024
+
+def _copy_pixels(image):
+    """
+    Copia os pixels de uma imagem para um buffer, em faixas de linhas
+    
+    Args:
+        image (PIL.Image.Image): A imagem, em um modo com leiaute nativo (get_native_layout)
+    
+    Returns:
+        bytearray: Os pixels, no formato de Image.tobytes
+    """
+    row_bytes = get_image_nbytes(image) // max(image.height, 1)
+    band = max(1, COPY_BAND_BYTES // max(row_bytes, 1))
+    
+    data = bytearray(row_bytes * image.height)
+    for top in range(0, image.height, band):
+        bottom = min(top + band, image.height)
+        data[top * row_bytes:bottom * row_bytes] = image.crop((0, top, image.width, bottom)).tobytes()
+    return data
+
+class ImageHandle:
+    """
+    Referência imutável aos pixels de uma imagem
+    
+    O handle guarda uma cópia própria dos pixels, feita uma única vez, que
+    nunca é alterada; a imagem recebida continua sendo do chamador e pode ser
+    alterada livremente. Nos modos de SHARED_MODES, as imagens entregues por
+    view usam diretamente os pixels do handle (Image.frombuffer); nos demais
+    modos com leiaute nativo (RGB, LA, F), o núcleo de cada view é uma cópia,
+    mas get_native_array e a exibição continuam lendo o buffer do handle,
+    associado às views (attach_pixel_array). Em ambos os casos as views são
+    somente leitura: operações que as alteram no lugar (paste, putpixel,
+    ImageDraw...) fazem antes uma cópia privada, e o acesso direto aos pixels
+    (image.load()[x, y] = valor) exige uma cópia explícita (image.copy()).
+    Nos modos restantes (1, I, PA...), cada view é uma cópia. Imagens mapeadas em memória não são
+    copiadas: as views continuam usando o arquivo.
+    """
+    
+    __slots__ = ('mode', 'size', 'nbytes', '_data', '_array', '_image', '_pixel_array', '_palette', '_info')
+    
+    def __init__(self, image):
+        """
+        Cria um handle para a imagem
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+        """
+        # Imagens abertas de arquivos só têm pixels após o carregamento
+        image.load()
+        
+        self.mode = image.mode
+        self.size = image.size
+        self.nbytes = get_image_nbytes(image)
+        self._data = None
+        self._array = None
+        self._image = None
+        self._palette = None
+        self._info = dict(image.info)
+        
+        # Imagens mapeadas em memória continuam sendo lidas do arquivo
+        self._pixel_array = get_pixel_array(image)
+        if self._pixel_array is not None:
+            return
+        
+        layout = get_native_layout(image.mode, image.size)
+        if layout is not None:
+            self._data = _copy_pixels(image)
+            self._array = np.frombuffer(self._data, dtype=layout[0]).reshape(layout[1])
+            self._array.flags.writeable = False
+            # A paleta de cada view fica em seu próprio núcleo, e putpalette não afeta as demais
+            if image.palette is not None:
+                self._palette = (image.getpalette(image.palette.mode), image.palette.mode)
+        else:
+            self._image = image.copy()
+    
+    def view(self):
+        """
+        Retorna uma imagem PIL com os pixels do handle
+        
+        A imagem pode ser lida e passada para as ferramentas livremente; alterá-la
+        não afeta o handle (ver ImageHandle).
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        if self._pixel_array is not None:
+            image = image_from_array(self._pixel_array)
+        elif self._data is not None:
+            # Sem cópia nos modos de SHARED_MODES; nos demais, o PIL copia os pixels
+            image = Image.frombuffer(self.mode, self.size, self._data, "raw", self.mode, 0, 1)
+            if self._palette is not None:
+                image.putpalette(*self._palette)
+            attach_pixel_array(image, self._array)
+        else:
+            image = self._image.copy()
+        
+        image.info.update(self._info)
+        return image
@@ -0,0 +1,167 @@
+"""
+Diário (journal) do histórico: registros JSON acrescentados ao fim de um arquivo
+"""
+
+import json
+import os
+import time
+
+class HistoryJournal:
+    """
+    Diário somente de acréscimo com o estado do histórico
+    
+    Cada alteração do histórico (novo item, truncamento, mudança do item atual,
+    limpeza) é acrescentada como uma linha JSON, com custo constante. As
+    gravações são sincronizadas com o disco (fsync) em lotes de FSYNC_BATCH
+    registros ou a cada FSYNC_INTERVAL segundos. Quando o diário acumula
+    COMPACT_THRESHOLD registros, ele é compactado: o estado completo é gravado
+    em um arquivo temporário que substitui o diário atomicamente.
+    
+    Uma linha incompleta no fim do arquivo (por exemplo, após uma queda
+    durante a gravação) é ignorada na leitura, sem perder os registros anteriores.
+    """
+    
+    FSYNC_BATCH = 16
+    FSYNC_INTERVAL = 2.0
+    COMPACT_THRESHOLD = 256
+    
+    def __init__(self, path):
+        """
+        Inicializa o diário
+        
+        Args:
+            path (str): Caminho do arquivo do diário
+        """
+        self.path = path
+        self.record_count = 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    @staticmethod
+    def empty_state():
+        """
+        Retorna o estado de um histórico vazio
+        
+        Returns:
+            dict: O estado, com "current_index" e "items"
+        """
+        return {"current_index": -1, "items": []}
+    
+    @staticmethod
+    def apply_record(state, record):
+        """
+        Aplica um registro do diário a um estado
+        
+        Args:
+            state (dict): O estado, alterado no lugar
+            record (dict): O registro
+        """
+        kind = record.get("type")
+        if kind == "state":
+            state["current_index"] = record["current_index"]
+            state["items"] = list(record["items"])
+        elif kind == "add":
+            del state["items"][record["position"]:]
+            state["items"].append(record["item"])
+            state["current_index"] = record["position"]
+        elif kind == "index":
+            state["current_index"] = record["current_index"]
+        elif kind == "clear":
+            state["current_index"] = -1
+            state["items"] = []
+    
+    def read_state(self):
+        """
+        Reconstrói o estado do histórico a partir do diário
+        
+        Returns:
+            dict: O estado, com "current_index" e "items"
+        """
+        state = self.empty_state()
+        self.record_count = 0
+        
+        if not os.path.exists(self.path):
+            return state
+        
+        valid_length = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError as e:
+                    print(f"Erro ao ler registro do diário do histórico: {e}")
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_length += len(line)
+                    continue
+                
+                # Uma última linha sem quebra também pode estar incompleta
+                if not line.endswith(b"\n"):
+                    break
+                
+                self.apply_record(state, record)
+                self.record_count += 1
+                valid_length += len(line)
+        
+        # Remove a linha incompleta deixada por uma gravação interrompida, para
+        # que os próximos registros não sejam acrescentados a ela
+        if valid_length < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_length)
+        
+        return state
+    
+    def append(self, record):
+        """
+        Acrescenta um registro ao diário
+        
+        Args:
+            record (dict): O registro
+        """
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self.record_count += 1
+        self._unsynced += 1
+        
+        if (self._unsynced >= self.FSYNC_BATCH
+                or time.monotonic() - self._last_sync >= self.FSYNC_INTERVAL):
+            self.sync()
+    
+    def sync(self):
+        """Sincroniza com o disco os registros ainda não sincronizados."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def compact(self, state):
+        """
+        Substitui o diário por um único registro com o estado completo
+        
+        Args:
+            state (dict): O estado atual do histórico
+        """
+        self.close()
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            record = {"type": "state", "current_index": state["current_index"], "items": state["items"]}
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        
+        self.record_count = 1
+    
+    def close(self):
+        """Sincroniza e fecha o arquivo do diário."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,322 @@
+"""
+Abertura de arquivos de imagem: versão reduzida rápida para JPEGs grandes e
+mapeamento em memória de TIFFs sem compressão, arquivos .npy e dados brutos
+"""
+
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from henpixy.tools.image_utils import register_pixel_array, get_native_array
+
+# Tamanho máximo da versão reduzida exibida enquanto a imagem completa é decodificada
+DRAFT_MAX_SIZE = (2048, 2048)
+
+# Extensões dos arquivos de imagem que podem ser abertos sem informações adicionais
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.tif', '.webp',
+                    '.ico', '.psd', '.xbm', '.xpm', '.npy')
+
+# Extensões de arquivos de pixels brutos, sem cabeçalho (formato informado pelo usuário)
+RAW_EXTENSIONS = ('.raw', '.bin')
+
+# Tipos de amostra aceitos para dados brutos: nome -> dtype numpy
+RAW_DTYPES = {
+    "uint8": "|u1",
+    "uint16 (little-endian)": "<u2",
+    "uint16 (big-endian)": ">u2",
+    "float32": "<f4",
+}
+
+# Modos brutos de TIFFs sem compressão que podem ser mapeados: modo -> (dtype numpy, canais)
+_TIFF_RAW_LAYOUTS = {
+    'L': ('|u1', 1),
+    'LA': ('|u1', 2),
+    'RGB': ('|u1', 3),
+    'RGBA': ('|u1', 4),
+    'I;16': ('<u2', 1),
+    'I;16B': ('>u2', 1),
+    'F;32F': ('<f4', 1),
+}
+
+def open_draft(path, max_size=DRAFT_MAX_SIZE):
+    """
+    Decodifica rapidamente uma versão reduzida de um JPEG grande
+    
+    O decodificador JPEG pode produzir a imagem diretamente em escala 1/2,
+    1/4 ou 1/8 (Image.draft), pulando a maior parte do trabalho da
+    decodificação completa. Outros formatos precisam ser decodificados por
+    inteiro antes de qualquer redução, então não têm versão reduzida.
+    
+    Args:
+        path (str): Caminho do arquivo
+        max_size (tuple): Tamanho (largura, altura) a partir do qual a versão
+                          reduzida é criada
+    
+    Returns:
+        tuple: (imagem reduzida, tamanho (largura, altura) da imagem completa),
+               ou None se o arquivo não for um JPEG maior que max_size
+    """
+    image = Image.open(path)
+    if image.format != "JPEG" or (image.width <= max_size[0] and image.height <= max_size[1]):
+        image.close()
+        return None
+    
+    full_size = image.size
+    
+    # O decodificador escolhe a menor escala que ainda tenha pelo menos o tamanho pedido
+    factor = max(math.ceil(image.width / max_size[0]), math.ceil(image.height / max_size[1]))
+    image.draft(image.mode, (image.width // factor, image.height // factor))
+    
+    # O carregamento fecha o arquivo; os pixels continuam disponíveis
+    image.load()
+    return image, full_size
+
+def load_image(path):
+    """
+    Abre e decodifica por completo um arquivo de imagem
+    
+    Ao contrário de Image.open, que só lê o cabeçalho, os pixels são
+    decodificados aqui, de modo que a função pode ser executada fora da
+    thread da interface.
+    
+    Args:
+        path (str): Caminho do arquivo
+    
+    Returns:
+        PIL.Image.Image: A imagem carregada
+    """
+    image = Image.open(path)
+    image.load()
+    return image
+
+def list_image_files(directory):
+    """
+    Lista os arquivos de imagem de uma pasta
+    
+    Args:
+        directory (str): Caminho da pasta
+    
+    Returns:
+        list: Os caminhos dos arquivos com extensões em IMAGE_EXTENSIONS, em ordem alfabética
+    """
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory), key=str.lower)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+            and os.path.isfile(os.path.join(directory, name))]
+
+def is_raw_file(path):
+    """
+    Verifica se um arquivo contém pixels brutos, sem cabeçalho
+    
+    Args:
+        path (str): Caminho do arquivo
+    
+    Returns:
+        bool: True se a extensão estiver em RAW_EXTENSIONS
+    """
+    return os.path.splitext(path)[1].lower() in RAW_EXTENSIONS
+
+def map_raw_array(path, width, height, channels=1, dtype="uint8", offset=0):
+    """
+    Mapeia em memória um arquivo de pixels brutos
+    
+    Args:
+        path (str): Caminho do arquivo
+        width (int): Largura da imagem
+        height (int): Altura da imagem
+        channels (int): Quantidade de canais (1, 3 ou 4), intercalados
+        dtype (str): Tipo das amostras, uma das chaves de RAW_DTYPES
+        offset (int): Bytes ignorados no início do arquivo
+    
+    Returns:
+        numpy.memmap: Os pixels, somente leitura, com o formato (altura, largura[, canais])
+    
+    Raises:
+        ValueError: Se o tipo for desconhecido ou o arquivo for menor que o formato informado
+    """
+    if dtype not in RAW_DTYPES:
+        raise ValueError(f"Tipo de amostra desconhecido: {dtype}")
+    
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    dtype = np.dtype(RAW_DTYPES[dtype])
+    
+    expected = offset + int(np.prod(shape)) * dtype.itemsize
+    file_size = os.path.getsize(path)
+    if expected > file_size:
+        raise ValueError(f"O arquivo tem {file_size} bytes, mas o formato informado requer {expected}")
+    
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+def map_tiff_array(path):
+    """
+    Mapeia em memória os pixels de um TIFF sem compressão
+    
+    O arquivo é mapeado se tiver uma única página cujas faixas (strips)
+    ocupem a largura inteira, estejam em sequência no arquivo e usem um dos
+    leiautes de _TIFF_RAW_LAYOUTS (amostras intercaladas).
+    
+    Args:
+        path (str): Caminho do arquivo
+    
+    Returns:
+        numpy.memmap: Os pixels, somente leitura, ou None se o arquivo não puder ser mapeado
+    """
+    with Image.open(path) as image:
+        if image.format != "TIFF" or getattr(image, "n_frames", 1) != 1 or not image.tile:
+            return None
+        width, height = image.size
+        tiles = sorted(image.tile, key=lambda tile: tile[1][1])
+    
+    rawmode = tiles[0][3][0]
+    layout = _TIFF_RAW_LAYOUTS.get(rawmode)
+    if layout is None:
+        return None
+    
+    dtype = np.dtype(layout[0])
+    channels = layout[1]
+    row_bytes = width * channels * dtype.itemsize
+    start = tiles[0][2]
+    
+    # Cada faixa deve começar logo após a anterior: (0, y0, largura, y1) em start + y0 * row_bytes
+    next_row = 0
+    for codec, extents, offset, args in tiles:
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        if (codec != "raw" or args[0] != rawmode or stride not in (0, row_bytes) or orientation != 1
+                or extents[0] != 0 or extents[2] != width or extents[1] != next_row
+                or offset != start + next_row * row_bytes):
+            return None
+        next_row = extents[3]
+    
+    if next_row != height or start + height * row_bytes > os.path.getsize(path):
+        return None
+    
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    return np.memmap(path, dtype=dtype, mode="r", offset=start, shape=shape)
+
+def map_image_array(path, raw_format=None):
+    """
+    Mapeia em memória os pixels de um arquivo, se o formato permitir
+    
+    Args:
+        path (str): Caminho do arquivo
+        raw_format (dict, optional): Formato de um arquivo de pixels brutos, com os
+                                     argumentos de map_raw_array (width, height,
+                                     channels, dtype, offset)
+    
+    Returns:
+        numpy.ndarray: Os pixels mapeados, ou None se o arquivo não puder ser mapeado
+    """
+    if raw_format is not None:
+        return map_raw_array(path, **raw_format)
+    
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return np.load(path, mmap_mode="r")
+    if extension in (".tif", ".tiff"):
+        return map_tiff_array(path)
+    return None
+
+def image_from_array(array):
+    """
+    Cria uma imagem PIL que usa os pixels de um array (mapeado em memória)
+    
+    Nos modos L, RGBA e I;16 a imagem usa diretamente a memória do array;
+    nos demais (RGB, LA, F), o Pillow guarda os pixels em seu próprio
+    leiaute e eles são copiados, sem decodificação. Em todos os casos o
+    array é associado à imagem (register_pixel_array), e as ferramentas
+    leem os pixels dele sem cópia.
+    
+    Args:
+        array (numpy.ndarray): Os pixels, com o formato (altura, largura[, canais])
+    
+    Returns:
+        PIL.Image.Image: A imagem
+    
+    Raises:
+        ValueError: Se o tipo ou o formato do array não tiver modo correspondente
+    """
+    if array.ndim not in (2, 3):
+        raise ValueError(f"Formato de array não suportado: {array.shape}")
+    channels = 1 if array.ndim == 2 else array.shape[2]
+    
+    if array.dtype == np.uint8 and channels in (1, 2, 3, 4):
+        mode = {1: 'L', 2: 'LA', 3: 'RGB', 4: 'RGBA'}[channels]
+        rawmode = mode
+    elif array.dtype.kind == 'u' and array.dtype.itemsize == 2 and channels == 1:
+        mode = rawmode = 'I;16B' if array.dtype.byteorder == '>' else 'I;16'
+    elif array.dtype == np.float32 and array.dtype.isnative and channels == 1:
+        mode = rawmode = 'F'
+    else:
+        raise ValueError(f"Tipo de array não suportado: {array.dtype} com {channels} canais")
+    
+    if not array.flags.c_contiguous:
+        array = np.ascontiguousarray(array)
+    
+    height, width = array.shape[:2]
+    image = Image.frombuffer(mode, (width, height), array, "raw", rawmode, 0, 1)
+    register_pixel_array(image, array)
+    return image
+
+def open_mapped(path, raw_format=None):
+    """
+    Abre um arquivo por mapeamento em memória, sem decodificar os pixels
+    
+    Args:
+        path (str): Caminho do arquivo
+        raw_format (dict, optional): Formato de um arquivo de pixels brutos (ver map_image_array)
+    
+    Returns:
+        PIL.Image.Image: A imagem, ou None se o arquivo não puder ser mapeado
+    """
+    array = map_image_array(path, raw_format)
+    if array is None:
+        return None
+    return image_from_array(array)
+
+def open_image(path):
+    """
+    Abre um arquivo por mapeamento em memória, se o formato permitir, ou o decodifica por completo
+    
+    Args:
+        path (str): Caminho do arquivo (exceto pixels brutos, que exigem o formato)
+    
+    Returns:
+        PIL.Image.Image: A imagem carregada
+    """
+    image = open_mapped(path)
+    return image if image is not None else load_image(path)
+
+def save_image(image, path):
+    """
+    Grava uma imagem substituindo o arquivo de destino de uma só vez
+    
+    A imagem é gravada em um arquivo temporário no mesmo diretório, que
+    substitui o destino com os.replace. Assim, sobrescrever o arquivo de
+    onde a imagem foi aberta por mapeamento em memória não altera as páginas
+    ainda mapeadas (o arquivo antigo continua existindo até ser desmapeado).
+    
+    Arquivos .npy são gravados com numpy.save, com os pixels no formato de
+    get_native_array (imagens com paleta são convertidas para RGB ou RGBA).
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+        path (str): Caminho do arquivo; o formato é definido pela extensão
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    base, extension = os.path.splitext(name)
+    temp_path = os.path.join(directory, f".{base}.tmp-{os.getpid()}{extension}")
+    try:
+        if extension.lower() == '.npy':
+            if image.mode in ('P', 'PA'):
+                image = image.convert('RGBA' if image.mode == 'PA' or 'transparency' in image.info else 'RGB')
+            with open(temp_path, "wb") as f:
+                np.save(f, get_native_array(image))
+        else:
+            image.save(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,159 @@
+"""
+Registro das operações de processamento que podem ser reaplicadas a partir de seus parâmetros
+"""
+
+import inspect
+from functools import lru_cache
+
+from henpixy.tools.intensity import zero_intensity
+from henpixy.tools.negative import negative
+from henpixy.tools.power import power_transform
+from henpixy.tools.contrast_stretching import contrast_stretching
+from henpixy.tools.bit_plane_slicing import extract_bit_plane, reconstruct_from_bit_planes
+from henpixy.tools.histogram import equalize_histogram
+from henpixy.tools.pseudocolor import intensity_slicing
+from henpixy.tools.spatial_filtering import mean_filter, min_filter, max_filter, median_filter, laplacian_filter
+
+def _equalize_histogram_image(image):
+    """
+    Equaliza o histograma retornando apenas a imagem
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        PIL.Image.Image: A imagem equalizada
+    """
+    return equalize_histogram(image)[0]
+
+@lru_cache(maxsize=None)
+def _supports_progress(function):
+    """
+    Verifica se a função de uma operação aceita progresso e cancelamento
+    
+    Args:
+        function (callable): A função da operação
+    
+    Returns:
+        bool: True se a função aceita os argumentos progress e cancel_token
+    """
+    parameters = inspect.signature(function).parameters
+    return "progress" in parameters and "cancel_token" in parameters
+
+# Operações registradas: nome -> (função, barata)
+# Operações baratas (transformações ponto a ponto) podem ser recalculadas a
+# qualquer momento; as demais (filtros espaciais) são custosas demais para
+# serem reaplicadas com frequência.
+OPERATIONS = {
+    "zero_intensity": (zero_intensity, True),
+    "negative": (negative, True),
+    "power_transform": (power_transform, True),
+    "contrast_stretching": (contrast_stretching, True),
+    "extract_bit_plane": (extract_bit_plane, True),
+    "reconstruct_from_bit_planes": (reconstruct_from_bit_planes, True),
+    "equalize_histogram": (_equalize_histogram_image, True),
+    "intensity_slicing": (intensity_slicing, True),
+    "mean_filter": (mean_filter, False),
+    "min_filter": (min_filter, False),
+    "max_filter": (max_filter, False),
+    "median_filter": (median_filter, False),
+    "laplacian_filter": (laplacian_filter, False),
+}
+
+class Operation:
+    """Uma operação registrada e seus parâmetros"""
+    
+    def __init__(self, name, **params):
+        """
+        Inicializa a operação
+        
+        Args:
+            name (str): Nome da operação em OPERATIONS
+            **params: Parâmetros passados à função da operação
+        
+        Raises:
+            ValueError: Se a operação não estiver registrada
+        """
+        if name not in OPERATIONS:
+            raise ValueError(f"Operação desconhecida: {name}")
+        
+        self.name = name
+        self.params = params
+    
+    def validate(self):
+        """
+        Verifica se os parâmetros correspondem aos da função da operação
+        
+        Apenas os nomes dos parâmetros são verificados: valores inválidos só
+        são detectados ao aplicar a operação.
+        
+        Raises:
+            ValueError: Se faltar um parâmetro obrigatório ou houver um parâmetro desconhecido
+        """
+        function = OPERATIONS[self.name][0]
+        try:
+            inspect.signature(function).bind(None, **self.params)
+        except TypeError as e:
+            raise ValueError(f"Parâmetros inválidos para a operação {self.name}: {e}") from None
+    
+    @property
+    def is_cheap(self):
+        """
+        Indica se a operação é barata o suficiente para ser recalculada
+        
+        Returns:
+            bool: True para transformações ponto a ponto
+        """
+        return OPERATIONS[self.name][1]
+    
+    def apply(self, image, progress=None, cancel_token=None):
+        """
+        Aplica a operação a uma imagem
+        
+        Funções que não informam progresso só verificam o cancelamento antes
+        de começar.
+        
+        Args:
+            image (PIL.Image.Image): A imagem de entrada
+            progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+            cancel_token (CancellationToken, optional): Interrompe a operação se for cancelada
+        
+        Returns:
+            PIL.Image.Image: A imagem resultante
+        
+        Raises:
+            OperationCancelled: Se o cancelamento for solicitado
+        """
+        function = OPERATIONS[self.name][0]
+        if _supports_progress(function):
+            return function(image, progress=progress, cancel_token=cancel_token, **self.params)
+        
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        return function(image, **self.params)
+    
+    def to_dict(self):
+        """
+        Converte a operação para um dicionário
+        
+        Returns:
+            dict: Representação da operação como dicionário
+        """
+        return {"name": self.name, "params": self.params}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Cria uma operação a partir de um dicionário
+        
+        Args:
+            data (dict): Dicionário com os dados da operação
+        
+        Returns:
+            Operation: A operação criada
+        """
+        return cls(data["name"], **data.get("params", {}))
+    
+    def __repr__(self):
+        params = ", ".join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"Operation({self.name!r}, {params})" if params else f"Operation({self.name!r})"
@@ -0,0 +1,309 @@
+"""
+Pipelines: sequências de operações registradas, descritas em JSON ou YAML, e
+sua execução otimizada
+"""
+
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from henpixy.core.operations import Operation
+from henpixy.tools.cancellation import check_progress
+from henpixy.tools.image_utils import get_native_array, array_to_image
+
+# Transformações ponto a ponto: cada amostra do resultado depende apenas da
+# amostra de entrada no mesmo canal, então sequências delas podem ser
+# compostas em uma única tabela de busca
+POINT_OPERATIONS = frozenset({"zero_intensity", "negative", "power_transform", "contrast_stretching"})
+
+# Filtros de janela, que não alteram a imagem com janela 1x1
+WINDOW_FILTERS = frozenset({"mean_filter", "min_filter", "max_filter", "median_filter"})
+
+# Modos mantidos pelos filtros de janela; nos demais (LA, P, 1, I;16B, ...)
+# os filtros convertem a imagem, mesmo com janela 1x1
+_FILTER_MODES = ('L', 'RGB', 'RGBA', 'I', 'I;16', 'F')
+
+# Modos em que as transformações ponto a ponto são compostas: modo -> níveis por canal
+_LUT_LEVELS = {
+    'L': 256,
+    'LA': 256,
+    'RGB': 256,
+    'RGBA': 256,
+    'I;16': 65536,
+    'I;16L': 65536,
+    'I;16B': 65536,
+}
+
+def is_no_op(operation, mode):
+    """
+    Verifica se uma operação não altera as imagens de um modo
+    
+    Args:
+        operation (Operation): A operação
+        mode (str): O modo da imagem de entrada
+    
+    Returns:
+        bool: True para filtros de janela com kernel_size 1 em modos que os
+              filtros mantêm
+    """
+    return (operation.name in WINDOW_FILTERS and operation.params.get("kernel_size", 3) == 1
+            and mode in _FILTER_MODES)
+
+def compose_point_operations(operations, mode):
+    """
+    Compõe uma sequência de transformações ponto a ponto em uma tabela de busca
+    
+    As operações são aplicadas, em ordem, a uma rampa com todos os níveis do
+    modo (256 ou 65536) em cada canal; o resultado é a tabela que leva cada
+    nível de entrada ao nível final, com o mesmo arredondamento da aplicação
+    passo a passo.
+    
+    Args:
+        operations (list): As operações, todas de POINT_OPERATIONS
+        mode (str): O modo das imagens de entrada
+    
+    Returns:
+        tuple: (tabela com o formato (níveis, canais), modo do resultado), ou
+               None se o modo não permitir a composição
+    """
+    levels = _LUT_LEVELS.get(mode)
+    if levels is None:
+        return None
+    
+    bands = Image.getmodebands(mode)
+    ramp = np.arange(levels, dtype=np.uint8 if levels == 256 else np.uint16)
+    ramp_array = ramp[np.newaxis, :] if bands == 1 else np.repeat(ramp[np.newaxis, :, np.newaxis], bands, axis=2)
+    
+    image = array_to_image(ramp_array, mode)
+    for operation in operations:
+        image = operation.apply(image)
+    
+    # A tabela só vale se o resultado tiver os mesmos níveis e canais da entrada
+    if (image.size != (levels, 1) or _LUT_LEVELS.get(image.mode) != levels
+            or len(image.getbands()) != bands):
+        return None
+    return get_native_array(image).reshape(levels, bands), image.mode
+
+def apply_lookup_table(image, lut, mode):
+    """
+    Aplica uma tabela de busca por canal a uma imagem
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+        lut (numpy.ndarray): A tabela, com o formato (níveis, canais)
+        mode (str): O modo do resultado
+    
+    Returns:
+        PIL.Image.Image: A imagem resultante
+    """
+    image_array = get_native_array(image)
+    if lut.shape[1] == 1:
+        result = lut[:, 0][image_array]
+    else:
+        result = np.empty_like(image_array)
+        for band in range(lut.shape[1]):
+            result[:, :, band] = lut[:, band][image_array[:, :, band]]
+    return array_to_image(result, mode)
+
+class Pipeline:
+    """
+    Sequência ordenada de operações aplicadas a uma imagem
+    
+    A descrição de um pipeline é um dicionário com a lista de passos, cada um
+    com o nome de uma operação de henpixy.core.operations.OPERATIONS e seus
+    parâmetros:
+        
+        {"steps": [
+            {"name": "equalize_histogram"},
+            {"name": "median_filter", "params": {"kernel_size": 3}},
+            {"name": "intensity_slicing", "params": {"slices": [64, 128, 192],
+             "colors": [[0, 0, 255], [0, 255, 255], [255, 255, 0], [255, 0, 0]]}}
+        ]}
+    """
+    
+    def __init__(self, steps=None):
+        """
+        Inicializa o pipeline
+        
+        Args:
+            steps (list, optional): As operações (Operation), em ordem
+        """
+        self.steps = list(steps or [])
+        
+        # Tabelas compostas por estágio e modo de entrada: (estágio, modo) -> (tabela, modo) ou None
+        self._luts = {}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Cria um pipeline a partir de sua descrição
+        
+        Args:
+            data (dict or list): A descrição, ou diretamente a lista de passos
+        
+        Returns:
+            Pipeline: O pipeline
+        
+        Raises:
+            ValueError: Se a descrição for inválida, citar uma operação desconhecida
+                        ou parâmetros que a operação não aceita
+        """
+        steps = data.get("steps") if isinstance(data, dict) else data
+        if not isinstance(steps, list):
+            raise ValueError("A descrição do pipeline deve conter a lista de passos \"steps\"")
+        
+        operations = []
+        for step in steps:
+            if not isinstance(step, dict) or "name" not in step or not isinstance(step.get("params", {}), dict):
+                raise ValueError(f"Passo inválido no pipeline: {step!r}")
+            operation = Operation.from_dict(step)
+            operation.validate()
+            operations.append(operation)
+        return cls(operations)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Lê um pipeline de um arquivo JSON ou YAML (.yaml, .yml)
+        
+        Args:
+            path (str): Caminho do arquivo
+        
+        Returns:
+            Pipeline: O pipeline
+        
+        Raises:
+            ValueError: Se o arquivo for inválido, ou se for YAML e o PyYAML não estiver instalado
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+                if yaml is None:
+                    raise ValueError("Leitura de pipelines em YAML requer o pacote PyYAML")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        return cls.from_dict(data)
+    
+    def to_dict(self):
+        """
+        Converte o pipeline para sua descrição
+        
+        Returns:
+            dict: A descrição, serializável em JSON
+        """
+        return {"steps": [operation.to_dict() for operation in self.steps]}
+    
+    def save(self, path):
+        """
+        Grava o pipeline em um arquivo JSON
+        
+        Args:
+            path (str): Caminho do arquivo
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+    
+    def plan(self):
+        """
+        Organiza os passos em estágios de execução
+        
+        Transformações ponto a ponto consecutivas formam um único estágio,
+        executado como uma tabela de busca composta. A ordem dos passos é
+        mantida: as operações arredondam e limitam seus resultados, então
+        trocá-las de lugar alteraria a imagem final.
+        
+        Returns:
+            list: Os estágios, cada um uma lista de operações
+        """
+        stages = []
+        for operation in self.steps:
+            if (operation.name in POINT_OPERATIONS and stages
+                    and all(previous.name in POINT_OPERATIONS for previous in stages[-1])):
+                stages[-1].append(operation)
+            else:
+                stages.append([operation])
+        return stages
+    
+    def apply_stage(self, stage, image, progress=None, cancel_token=None):
+        """
+        Executa um estágio do plano
+        
+        Estágios de transformações ponto a ponto são aplicados como uma
+        tabela de busca (composta uma vez por modo de entrada e guardada no
+        pipeline); se a tabela for a identidade e mantiver o modo, a imagem é
+        retornada sem alterações. Nos modos sem tabela, as operações são
+        aplicadas em ordem. Estágios que não alteram a imagem de entrada
+        (is_no_op) também a retornam sem alterações.
+        
+        Args:
+            stage (list): As operações do estágio
+            image (PIL.Image.Image): A imagem de entrada
+            progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+            cancel_token (CancellationToken, optional): Interrompe o estágio se for cancelado
+        
+        Returns:
+            PIL.Image.Image: A imagem resultante
+        """
+        if is_no_op(stage[0], image.mode):
+            return image
+        if stage[0].name not in POINT_OPERATIONS:
+            return stage[0].apply(image, progress=progress, cancel_token=cancel_token)
+        
+        key = (repr(stage), image.mode)
+        if key not in self._luts:
+            self._luts[key] = compose_point_operations(stage, image.mode)
+        composed = self._luts[key]
+        
+        if composed is None:
+            for operation in stage:
+                image = operation.apply(image, cancel_token=cancel_token)
+            return image
+        
+        lut, mode = composed
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if mode == image.mode and np.array_equal(
+                lut, np.arange(lut.shape[0])[:, np.newaxis].repeat(lut.shape[1], axis=1)):
+            return image
+        return apply_lookup_table(image, lut, mode)
+    
+    def apply(self, image, progress=None, cancel_token=None):
+        """
+        Aplica o pipeline a uma imagem, estágio por estágio (ver plan)
+        
+        O resultado é o mesmo da aplicação dos passos um a um.
+        
+        Args:
+            image (PIL.Image.Image): A imagem de entrada
+            progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+            cancel_token (CancellationToken, optional): Interrompe o pipeline se for cancelado
+        
+        Returns:
+            PIL.Image.Image: A imagem resultante
+        
+        Raises:
+            OperationCancelled: Se o cancelamento for solicitado
+        """
+        stages = self.plan()
+        total = len(stages)
+        for index, stage in enumerate(stages):
+            check_progress(progress, cancel_token, index, total)
+            stage_progress = None
+            if progress is not None:
+                stage_progress = lambda fraction, index=index: progress((index + fraction) / total)
+            image = self.apply_stage(stage, image, progress=stage_progress, cancel_token=cancel_token)
+        check_progress(progress, cancel_token, total, total)
+        return image
+    
+    def __len__(self):
+        return len(self.steps)
+    
+    def __repr__(self):
+        return f"Pipeline({self.steps!r})"
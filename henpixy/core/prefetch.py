@@ -0,0 +1,177 @@
+"""
+Leitura antecipada de arquivos de imagem em segundo plano, para sobrepor a
+leitura do disco e a decodificação ao processamento
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from henpixy.core.loaders import load_image
+
+# Quantidade padrão de imagens decodificadas à frente da que está em uso
+PREFETCH_DEPTH = 2
+
+class PrefetchReader:
+    """
+    Percorre uma lista de arquivos decodificando os próximos em uma thread
+    
+    A thread de leitura mantém no máximo depth imagens prontas em uma fila
+    limitada; enquanto uma imagem é processada, as seguintes já estão sendo
+    lidas e decodificadas (a decodificação do Pillow libera o GIL). Erros de
+    leitura não interrompem a iteração: são entregues junto com o arquivo.
+    
+    Uso:
+        with PrefetchReader(paths) as reader:
+            for path, image, error in reader:
+                ...
+    """
+    
+    # Intervalo (segundos) em que a thread de leitura verifica se a iteração foi encerrada
+    POLL_INTERVAL = 0.1
+    
+    def __init__(self, paths, loader=load_image, depth=PREFETCH_DEPTH):
+        """
+        Inicializa o leitor e começa a ler os primeiros arquivos
+        
+        Args:
+            paths (iterable): Os caminhos dos arquivos, em ordem
+            loader (callable): Recebe um caminho e retorna a imagem carregada
+            depth (int): Quantidade máxima de imagens prontas aguardando na fila
+        """
+        self.loader = loader
+        self._queue = queue.Queue(maxsize=max(depth, 1))
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._read, args=(list(paths),), daemon=True)
+        self._thread.start()
+    
+    def _read(self, paths):
+        """
+        Lê os arquivos em ordem e os coloca na fila (executado na thread de leitura)
+        
+        Args:
+            paths (list): Os caminhos dos arquivos
+        """
+        for path in paths:
+            if self._stopped.is_set():
+                return
+            try:
+                entry = (path, self.loader(path), None)
+            except Exception as e:
+                entry = (path, None, e)
+            if not self._put(entry):
+                return
+        self._put(None)
+    
+    def _put(self, entry):
+        """
+        Coloca um item na fila, aguardando espaço enquanto a iteração não for encerrada
+        
+        Args:
+            entry (tuple): O item, ou None para indicar o fim dos arquivos
+        
+        Returns:
+            bool: False se a iteração foi encerrada antes de haver espaço
+        """
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(entry, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def __iter__(self):
+        """
+        Entrega os arquivos na ordem da lista
+        
+        Yields:
+            tuple: (caminho, imagem, erro): a imagem é None se a leitura falhou,
+                   e erro é a exceção correspondente
+        """
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            yield entry
+    
+    def close(self):
+        """Encerra a leitura antecipada, descartando as imagens ainda não entregues"""
+        self._stopped.set()
+        self._thread.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class PrefetchCache:
+    """
+    Decodifica em segundo plano os arquivos que provavelmente serão abertos em seguida
+    
+    Usado na navegação entre as imagens de uma pasta: após abrir uma imagem,
+    as vizinhas são lidas em uma thread e, se o usuário avançar para uma
+    delas, a imagem já está pronta. Apenas os arquivos do último pedido
+    (prefetch) são mantidos; os demais são descartados.
+    """
+    
+    def __init__(self, loader=load_image):
+        """
+        Inicializa o cache
+        
+        Args:
+            loader (callable): Recebe um caminho e retorna a imagem carregada
+        """
+        self.loader = loader
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="henpixy-prefetch")
+        self._futures = {}
+    
+    def prefetch(self, paths):
+        """
+        Agenda a leitura dos arquivos, na ordem dada, e descarta os demais
+        
+        Args:
+            paths (list): Os caminhos dos arquivos
+        """
+        futures = {}
+        for path in paths:
+            future = self._futures.pop(path, None)
+            futures[path] = future if future is not None else self._executor.submit(self.loader, path)
+        
+        # Leituras que ainda não começaram e não são mais necessárias são canceladas
+        for future in self._futures.values():
+            future.cancel()
+        self._futures = futures
+    
+    def take(self, path):
+        """
+        Retira a imagem de um arquivo do cache
+        
+        Se a leitura do arquivo ainda estiver em andamento, aguarda seu
+        término em vez de descartá-la: ler o arquivo de novo levaria mais
+        tempo do que o restante da leitura antecipada.
+        
+        Args:
+            path (str): Caminho do arquivo
+        
+        Returns:
+            PIL.Image.Image: A imagem, ou None se o arquivo não foi agendado
+                             para leitura antecipada ou se a leitura falhou
+        """
+        future = self._futures.pop(path, None)
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+    
+    def clear(self):
+        """Descarta todas as imagens e cancela as leituras pendentes"""
+        self.prefetch([])
+    
+    def close(self):
+        """Cancela as leituras pendentes e encerra a thread"""
+        self.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,203 @@
+"""
+Cache de resultados das operações, indexado pelo conteúdo da imagem de entrada
+"""
+
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from henpixy.core.image_handle import ImageHandle
+from henpixy.tools.image_utils import get_image_nbytes, get_pixel_array
+
+# Limite padrão de memória para os resultados em cache (256 MB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Tamanho aproximado (bytes) das faixas de linhas passadas ao resumo
+DIGEST_BAND_BYTES = 4 * 1024 * 1024
+
+# Resumos dos pixels já calculados das imagens somente leitura:
+# id(imagem) -> (referência fraca, núcleo de pixels, resumo dos pixels)
+_digest_cache = {}
+
+def image_digest(image):
+    """
+    Calcula o resumo (BLAKE2b) do conteúdo de uma imagem
+    
+    O resumo considera o modo, o tamanho, a paleta e os pixels. O resumo dos
+    pixels só é memorizado para imagens somente leitura (as views de
+    ImageHandle e as imagens mapeadas em memória), cujas alterações no lugar
+    substituem o núcleo de pixels, e vale enquanto a mesma imagem mantiver o
+    mesmo núcleo; as demais imagens são resumidas a cada chamada. A paleta,
+    que putpalette altera no lugar, é resumida a cada chamada. Os pixels são lidos
+    em faixas de linhas (diretamente do array, nas imagens mapeadas em
+    memória), sem uma cópia da imagem inteira.
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+    
+    Returns:
+        str: O resumo em hexadecimal
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(f"{image.mode}:{image.size}".encode("utf-8"))
+    if image.mode in ("P", "PA"):
+        hasher.update(bytes(image.getpalette() or []))
+    hasher.update(_pixel_digest(image))
+    return hasher.hexdigest()
+
+def _pixel_digest(image):
+    """
+    Calcula o resumo dos pixels de uma imagem, memorizado nas imagens somente leitura
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+    
+    Returns:
+        bytes: O resumo
+    """
+    key = id(image)
+    if key in _digest_cache:
+        image_ref, core, digest = _digest_cache[key]
+        if image_ref() is image and image.readonly and image.im is core:
+            return digest
+    
+    hasher = hashlib.blake2b(digest_size=20)
+    pixel_array = get_pixel_array(image)
+    row_bytes = get_image_nbytes(image) // max(image.height, 1)
+    band = max(1, DIGEST_BAND_BYTES // max(row_bytes, 1))
+    for top in range(0, image.height, band):
+        if pixel_array is not None:
+            hasher.update(memoryview(np.ascontiguousarray(pixel_array[top:top + band])))
+        else:
+            hasher.update(image.crop((0, top, image.width, min(top + band, image.height))).tobytes())
+    digest = hasher.digest()
+    
+    if not image.readonly:
+        return digest
+    try:
+        image_ref = weakref.ref(image, lambda _ref, key=key: _digest_cache.pop(key, None))
+    except TypeError:
+        return digest
+    _digest_cache[key] = (image_ref, image.im, digest)
+    
+    return digest
+
+class ResultCache:
+    """
+    Cache LRU de resultados de operações
+    
+    As entradas são indexadas por (resumo da imagem de entrada, nome da
+    operação, parâmetros) e o total de memória dos resultados é limitado a
+    max_bytes. Os resultados são guardados como ImageHandle, então a imagem
+    entregue a quem consulta o cache pode ser alterada sem afetá-lo.
+    
+    O cache pode ser usado por várias threads; as operações são calculadas
+    fora da trava.
+    """
+    
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache
+        
+        Args:
+            max_bytes (int): Limite de memória em bytes para os resultados
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(operation, image):
+        """
+        Monta a chave de uma operação aplicada a uma imagem
+        
+        Args:
+            operation (Operation): A operação
+            image (PIL.Image.Image): A imagem de entrada
+        
+        Returns:
+            tuple: A chave
+        """
+        params = json.dumps(operation.params, sort_keys=True, default=str)
+        return image_digest(image), operation.name, params
+    
+    def apply(self, operation, image, progress=None, cancel_token=None):
+        """
+        Aplica uma operação, reaproveitando o resultado se já estiver em cache
+        
+        Args:
+            operation (Operation): A operação
+            image (PIL.Image.Image): A imagem de entrada
+            progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+            cancel_token (CancellationToken, optional): Interrompe a operação se for
+                                                        cancelada (nada é guardado)
+        
+        Returns:
+            PIL.Image.Image: A imagem resultante
+        """
+        key = self.make_key(operation, image)
+        with self._lock:
+            handle = self._entries.get(key)
+            if handle is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return handle.view()
+            self.misses += 1
+        
+        result = operation.apply(image, progress, cancel_token)
+        handle = ImageHandle(result)
+        
+        # Resultados maiores que o próprio limite não são guardados
+        if handle.nbytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = handle
+                    self.total_bytes += handle.nbytes
+                while self.total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted.nbytes
+        
+        return handle.view()
+    
+    def clear(self):
+        """Remove todos os resultados do cache."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+
+# Cache compartilhado pela janela principal e pelos diálogos
+_result_cache = ResultCache()
+
+def cached_apply(operation, image, progress=None, cancel_token=None):
+    """
+    Aplica uma operação usando o cache de resultados compartilhado
+    
+    Args:
+        operation (Operation): A operação
+        image (PIL.Image.Image): A imagem de entrada
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe a operação se for cancelada
+    
+    Returns:
+        PIL.Image.Image: A imagem resultante
+    """
+    return _result_cache.apply(operation, image, progress, cancel_token)
+
+def get_result_cache():
+    """
+    Retorna o cache de resultados compartilhado
+    
+    Returns:
+        ResultCache: O cache
+    """
+    return _result_cache
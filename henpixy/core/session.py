@@ -0,0 +1,306 @@
+"""
+Diretórios de sessão do histórico, protegidos por um arquivo de trava por processo
+"""
+
+import os
+import shutil
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Nome do arquivo de trava dentro de cada diretório de sessão
+LOCK_FILENAME = "session.lock"
+
+# Tentativas de criar uma nova sessão antes de desistir
+CREATE_ATTEMPTS = 3
+
+# Prefixo dos diretórios de sessões em remoção, ignorados ao listar as sessões
+TOMBSTONE_PREFIX = ".removing-"
+
+# Prefixo dos diretórios de sessões em criação, ignorados ao listar as sessões
+CREATING_PREFIX = ".creating-"
+
+def _try_lock(lock_file):
+    """
+    Tenta obter a trava exclusiva de um arquivo aberto, sem bloquear
+    
+    Args:
+        lock_file (file): O arquivo de trava, aberto para leitura e escrita
+    
+    Returns:
+        bool: True se a trava foi obtida
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+def _unlock(lock_file):
+    """
+    Libera a trava de um arquivo e o fecha
+    
+    Args:
+        lock_file (file): O arquivo de trava
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    lock_file.close()
+
+class HistorySession:
+    """
+    Diretório de histórico de uma instância do Henpixy
+    
+    Cada instância usa seu próprio diretório em sessions_dir e mantém aberto,
+    com uma trava exclusiva, o arquivo LOCK_FILENAME desse diretório. A trava
+    é liberada pelo sistema se o processo terminar, de modo que uma sessão
+    sem trava pertence a uma instância que já foi encerrada.
+    """
+    
+    def __init__(self, path, lock_file):
+        """
+        Inicializa a sessão (use HistorySession.acquire)
+        
+        Args:
+            path (str): Diretório da sessão
+            lock_file (file): O arquivo de trava, já travado
+        """
+        self.path = path
+        self._lock_file = lock_file
+    
+    @classmethod
+    def acquire(cls, sessions_dir, legacy_dir=None):
+        """
+        Obtém um diretório de sessão para esta instância
+        
+        A sessão encerrada mais recente é reaproveitada, para que o histórico
+        da última execução continue disponível; as demais sessões encerradas
+        são removidas. Sem sessões anteriores, o diretório legacy_dir (usado
+        por versões anteriores, compartilhado entre instâncias) é adotado como
+        sessão, se existir. Caso contrário, uma nova sessão é criada.
+        
+        Args:
+            sessions_dir (str): Diretório que contém as sessões
+            legacy_dir (str, optional): Diretório de histórico de versões anteriores
+        
+        Returns:
+            HistorySession: A sessão, com a trava obtida
+        """
+        os.makedirs(sessions_dir, exist_ok=True)
+        
+        # Sessões mais recentes primeiro
+        stale = []
+        for session_path in cls._list_sessions(sessions_dir):
+            lock_file = cls._lock_existing(session_path)
+            if lock_file is not None:
+                stale.append((session_path, lock_file))
+        
+        session = None
+        if stale:
+            session_path, lock_file = stale.pop(0)
+            session = cls(session_path, lock_file)
+            session._write_owner()
+        
+        # Criações interrompidas de outras execuções (as em andamento estão travadas)
+        for name in os.listdir(sessions_dir):
+            if not name.startswith(CREATING_PREFIX):
+                continue
+            lock_file = cls._lock_existing(os.path.join(sessions_dir, name))
+            if lock_file is not None:
+                stale.append((os.path.join(sessions_dir, name), lock_file))
+        
+        # Coleta as demais sessões encerradas: ainda com a trava, cada uma é
+        # renomeada para um nome ignorado por _list_sessions, de modo que
+        # nenhuma outra instância possa adotá-la enquanto é removida
+        for session_path, lock_file in stale:
+            tombstone = os.path.join(sessions_dir, f"{TOMBSTONE_PREFIX}{uuid.uuid4().hex}")
+            try:
+                os.rename(session_path, tombstone)
+            except OSError:
+                # Sem renomear (por exemplo, no Windows, com a trava aberta), a sessão é mantida
+                tombstone = None
+            _unlock(lock_file)
+            if tombstone is not None:
+                shutil.rmtree(tombstone, ignore_errors=True)
+        
+        # Remoções interrompidas de outras execuções
+        for name in os.listdir(sessions_dir):
+            if name.startswith(TOMBSTONE_PREFIX):
+                shutil.rmtree(os.path.join(sessions_dir, name), ignore_errors=True)
+        
+        if session is None:
+            session = cls._create(sessions_dir, legacy_dir)
+        
+        return session
+    
+    @staticmethod
+    def _list_sessions(sessions_dir):
+        """
+        Lista os diretórios de sessão, dos modificados mais recentemente aos mais antigos
+        
+        Args:
+            sessions_dir (str): Diretório que contém as sessões
+        
+        Returns:
+            list: Os caminhos dos diretórios
+        """
+        sessions = []
+        for name in os.listdir(sessions_dir):
+            session_path = os.path.join(sessions_dir, name)
+            if name.startswith((TOMBSTONE_PREFIX, CREATING_PREFIX)) or not os.path.isdir(session_path):
+                continue
+            # A trava é regravada ao adotar a sessão e não indica uso do histórico
+            try:
+                modified = max(entry.stat().st_mtime for entry in os.scandir(session_path)
+                               if entry.name != LOCK_FILENAME)
+            except ValueError:
+                # Sessão sem histórico
+                modified = 0
+            except OSError:
+                continue
+            sessions.append((modified, session_path))
+        
+        sessions.sort(reverse=True)
+        return [session_path for _, session_path in sessions]
+    
+    @staticmethod
+    def _open_lock(session_path, create=False):
+        """
+        Abre o arquivo de trava de uma sessão
+        
+        Args:
+            session_path (str): Diretório da sessão
+            create (bool): Se True, cria o arquivo caso ele não exista
+        
+        Returns:
+            file: O arquivo aberto, ou None se não puder ser aberto
+        """
+        try:
+            return open(os.path.join(session_path, LOCK_FILENAME), "a+" if create else "r+")
+        except OSError:
+            return None
+    
+    @classmethod
+    def _lock_existing(cls, session_path):
+        """
+        Obtém a trava de uma sessão existente que não esteja em uso
+        
+        Depois de obtida a trava, verifica se o diretório ainda é o da sessão:
+        a instância que a travava antes pode tê-lo renomeado para remoção
+        (TOMBSTONE_PREFIX) entre a abertura do arquivo e a obtenção da trava.
+        
+        Args:
+            session_path (str): Diretório da sessão
+        
+        Returns:
+            file: O arquivo de trava, travado, ou None se a sessão estiver em
+                  uso ou não existir mais
+        """
+        lock_file = cls._open_lock(session_path)
+        if lock_file is None:
+            return None
+        if _try_lock(lock_file):
+            try:
+                if os.path.samestat(os.fstat(lock_file.fileno()),
+                                    os.stat(os.path.join(session_path, LOCK_FILENAME))):
+                    return lock_file
+            except OSError:
+                pass
+            _unlock(lock_file)
+        else:
+            lock_file.close()
+        return None
+    
+    @classmethod
+    def _create(cls, sessions_dir, legacy_dir=None):
+        """
+        Cria uma nova sessão
+        
+        O diretório é preparado com um nome temporário (CREATING_PREFIX),
+        ignorado pelas outras instâncias, e só recebe o nome definitivo depois
+        que a trava é obtida; assim, nenhuma instância que procure sessões
+        encerradas pode travar e adotar ou remover a sessão recém-criada.
+        
+        Args:
+            sessions_dir (str): Diretório que contém as sessões
+            legacy_dir (str, optional): Diretório de histórico de versões anteriores,
+                                        movido para a nova sessão se existir
+        
+        Returns:
+            HistorySession: A sessão, com a trava obtida
+        
+        Raises:
+            OSError: Se nenhum diretório de sessão puder ser criado e travado
+        """
+        for _ in range(CREATE_ATTEMPTS):
+            name = f"{int(time.time())}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+            session_path = os.path.join(sessions_dir, name)
+            creating_path = os.path.join(sessions_dir, f"{CREATING_PREFIX}{name}")
+            
+            adopted = False
+            if legacy_dir and os.path.isdir(legacy_dir):
+                try:
+                    os.rename(legacy_dir, creating_path)
+                    adopted = True
+                except OSError:
+                    pass
+            if not adopted:
+                os.makedirs(creating_path)
+            
+            # Uma instância que remove criações interrompidas pode ter travado o arquivo antes
+            lock_file = cls._open_lock(creating_path, create=True)
+            if lock_file is None or not _try_lock(lock_file):
+                if lock_file is not None:
+                    lock_file.close()
+                continue
+            
+            try:
+                os.rename(creating_path, session_path)
+            except OSError:
+                # No Windows, o diretório não pode ser renomeado com a trava aberta:
+                # a trava é liberada, o diretório renomeado e a trava obtida de novo
+                _unlock(lock_file)
+                try:
+                    os.rename(creating_path, session_path)
+                except OSError:
+                    continue
+                lock_file = cls._lock_existing(session_path)
+                if lock_file is None:
+                    continue
+            
+            session = cls(session_path, lock_file)
+            session._write_owner()
+            return session
+        
+        raise OSError(f"Não foi possível criar a sessão do histórico em {sessions_dir}")
+    
+    def _write_owner(self):
+        """Registra no arquivo de trava o processo que usa a sessão."""
+        try:
+            self._lock_file.seek(0)
+            self._lock_file.truncate()
+            self._lock_file.write(f"{os.getpid()}\n")
+            self._lock_file.flush()
+        except OSError:
+            pass
+    
+    def release(self):
+        """Libera a trava da sessão; seu diretório é mantido para a próxima execução."""
+        if self._lock_file is not None:
+            _unlock(self._lock_file)
+            self._lock_file = None
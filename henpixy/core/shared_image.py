@@ -0,0 +1,118 @@
+"""
+Transferência de imagens entre processos por memória compartilhada
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from henpixy.core.loaders import image_from_array
+from henpixy.tools.image_utils import get_native_array
+
+# Modos que podem ser transferidos: os pixels são guardados como em get_native_array
+SHAREABLE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'I;16', 'I;16L', 'I;16B', 'F')
+
+class SharedImage:
+    """
+    Pixels de uma imagem em um bloco de memória compartilhada
+    
+    Apenas o descritor (nome do bloco, formato e tipo do array) atravessa a
+    fronteira entre os processos; os pixels não são serializados. Cada
+    processo fecha seu próprio acesso com close, e o último a usar os pixels
+    libera o bloco com unlink.
+    """
+    
+    def __init__(self, memory, shape, dtype):
+        """
+        Inicializa o acesso a um bloco existente
+        
+        Args:
+            memory (SharedMemory): O bloco de memória compartilhada
+            shape (tuple): O formato do array (altura, largura[, canais])
+            dtype (numpy.dtype): O tipo das amostras
+        """
+        self.memory = memory
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+    
+    @classmethod
+    def create(cls, image):
+        """
+        Copia os pixels de uma imagem para um novo bloco de memória compartilhada
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+        
+        Returns:
+            SharedImage: O bloco criado
+        
+        Raises:
+            ValueError: Se o modo da imagem não estiver em SHAREABLE_MODES
+        """
+        if image.mode not in SHAREABLE_MODES:
+            raise ValueError(f"Modo de imagem não suportado na memória compartilhada: {image.mode}")
+        
+        array = get_native_array(image)
+        # Blocos de memória compartilhada não podem ter tamanho zero
+        memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = cls(memory, array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+    
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Acessa um bloco criado por outro processo
+        
+        Args:
+            descriptor (tuple): O descritor do bloco (ver descriptor)
+        
+        Returns:
+            SharedImage: O acesso ao bloco
+        """
+        name, shape, dtype = descriptor
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype)
+    
+    @property
+    def descriptor(self):
+        """tuple: (nome do bloco, formato, tipo), que pode ser enviado a outro processo."""
+        return self.memory.name, self.shape, self.dtype.str
+    
+    @property
+    def array(self):
+        """numpy.ndarray: Os pixels, sem cópia."""
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=self.memory.buf)
+    
+    def to_image(self):
+        """
+        Cria uma imagem que usa diretamente os pixels do bloco
+        
+        A imagem só pode ser usada enquanto o bloco estiver aberto.
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        return image_from_array(self.array)
+    
+    def read_image(self):
+        """
+        Cria uma imagem com uma cópia própria dos pixels do bloco
+        
+        Returns:
+            PIL.Image.Image: A imagem, válida depois que o bloco for fechado
+        """
+        return image_from_array(self.array.copy())
+    
+    def close(self):
+        """Fecha o acesso do processo ao bloco"""
+        try:
+            self.memory.close()
+        except BufferError:
+            # Ainda há imagens usando os pixels (por exemplo, presas ao rastreamento
+            # de uma exceção); o mapeamento é liberado quando elas forem coletadas
+            pass
+    
+    def unlink(self):
+        """Fecha o acesso e libera o bloco para todos os processos"""
+        self.close()
+        self.memory.unlink()
@@ -0,0 +1,211 @@
+"""
+Formato de arquivo para instantâneos de imagens (cabeçalho + pixels brutos)
+
+O arquivo começa com a assinatura MAGIC, seguida do tamanho (uint32, little
+endian) de um cabeçalho JSON com o modo, o tamanho e o leiaute dos pixels.
+Os pixels ficam alinhados em DATA_ALIGNMENT bytes logo após o cabeçalho, no
+formato de Image.tobytes, de modo que instantâneos sem compressão podem ser
+abertos com np.memmap sem nenhuma decodificação.
+"""
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+from PIL import Image
+
+# Assinatura dos arquivos de instantâneo
+MAGIC = b"HPXS\x01"
+
+# Extensão usada para os arquivos de instantâneo
+SNAPSHOT_EXTENSION = ".hpxs"
+
+# Alinhamento do início dos pixels no arquivo
+DATA_ALIGNMENT = 64
+
+# Nível de compressão zlib usado quando a compressão é solicitada (o mais rápido)
+ZLIB_LEVEL = 1
+
+# Leiaute dos pixels de cada modo: modo -> (dtype numpy, canais)
+_ARRAY_LAYOUTS = {
+    'L': ('|u1', 1),
+    'P': ('|u1', 1),
+    'PA': ('|u1', 2),
+    'LA': ('|u1', 2),
+    'RGB': ('|u1', 3),
+    'RGBA': ('|u1', 4),
+    'CMYK': ('|u1', 4),
+    'I;16': ('<u2', 1),
+    'I;16L': ('<u2', 1),
+    'I;16B': ('>u2', 1),
+    'I': (np.dtype(np.int32).str, 1),
+    'F': (np.dtype(np.float32).str, 1),
+}
+
+def is_snapshot(filepath):
+    """
+    Verifica se um arquivo é um instantâneo neste formato
+    
+    Args:
+        filepath (str): Caminho do arquivo
+    
+    Returns:
+        bool: True se o arquivo começa com a assinatura do formato
+    """
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def write_snapshot(image, filepath, compress=False):
+    """
+    Grava uma imagem como instantâneo
+    
+    Os dados são gravados em um arquivo temporário, sincronizados com o
+    disco (fsync) e só então movidos para o caminho definitivo.
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+        filepath (str): Caminho do arquivo
+        compress (bool): Se True, comprime os pixels com zlib no nível ZLIB_LEVEL
+                         (o arquivo deixa de poder ser mapeado em memória)
+    """
+    data = image.tobytes()
+    if compress:
+        data = zlib.compress(data, ZLIB_LEVEL)
+    
+    header = {
+        "mode": image.mode,
+        "size": list(image.size),
+        "compression": "zlib" if compress else "none",
+        "length": len(data),
+    }
+    
+    layout = _ARRAY_LAYOUTS.get(image.mode)
+    if layout is not None:
+        dtype, channels = layout
+        header["dtype"] = dtype
+        header["shape"] = [image.height, image.width] + ([channels] if channels > 1 else [])
+    
+    if image.palette is not None:
+        header["palette_mode"] = image.palette.mode
+        header["palette"] = image.getpalette(header["palette_mode"])
+    
+    # Cor transparente (L, RGB) ou transparência por índice da paleta (P, em bytes)
+    transparency = image.info.get("transparency")
+    if isinstance(transparency, bytes):
+        header["transparency_bytes"] = list(transparency)
+    elif isinstance(transparency, (int, tuple)):
+        header["transparency"] = transparency
+    
+    header_bytes = json.dumps(header).encode("utf-8")
+    
+    # Preenche até o alinhamento para que os pixels comecem em um deslocamento fixo
+    prefix_length = len(MAGIC) + 4 + len(header_bytes)
+    padding = (-prefix_length) % DATA_ALIGNMENT
+    
+    # O arquivo só recebe o nome definitivo depois de gravado e sincronizado
+    # com o disco: uma gravação interrompida (disco cheio, queda) não deixa um
+    # instantâneo truncado no lugar do definitivo
+    temp_path = filepath + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * padding)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def read_snapshot_header(filepath):
+    """
+    Lê o cabeçalho de um instantâneo
+    
+    Args:
+        filepath (str): Caminho do arquivo
+    
+    Returns:
+        dict: O cabeçalho, com o deslocamento dos pixels em "offset"
+    
+    Raises:
+        ValueError: Se o arquivo não for um instantâneo
+    """
+    with open(filepath, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Arquivo não é um instantâneo do Henpixy: {filepath}")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    
+    prefix_length = len(MAGIC) + 4 + header_length
+    header["offset"] = prefix_length + (-prefix_length) % DATA_ALIGNMENT
+    return header
+
+def open_snapshot_array(filepath):
+    """
+    Mapeia os pixels de um instantâneo sem compressão como array numpy somente leitura
+    
+    Args:
+        filepath (str): Caminho do arquivo
+    
+    Returns:
+        numpy.memmap: Os pixels, com o formato (altura, largura[, canais])
+    
+    Raises:
+        ValueError: Se o instantâneo estiver comprimido ou o modo não tiver leiaute de array
+    """
+    header = read_snapshot_header(filepath)
+    if header["compression"] != "none" or "dtype" not in header:
+        raise ValueError(f"Instantâneo não pode ser mapeado em memória: {filepath}")
+    
+    return np.memmap(filepath, dtype=np.dtype(header["dtype"]), mode="r",
+                     offset=header["offset"], shape=tuple(header["shape"]))
+
+def read_snapshot(filepath):
+    """
+    Lê a imagem de um instantâneo
+    
+    Instantâneos sem compressão são mapeados em memória: nos modos suportados
+    por Image.frombuffer a imagem usa diretamente as páginas do arquivo e é
+    somente leitura; nos demais, os pixels são copiados sem decodificação.
+    
+    Args:
+        filepath (str): Caminho do arquivo
+    
+    Returns:
+        PIL.Image.Image: A imagem
+    """
+    header = read_snapshot_header(filepath)
+    mode = header["mode"]
+    size = tuple(header["size"])
+    
+    if header["compression"] == "zlib":
+        with open(filepath, "rb") as f:
+            f.seek(header["offset"])
+            data = zlib.decompress(f.read(header["length"]))
+    elif header["length"] == 0:
+        data = b""
+    else:
+        data = np.memmap(filepath, dtype=np.uint8, mode="r",
+                         offset=header["offset"], shape=(header["length"],))
+    
+    image = Image.frombuffer(mode, size, data, "raw", mode, 0, 1)
+    
+    if "palette" in header:
+        image.putpalette(header["palette"], header.get("palette_mode", "RGB"))
+    
+    if "transparency_bytes" in header:
+        image.info["transparency"] = bytes(header["transparency_bytes"])
+    elif "transparency" in header:
+        transparency = header["transparency"]
+        image.info["transparency"] = tuple(transparency) if isinstance(transparency, list) else transparency
+    
+    return image
@@ -0,0 +1,386 @@
+"""
+Processamento por blocos (tiles) de imagens maiores que a memória disponível
+
+A imagem fica em um arquivo mapeado em memória (TiledImage) e as operações
+são aplicadas bloco a bloco: cada bloco é lido com uma margem (halo) de
+vizinhos suficiente para os filtros espaciais, processado pela ferramenta
+de henpixy.tools e gravado no arquivo de saída sem a margem. A memória usada
+depende do tamanho do bloco, e não do tamanho da imagem.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from henpixy.core.loaders import image_from_array, map_image_array
+from henpixy.tools.cancellation import check_progress
+from henpixy.tools.histogram import calculate_equalization_map
+from henpixy.tools.image_utils import get_integer_intensity_array, get_native_array, get_pixel_array
+
+# Margem (em pixels) que cada operação precisa ao redor de um bloco:
+# nome -> função que recebe os parâmetros da operação. Operações ausentes
+# (além de equalize_histogram, que é tratada à parte) não podem ser
+# processadas por blocos; é o caso das operações de planos de bits, cuja
+# profundidade de bits depende da maior intensidade da imagem inteira.
+OPERATION_HALOS = {
+    "zero_intensity": lambda params: 0,
+    "negative": lambda params: 0,
+    "power_transform": lambda params: 0,
+    "contrast_stretching": lambda params: 0,
+    "intensity_slicing": lambda params: 0,
+    "mean_filter": lambda params: params.get("kernel_size", 3) // 2,
+    "min_filter": lambda params: params.get("kernel_size", 3) // 2,
+    "max_filter": lambda params: params.get("kernel_size", 3) // 2,
+    "median_filter": lambda params: params.get("kernel_size", 3) // 2,
+    "laplacian_filter": lambda params: 1,
+}
+
+# Modos que são armazenados sem conversão (os demais são convertidos para RGB)
+_STORED_MODES = ('L', 'LA', 'RGB', 'RGBA', 'I', 'I;16', 'I;16L', 'I;16B')
+
+def get_operation_halo(operation):
+    """
+    Retorna a margem de vizinhos que uma operação precisa ao redor de cada bloco
+    
+    Args:
+        operation (Operation): A operação
+    
+    Returns:
+        int: A margem em pixels
+    
+    Raises:
+        ValueError: Se a operação não puder ser processada por blocos
+    """
+    halo = OPERATION_HALOS.get(operation.name)
+    if halo is None:
+        raise ValueError(f"Operação não pode ser processada por blocos: {operation.name}")
+    return halo(operation.params)
+
+class TiledImage:
+    """
+    Imagem armazenada em um arquivo mapeado em memória, lida e gravada por blocos
+    
+    Os pixels ficam em um array (altura, largura[, canais]) de 8 ou 16 bits
+    por amostra, no formato de get_native_array. Apenas os blocos acessados
+    são carregados pelo sistema operacional, que também decide quando
+    descartá-los da memória.
+    """
+    
+    TILE_SIZE = 2048
+    
+    def __init__(self, array, path=None, temporary=False):
+        """
+        Inicializa a imagem a partir de um array (use create, open ou from_image)
+        
+        Args:
+            array (numpy.ndarray): Os pixels, normalmente um np.memmap
+            path (str, optional): Arquivo que guarda os pixels
+            temporary (bool): Se True, o arquivo é removido por close
+        
+        Raises:
+            ValueError: Se o tipo ou o formato do array não for suportado
+        """
+        if array.dtype.kind != 'u' or array.dtype.itemsize not in (1, 2) or array.ndim not in (2, 3):
+            raise ValueError(f"Processamento por blocos requer amostras de 8 ou 16 bits: {array.dtype}, {array.shape}")
+        
+        self.array = array
+        self.path = path
+        self.temporary = temporary
+    
+    @classmethod
+    def create(cls, shape, dtype, path=None):
+        """
+        Cria uma imagem vazia em disco
+        
+        Args:
+            shape (tuple): Formato (altura, largura[, canais])
+            dtype (numpy.dtype): Tipo das amostras (uint8 ou uint16)
+            path (str, optional): Arquivo de destino. Se None, usa um arquivo
+                                  temporário, removido por close.
+        
+        Returns:
+            TiledImage: A imagem, com todos os pixels zerados
+        """
+        temporary = path is None
+        if temporary:
+            fd, path = tempfile.mkstemp(prefix="henpixy-", suffix=".tiles")
+            os.close(fd)
+        
+        array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+        return cls(array, path, temporary)
+    
+    @classmethod
+    def open(cls, path, raw_format=None):
+        """
+        Abre um arquivo mapeável (TIFF sem compressão, .npy ou dados brutos) sem copiá-lo
+        
+        Args:
+            path (str): Caminho do arquivo
+            raw_format (dict, optional): Formato de um arquivo de pixels brutos
+                                         (ver henpixy.core.loaders.map_image_array)
+        
+        Returns:
+            TiledImage: A imagem, somente leitura
+        
+        Raises:
+            ValueError: Se o arquivo não puder ser mapeado em memória
+        """
+        array = map_image_array(path, raw_format)
+        if array is None:
+            raise ValueError(f"Arquivo não pode ser mapeado em memória: {path}")
+        return cls(array, path)
+    
+    @classmethod
+    def from_image(cls, image, path=None):
+        """
+        Cria uma imagem por blocos a partir de uma imagem PIL
+        
+        Imagens abertas por mapeamento em memória são usadas sem cópia; as
+        demais são copiadas para o disco em faixas de linhas.
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+            path (str, optional): Arquivo de destino da cópia (ver create)
+        
+        Returns:
+            TiledImage: A imagem
+        
+        Raises:
+            ValueError: Se a imagem for de ponto flutuante (modo F)
+        """
+        if image.mode == 'F':
+            raise ValueError(f"Processamento por blocos requer amostras de 8 ou 16 bits: modo {image.mode}")
+        
+        pixel_array = get_pixel_array(image)
+        if pixel_array is not None:
+            return cls(pixel_array)
+        
+        if image.mode == '1':
+            image = image.convert('L')
+        elif image.mode not in _STORED_MODES:
+            image = image.convert('RGB')
+        
+        first_band = get_native_array(image.crop((0, 0, image.width, 1)))
+        tiled = cls.create((image.height, image.width) + first_band.shape[2:], first_band.dtype, path)
+        
+        for top in range(0, image.height, cls.TILE_SIZE):
+            bottom = min(top + cls.TILE_SIZE, image.height)
+            tiled.array[top:bottom] = get_native_array(image.crop((0, top, image.width, bottom)))
+        
+        tiled.flush()
+        return tiled
+    
+    @property
+    def width(self):
+        """int: A largura da imagem."""
+        return self.array.shape[1]
+    
+    @property
+    def height(self):
+        """int: A altura da imagem."""
+        return self.array.shape[0]
+    
+    def tiles(self, tile_size=None):
+        """
+        Divide a imagem em blocos
+        
+        Args:
+            tile_size (int, optional): Lado dos blocos. Se None, usa TILE_SIZE.
+        
+        Returns:
+            list: As caixas (esquerda, topo, direita, base) dos blocos, linha a linha
+        """
+        tile_size = tile_size or self.TILE_SIZE
+        return [(left, top, min(left + tile_size, self.width), min(top + tile_size, self.height))
+                for top in range(0, self.height, tile_size)
+                for left in range(0, self.width, tile_size)]
+    
+    def read_tile(self, box, halo=0):
+        """
+        Lê um bloco com uma margem de vizinhos
+        
+        A margem é limitada às bordas da imagem, de modo que os blocos da borda
+        são processados exatamente como na imagem inteira.
+        
+        Args:
+            box (tuple): Caixa (esquerda, topo, direita, base) do bloco
+            halo (int): Margem de vizinhos em pixels
+        
+        Returns:
+            tuple: (imagem PIL do bloco com a margem, caixa do bloco dentro dela)
+        """
+        left, top, right, bottom = box
+        outer_left, outer_top = max(left - halo, 0), max(top - halo, 0)
+        outer_right, outer_bottom = min(right + halo, self.width), min(bottom + halo, self.height)
+        
+        block = np.ascontiguousarray(self.array[outer_top:outer_bottom, outer_left:outer_right])
+        inner_box = (left - outer_left, top - outer_top, right - outer_left, bottom - outer_top)
+        return image_from_array(block), inner_box
+    
+    def write_tile(self, box, array):
+        """
+        Grava os pixels de um bloco
+        
+        Args:
+            box (tuple): Caixa (esquerda, topo, direita, base) do bloco
+            array (numpy.ndarray): Os pixels do bloco
+        """
+        left, top, right, bottom = box
+        self.array[top:bottom, left:right] = array
+    
+    def flush(self):
+        """Grava no disco os blocos alterados."""
+        if isinstance(self.array, np.memmap) and self.array.flags.writeable:
+            self.array.flush()
+    
+    def to_image(self):
+        """
+        Retorna a imagem PIL que usa os pixels do arquivo (ver image_from_array)
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        return image_from_array(self.array)
+    
+    def close(self):
+        """Libera o mapeamento e remove o arquivo, se ele for temporário."""
+        self.flush()
+        self.array = None
+        if self.temporary and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+def _tile_progress(progress, start, span):
+    """
+    Converte o progresso de uma etapa para uma fração do progresso total
+    
+    Args:
+        progress (callable): Recebe a fração concluída do total, ou None
+        start (float): Fração do total em que a etapa começa
+        span (float): Fração do total ocupada pela etapa
+    
+    Returns:
+        callable: Recebe a fração concluída da etapa, ou None
+    """
+    if progress is None:
+        return None
+    return lambda fraction: progress(start + span * fraction)
+
+def tiled_histogram(source, tile_size=None, progress=None, cancel_token=None):
+    """
+    Calcula o histograma de uma imagem por blocos
+    
+    Args:
+        source (TiledImage): A imagem
+        tile_size (int, optional): Lado dos blocos
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o cálculo se for cancelado
+    
+    Returns:
+        tuple: (histograma, histograma normalizado), como calculate_histogram
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
+    """
+    bins = 256 if source.array.dtype.itemsize == 1 else 65536
+    histogram = np.zeros(bins, dtype=np.int64)
+    
+    tiles = source.tiles(tile_size)
+    for index, box in enumerate(tiles):
+        check_progress(progress, cancel_token, index, len(tiles))
+        tile_image, _ = source.read_tile(box)
+        intensities = get_integer_intensity_array(tile_image)
+        histogram += np.bincount(intensities.ravel(), minlength=bins)[:bins]
+    check_progress(progress, cancel_token, len(tiles), len(tiles))
+    
+    return histogram, histogram / (source.width * source.height)
+
+def _equalize_tiled(source, output_path, tile_size, progress, cancel_token):
+    """
+    Equaliza o histograma de uma imagem por blocos, em duas passagens
+    
+    A primeira passagem acumula o histograma de todos os blocos; a segunda
+    aplica a tabela de equalização a cada bloco, com o mesmo resultado de
+    equalize_histogram na imagem inteira.
+    
+    Args:
+        source (TiledImage): A imagem
+        output_path (str): Arquivo de saída, ou None para um arquivo temporário
+        tile_size (int): Lado dos blocos, ou None
+        progress (callable): Recebe a fração concluída, ou None
+        cancel_token (CancellationToken): O sinalizador de cancelamento, ou None
+    
+    Returns:
+        TiledImage: A imagem equalizada (em escala de cinza)
+    """
+    _, normalized = tiled_histogram(source, tile_size, _tile_progress(progress, 0.0, 0.5), cancel_token)
+    dtype = source.array.dtype.newbyteorder('=')
+    equalization_map = calculate_equalization_map(normalized, dtype)
+    
+    output = TiledImage.create((source.height, source.width), dtype, output_path)
+    tiles = source.tiles(tile_size)
+    try:
+        for index, box in enumerate(tiles):
+            check_progress(progress, cancel_token, len(tiles) + index, 2 * len(tiles))
+            tile_image, _ = source.read_tile(box)
+            output.write_tile(box, equalization_map[get_integer_intensity_array(tile_image)])
+        check_progress(progress, cancel_token, 1, 1)
+    except BaseException:
+        output.close()
+        raise
+    
+    output.flush()
+    return output
+
+def process_tiled(source, operation, output_path=None, tile_size=None, progress=None, cancel_token=None):
+    """
+    Aplica uma operação a uma imagem bloco a bloco
+    
+    Cada bloco é lido com a margem exigida pela operação (get_operation_halo),
+    processado como uma imagem PIL pela ferramenta da operação e gravado sem
+    a margem. Como os filtros tratam apenas as bordas da imagem recebida, e
+    a margem dos blocos internos é descartada, o resultado é igual ao da
+    operação aplicada à imagem inteira.
+    
+    Args:
+        source (TiledImage): A imagem de entrada
+        operation (Operation): A operação
+        output_path (str, optional): Arquivo de saída. Se None, usa um arquivo temporário.
+        tile_size (int, optional): Lado dos blocos. Se None, usa TiledImage.TILE_SIZE.
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe a operação se for cancelada
+    
+    Returns:
+        TiledImage: A imagem resultante
+    
+    Raises:
+        ValueError: Se a operação não puder ser processada por blocos
+        OperationCancelled: Se o cancelamento for solicitado
+    """
+    if operation.name == "equalize_histogram":
+        return _equalize_tiled(source, output_path, tile_size, progress, cancel_token)
+    
+    halo = get_operation_halo(operation)
+    
+    output = None
+    tiles = source.tiles(tile_size)
+    try:
+        for index, box in enumerate(tiles):
+            check_progress(progress, cancel_token, index, len(tiles))
+            
+            tile_image, (left, top, right, bottom) = source.read_tile(box, halo)
+            result = get_native_array(operation.apply(tile_image))[top:bottom, left:right]
+            
+            # O formato da saída (canais, profundidade) é definido pelo primeiro bloco
+            if output is None:
+                output = TiledImage.create((source.height, source.width) + result.shape[2:],
+                                           result.dtype, output_path)
+            output.write_tile(box, result)
+        check_progress(progress, cancel_token, len(tiles), len(tiles))
+    except BaseException:
+        if output is not None:
+            output.close()
+        raise
+    
+    output.flush()
+    return output
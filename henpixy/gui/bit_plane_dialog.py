@@ -5,7 +5,8 @@ Diálogo para visualização e manipulação de planos de bits
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QGroupBox, QRadioButton, QPushButton,
-    QButtonGroup, QScrollArea, QWidget, QGridLayout, QMessageBox
+    QButtonGroup, QScrollArea, QWidget, QGridLayout, QMessageBox,
+    QCheckBox
 )
 from PySide6.QtCore import Qt, Signal
 
@@ -19,6 +20,9 @@ class BitPlaneDialog(QDialog):
     # Sinal emitido quando um plano de bits é selecionado para visualização
     bit_plane_selected = Signal(int)
     
+    # Sinal emitido quando a reconstrução a partir dos planos marcados é solicitada
+    reconstruction_requested = Signal(list)
+    
     def __init__(self, parent=None, bit_depth=8, max_intensity=255):
         super().__init__(parent)
         
@@ -78,10 +82,14 @@ class BitPlaneDialog(QDialog):
         self.plane_radios = []
         self.bit_plane_group = QButtonGroup(self)
         
+        # Caixas de seleção para os planos usados na reconstrução
+        self.plane_checkboxes = []
+        
         # Adicionar cabeçalho ao layout
         self.planes_layout.addWidget(QLabel("<b>Plano de Bits</b>"), 0, 0)
         self.planes_layout.addWidget(QLabel("<b>Peso (Contribuição)</b>"), 0, 1)
         self.planes_layout.addWidget(QLabel("<b>Intervalo de Intensidade</b>"), 0, 2)
+        self.planes_layout.addWidget(QLabel("<b>Reconstruir</b>"), 0, 3)
         
         # Adicionar botões de rádio para cada plano de bits
         for i in range(self.bit_depth):
@@ -108,6 +116,12 @@ class BitPlaneDialog(QDialog):
             self.planes_layout.addWidget(radio, row, 0)
             self.planes_layout.addWidget(weight_label, row, 1)
             self.planes_layout.addWidget(range_label, row, 2)
+            
+            # Caixa de seleção para incluir o plano na reconstrução
+            checkbox = QCheckBox("")
+            checkbox.setChecked(True)
+            self.plane_checkboxes.append(checkbox)
+            self.planes_layout.addWidget(checkbox, row, 3)
         
         # Seleciona o plano mais significativo por padrão
         if self.bit_depth > 0:
@@ -117,6 +131,11 @@ class BitPlaneDialog(QDialog):
         self.scroll_area.setWidget(self.scroll_widget)
         self.main_layout.addWidget(self.scroll_area)
         
+        # Resultado da última reconstrução (erro e economia de armazenamento)
+        self.reconstruction_label = QLabel()
+        self.reconstruction_label.setWordWrap(True)
+        self.main_layout.addWidget(self.reconstruction_label)
+        
         # Botões de ação
         self.button_layout = QHBoxLayout()
         
@@ -125,6 +144,11 @@ class BitPlaneDialog(QDialog):
         self.view_button.clicked.connect(self.on_view_clicked)
         self.button_layout.addWidget(self.view_button)
         
+        # Botão para reconstruir a imagem com os planos marcados
+        self.reconstruct_button = QPushButton("Reconstruir")
+        self.reconstruct_button.clicked.connect(self.on_reconstruct_clicked)
+        self.button_layout.addWidget(self.reconstruct_button)
+        
         # Botão para fechar o diálogo
         self.close_button = QPushButton("Fechar")
         self.close_button.clicked.connect(self.reject)
@@ -147,6 +171,40 @@ class BitPlaneDialog(QDialog):
                 "Selecione um plano de bits para visualizar."
             )
     
+    def on_reconstruct_clicked(self):
+        """Ação quando o botão de reconstruir é clicado"""
+        planes = self.get_reconstruction_planes()
+        
+        if planes:
+            # Emite o sinal com os planos marcados
+            self.reconstruction_requested.emit(planes)
+        else:
+            QMessageBox.warning(
+                self,
+                "Aviso",
+                "Marque pelo menos um plano de bits para a reconstrução."
+            )
+    
+    def get_reconstruction_planes(self):
+        """Retorna os planos de bits marcados para a reconstrução"""
+        return [i for i, checkbox in enumerate(self.plane_checkboxes) if checkbox.isChecked()]
+    
+    def show_reconstruction_metrics(self, metrics):
+        """
+        Exibe o erro e a economia de armazenamento de uma reconstrução
+        
+        Args:
+            metrics (dict): Métricas retornadas por evaluate_bit_plane_reconstruction
+        """
+        psnr = metrics["psnr"]
+        psnr_text = "∞" if psnr == float('inf') else f"{psnr:.2f} dB"
+        self.reconstruction_label.setText(
+            f"<b>Reconstrução com {len(metrics['planes'])} de {metrics['bit_depth']} planos:</b> "
+            f"EQM = {metrics['mse']:.2f}, PSNR = {psnr_text}, erro máximo = {metrics['max_error']}, "
+            f"armazenamento = {metrics['compressed_bytes']} de {metrics['original_bytes']} bytes "
+            f"({metrics['savings'] * 100:.1f}% de economia)"
+        )
+    
     def get_selected_plane(self):
         """Retorna o plano de bits selecionado para visualização"""
         return self.bit_plane_group.checkedId()
@@ -185,13 +243,16 @@ class BitPlaneDialog(QDialog):
             if item.widget():
                 item.widget().deleteLater()
         
-        # Reinicializa a lista de rádios
+        # Reinicializa as listas de rádios e caixas de seleção
         self.plane_radios = []
+        self.plane_checkboxes = []
+        self.reconstruction_label.clear()
         
         # Adicionar cabeçalho ao layout
         self.planes_layout.addWidget(QLabel("<b>Plano de Bits</b>"), 0, 0)
         self.planes_layout.addWidget(QLabel("<b>Peso (Contribuição)</b>"), 0, 1)
         self.planes_layout.addWidget(QLabel("<b>Intervalo de Intensidade</b>"), 0, 2)
+        self.planes_layout.addWidget(QLabel("<b>Reconstruir</b>"), 0, 3)
         
         # Recria os controles para cada plano
         for i in range(self.bit_depth):
@@ -218,6 +279,12 @@ class BitPlaneDialog(QDialog):
             self.planes_layout.addWidget(radio, row, 0)
             self.planes_layout.addWidget(weight_label, row, 1)
             self.planes_layout.addWidget(range_label, row, 2)
+            
+            # Caixa de seleção para incluir o plano na reconstrução
+            checkbox = QCheckBox("")
+            checkbox.setChecked(True)
+            self.plane_checkboxes.append(checkbox)
+            self.planes_layout.addWidget(checkbox, row, 3)
         
         # Seleciona o plano mais significativo por padrão
         if self.bit_depth > 0:
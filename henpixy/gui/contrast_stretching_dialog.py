@@ -7,18 +7,25 @@ from PySide6.QtWidgets import (
     QDialogButtonBox, QGroupBox, QFormLayout, QComboBox
 )
 
+from henpixy.gui.image_viewer import ImageViewer
+from henpixy.gui.preview import get_preview_image
+from henpixy.tools.contrast_stretching import contrast_stretching
+
 
 class ContrastStretchingDialog(QDialog):
     """
     Diálogo para configuração dos parâmetros do alargamento de contraste
     """
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, image=None):
         super().__init__(parent)
         
         self.setWindowTitle("Alargamento de Contraste")
         self.resize(400, 300)
         
+        # Proxy reduzido da imagem, usado na pré-visualização
+        self.preview_image = get_preview_image(image) if image is not None else None
+        
         self.main_layout = QVBoxLayout(self)
         
         # Preset de configurações
@@ -84,6 +91,28 @@ class ContrastStretchingDialog(QDialog):
         self.description_label.setWordWrap(True)
         self.main_layout.addWidget(self.description_label)
         
+        # Pré-visualização (apenas quando o diálogo recebe a imagem)
+        if self.preview_image is not None:
+            self.resize(600, 650)
+            
+            self.preview_group = QGroupBox("Pré-visualização")
+            self.preview_layout = QVBoxLayout(self.preview_group)
+            
+            self.preview_viewer = ImageViewer()
+            self.preview_viewer.setMinimumHeight(300)
+            self.preview_layout.addWidget(self.preview_viewer)
+            
+            self.preview_error_label = QLabel()
+            self.preview_error_label.setWordWrap(True)
+            self.preview_layout.addWidget(self.preview_error_label)
+            
+            self.main_layout.addWidget(self.preview_group)
+            
+            for spin in (self.r1_spin, self.s1_spin, self.r2_spin, self.s2_spin):
+                spin.valueChanged.connect(self.update_preview)
+            
+            self.update_preview()
+        
         # Botões de confirmação
         self.button_box = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel
@@ -140,6 +169,27 @@ class ContrastStretchingDialog(QDialog):
         if value <= self.r1_spin.value():
             self.r1_spin.setValue(value - 1)
     
+    def update_preview(self):
+        """
+        Atualiza a pré-visualização com os parâmetros atuais
+        
+        A transformação é aplicada ao proxy reduzido da imagem; a imagem
+        original só é processada pela janela principal, ao confirmar o diálogo.
+        """
+        if self.preview_image is None:
+            return
+        
+        params = self.get_parameters()
+        try:
+            preview = contrast_stretching(self.preview_image, **params)
+        except ValueError as e:
+            # Combinações inválidas aparecem durante a edição dos pontos
+            self.preview_error_label.setText(f"Parâmetros inválidos: {e}")
+            return
+        
+        self.preview_error_label.clear()
+        self.preview_viewer.set_image(preview)
+    
     def get_parameters(self):
         """Retorna os parâmetros configurados pelo usuário"""
         return {
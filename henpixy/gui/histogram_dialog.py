@@ -7,7 +7,7 @@ from PySide6.QtWidgets import (
     QGroupBox, QPushButton, QTabWidget,
     QScrollArea, QWidget, QSizePolicy, QGridLayout
 )
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt
 import numpy as np
 from PIL import Image
@@ -15,6 +15,9 @@ import io
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from henpixy.gui.qt_image import pil_to_pixmap
+from henpixy.gui.preview import get_preview_image
+from henpixy.core.operations import Operation
 from henpixy.tools.histogram import calculate_histogram, equalize_histogram, create_histogram_figure
 
 class HistogramDialog(QDialog):
@@ -32,10 +35,14 @@ class HistogramDialog(QDialog):
         # Permitir que a janela seja redimensionável
         self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint | Qt.WindowMinimizeButtonHint)
         
-        # Armazena a imagem original
+        # Armazena a imagem original e seu proxy reduzido: a equalização exibida
+        # é calculada sobre o proxy; a imagem original é equalizada pela janela
+        # principal, fora da thread da interface, ao aplicar
         self.original_image = image
+        self.preview_image = get_preview_image(image) if image is not None else None
+        self.operation = Operation("equalize_histogram")
         
-        # Variáveis para armazenar os resultados
+        # Variáveis para armazenar os resultados (calculados sobre o proxy)
         self.equalized_image = None
         self.original_hist = None
         self.equalized_hist = None
@@ -231,8 +238,8 @@ class HistogramDialog(QDialog):
         self.tab_widget.addTab(info_tab, "Informações")
     
     def apply_equalization(self):
-        """Aplica a equalização de histograma e atualiza a interface"""
-        if self.original_image is None:
+        """Aplica a equalização de histograma ao proxy e atualiza a interface"""
+        if self.preview_image is None:
             return
         
         # Aplicar equalização
@@ -242,7 +249,7 @@ class HistogramDialog(QDialog):
             self.equalized_hist,
             self.orig_norm_hist,
             self.eq_norm_hist
-        ) = equalize_histogram(self.original_image)
+        ) = equalize_histogram(self.preview_image)
         
         # Atualizar as imagens
         self.display_images()
@@ -254,12 +261,17 @@ class HistogramDialog(QDialog):
         self.display_cdf()
     
     def display_images(self):
-        """Exibe as imagens original e equalizada"""
-        if self.original_image is None or self.equalized_image is None:
+        """
+        Exibe as imagens original e equalizada
+        
+        São exibidos os proxies reduzidos das imagens, criados uma única vez;
+        redimensionar o diálogo não converte as imagens em tamanho original.
+        """
+        if self.preview_image is None or self.equalized_image is None:
             return
         
         # Converte a imagem original para QPixmap
-        original_pixmap = self.pil_to_pixmap(self.original_image)
+        original_pixmap = pil_to_pixmap(self.preview_image)
         if original_pixmap:
             # Redimensiona para caber no label
             scaled_original = original_pixmap.scaled(
@@ -270,7 +282,7 @@ class HistogramDialog(QDialog):
             self.original_label.setPixmap(scaled_original)
         
         # Converte a imagem equalizada para QPixmap
-        equalized_pixmap = self.pil_to_pixmap(self.equalized_image)
+        equalized_pixmap = pil_to_pixmap(self.equalized_image)
         if equalized_pixmap:
             # Redimensiona para caber no label
             scaled_equalized = equalized_pixmap.scaled(
@@ -344,20 +356,6 @@ class HistogramDialog(QDialog):
         pixmap = self.figure_to_pixmap(fig)
         self.cdf_label.setPixmap(pixmap)
     
-    def pil_to_pixmap(self, pil_image):
-        """Converte uma imagem PIL para QPixmap"""
-        if pil_image.mode != "RGB":
-            pil_image = pil_image.convert("RGB")
-        
-        q_image = QImage(
-            pil_image.tobytes(),
-            pil_image.width,
-            pil_image.height,
-            pil_image.width * 3,
-            QImage.Format_RGB888
-        )
-        return QPixmap.fromImage(q_image)
-    
     def figure_to_pixmap(self, figure):
         """Converte uma figura matplotlib para QPixmap"""
         # Salvar a figura em um buffer de memória
@@ -375,8 +373,9 @@ class HistogramDialog(QDialog):
         """Redimensiona as imagens quando a janela é redimensionada"""
         super().resizeEvent(event)
         self.display_images()
-        
+    
     def set_image(self, image):
         """Define a imagem a ser processada"""
         self.original_image = image
+        self.preview_image = get_preview_image(image) if image is not None else None
         self.apply_equalization() 
\ No newline at end of file
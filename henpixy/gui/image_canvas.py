@@ -0,0 +1,403 @@
+"""
+Área de exibição da imagem principal com renderização por blocos e pirâmide de resolução.
+"""
+
+import math
+from collections import OrderedDict
+
+from PySide6.QtWidgets import QAbstractScrollArea
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtCore import Qt, QObject, QRect, QRectF, QTimer, Signal
+
+from henpixy.gui.qt_image import pil_to_qimage, prepare_for_display
+
+class ImagePyramid:
+    """
+    Pirâmide de resolução (mipmap) de uma imagem, dividida em blocos
+    
+    O nível 0 é a imagem original e cada nível seguinte tem metade da largura
+    e da altura do anterior, até que a imagem caiba em MIN_LEVEL_SIZE pixels.
+    Os níveis são construídos uma única vez por imagem; os blocos (QPixmaps)
+    são criados sob demanda e mantidos em um cache LRU de tamanho fixo, de modo
+    que a memória de vídeo usada não depende do tamanho da imagem nem do zoom.
+    """
+    
+    TILE_SIZE = 512
+    MIN_LEVEL_SIZE = 256
+    MAX_CACHED_TILES = 128
+    
+    def __init__(self, image, size=None):
+        """
+        Constrói a pirâmide de uma imagem
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+            size (tuple, optional): Tamanho (largura, altura) em que a imagem é
+                                    exibida, quando ela é uma versão reduzida de
+                                    uma imagem maior. Se None, usa o tamanho da imagem.
+        """
+        self.width, self.height = size or image.size
+        
+        # Redução por blocos 2x2 (Image.reduce) é rápida e equivale a uma
+        # suavização adequada para a redução pela metade
+        level_image = prepare_for_display(image)
+        self.levels = [pil_to_qimage(level_image)]
+        while max(level_image.size) > self.MIN_LEVEL_SIZE and min(level_image.size) >= 2:
+            level_image = level_image.reduce(2)
+            self.levels.append(pil_to_qimage(level_image))
+        
+        self.has_alpha = self.levels[0].hasAlphaChannel()
+        self._tiles = OrderedDict()
+    
+    def level_for_scale(self, scale):
+        """
+        Escolhe o nível mais reduzido que ainda tem resolução suficiente para a escala
+        
+        Args:
+            scale (float): Escala de exibição em relação à imagem original
+        
+        Returns:
+            int: O índice do nível
+        """
+        # O nível 0 pode ser uma versão reduzida da imagem (ver size)
+        base_scale = self.levels[0].width() / self.width
+        if scale >= base_scale:
+            return 0
+        level = int(math.floor(math.log2(base_scale / scale)))
+        return max(0, min(level, len(self.levels) - 1))
+    
+    def level_scale(self, level):
+        """
+        Retorna a escala de um nível em relação à imagem original
+        
+        Args:
+            level (int): O índice do nível
+        
+        Returns:
+            tuple: (escala horizontal, escala vertical)
+        """
+        level_image = self.levels[level]
+        return level_image.width() / self.width, level_image.height() / self.height
+    
+    def tile(self, level, tile_x, tile_y):
+        """
+        Retorna um bloco de um nível da pirâmide
+        
+        Args:
+            level (int): O índice do nível
+            tile_x (int): Coluna do bloco
+            tile_y (int): Linha do bloco
+        
+        Returns:
+            tuple: (QPixmap do bloco, QRect do bloco nas coordenadas do nível)
+        """
+        key = (level, tile_x, tile_y)
+        level_image = self.levels[level]
+        rect = QRect(tile_x * self.TILE_SIZE, tile_y * self.TILE_SIZE, self.TILE_SIZE, self.TILE_SIZE)
+        rect = rect.intersected(level_image.rect())
+        
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key], rect
+        
+        pixmap = QPixmap.fromImage(level_image.copy(rect))
+        self._tiles[key] = pixmap
+        while len(self._tiles) > self.MAX_CACHED_TILES:
+            self._tiles.popitem(last=False)
+        
+        return pixmap, rect
+
+class RenderScheduler(QObject):
+    """
+    Agrupa rajadas de eventos de redimensionamento e zoom de uma área de exibição
+    
+    Durante a interação a área é desenhada com interpolação por vizinho mais
+    próximo, que é rápida; após REFINE_DELAY_MS milissegundos sem novos eventos
+    ela é redesenhada uma única vez com interpolação suave. Nenhum evento
+    reconverte a imagem: os blocos da pirâmide são reaproveitados.
+    """
+    
+    REFINE_DELAY_MS = 150
+    
+    def __init__(self, canvas):
+        """
+        Inicializa o agendador
+        
+        Args:
+            canvas (ImageCanvas): A área de exibição controlada
+        """
+        super().__init__(canvas)
+        
+        self.canvas = canvas
+        
+        # Temporizador reiniciado a cada evento; dispara o refinamento
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(self.REFINE_DELAY_MS)
+        self.refine_timer.timeout.connect(self.refine)
+    
+    def interaction(self):
+        """Registra um evento de interação e adia o desenho suave."""
+        self.canvas.set_smooth(False)
+        self.refine_timer.start()
+    
+    def refine(self):
+        """Redesenha a área de exibição com interpolação suave."""
+        self.canvas.set_smooth(True)
+    
+    def is_pending(self):
+        """
+        Verifica se há um refinamento agendado
+        
+        Returns:
+            bool: True se a área ainda está sendo exibida em modo rápido
+        """
+        return self.refine_timer.isActive()
+
+class ImageCanvas(QAbstractScrollArea):
+    """
+    Área de exibição da imagem principal
+    
+    Apenas os blocos que intersectam a área visível são desenhados, a partir do
+    nível da pirâmide mais próximo da escala de exibição. Um fator de zoom igual
+    a 1.0 ajusta a imagem ao tamanho da área visível; outros valores exibem a
+    imagem com esse fator em relação ao seu tamanho original, com barras de
+    rolagem quando necessário.
+    """
+    
+    # Sinal emitido com as coordenadas (na imagem original) do pixel clicado
+    image_clicked = Signal(int, int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        self.setFrameShape(QAbstractScrollArea.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        
+        # Imagem exibida e sua pirâmide
+        self.image = None
+        self.pyramid = None
+        
+        # Fator de zoom (1.0 ajusta à área visível)
+        self.zoom_factor = 1.0
+        
+        # Qualidade da interpolação ao desenhar os blocos
+        self.smooth = True
+        
+        # Agrupa eventos de redimensionamento e zoom
+        self.render_scheduler = RenderScheduler(self)
+    
+    def set_image(self, image, full_size=None):
+        """
+        Define a imagem exibida
+        
+        A pirâmide só é reconstruída quando a imagem muda.
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+            full_size (tuple, optional): Tamanho da imagem completa, quando image é
+                                         uma versão reduzida exibida durante o
+                                         carregamento; o zoom e as coordenadas
+                                         passam a se referir à imagem completa
+        """
+        if image is not self.image:
+            self.image = image
+            self.pyramid = ImagePyramid(image, full_size) if image is not None else None
+        self.update_scrollbars()
+        self.viewport().update()
+    
+    def clear(self):
+        """Remove a imagem exibida."""
+        self.set_image(None)
+    
+    def set_zoom(self, zoom_factor):
+        """
+        Define o fator de zoom, mantendo o centro da área visível
+        
+        Args:
+            zoom_factor (float): O fator de zoom (1.0 ajusta à área visível)
+        """
+        if self.pyramid is None or zoom_factor == self.zoom_factor:
+            self.zoom_factor = zoom_factor
+            return
+        
+        self.render_scheduler.interaction()
+        
+        # Guarda o ponto da imagem no centro da área visível
+        center = self.viewport().rect().center()
+        image_center = self.map_to_image(center, clamp=True)
+        
+        self.zoom_factor = zoom_factor
+        self.update_scrollbars()
+        
+        # Rola para manter o mesmo ponto no centro
+        scale = self.display_scale()
+        self.horizontalScrollBar().setValue(int(image_center[0] * scale - center.x()))
+        self.verticalScrollBar().setValue(int(image_center[1] * scale - center.y()))
+        self.viewport().update()
+    
+    def set_smooth(self, smooth):
+        """
+        Define a qualidade da interpolação e redesenha a área visível
+        
+        Args:
+            smooth (bool): True para interpolação suave, False para vizinho mais próximo
+        """
+        if smooth != self.smooth:
+            self.smooth = smooth
+            self.viewport().update()
+    
+    def display_scale(self):
+        """
+        Calcula a escala de exibição em relação à imagem original
+        
+        Returns:
+            float: A escala de exibição
+        """
+        if self.pyramid is None:
+            return 1.0
+        
+        if self.zoom_factor == 1.0:
+            # Ajusta a imagem à área visível mantendo a proporção
+            viewport = self.viewport().size()
+            return min(viewport.width() / self.pyramid.width, viewport.height() / self.pyramid.height)
+        
+        return self.zoom_factor
+    
+    def image_display_rect(self):
+        """
+        Retorna o retângulo ocupado pela imagem nas coordenadas da área visível
+        
+        Returns:
+            QRectF: O retângulo da imagem, ou None se não houver imagem
+        """
+        if self.pyramid is None:
+            return None
+        
+        scale = self.display_scale()
+        width = self.pyramid.width * scale
+        height = self.pyramid.height * scale
+        viewport = self.viewport().size()
+        
+        # Centraliza a imagem quando ela é menor que a área visível; a origem é
+        # alinhada a pixels inteiros para não borrar a exibição em 100%
+        left = (viewport.width() - width) // 2 if width < viewport.width() else -self.horizontalScrollBar().value()
+        top = (viewport.height() - height) // 2 if height < viewport.height() else -self.verticalScrollBar().value()
+        
+        return QRectF(left, top, width, height)
+    
+    def map_to_image(self, pos, clamp=False):
+        """
+        Converte uma posição da área visível para coordenadas da imagem original
+        
+        Args:
+            pos (QPoint): A posição na área visível
+            clamp (bool): Se True, limita o resultado aos limites da imagem
+        
+        Returns:
+            tuple: (x, y) na imagem, ou None se a posição estiver fora da imagem
+        """
+        image_rect = self.image_display_rect()
+        if image_rect is None:
+            return None
+        
+        scale = self.display_scale()
+        x = (pos.x() - image_rect.left()) / scale
+        y = (pos.y() - image_rect.top()) / scale
+        
+        if clamp:
+            x = min(max(x, 0), self.pyramid.width - 1)
+            y = min(max(y, 0), self.pyramid.height - 1)
+        elif not (0 <= x < self.pyramid.width and 0 <= y < self.pyramid.height):
+            return None
+        
+        return int(x), int(y)
+    
+    def update_scrollbars(self):
+        """Atualiza o intervalo das barras de rolagem para o tamanho exibido."""
+        viewport = self.viewport().size()
+        if self.pyramid is None:
+            width = height = 0
+        else:
+            scale = self.display_scale()
+            width = int(math.ceil(self.pyramid.width * scale))
+            height = int(math.ceil(self.pyramid.height * scale))
+        
+        for scrollbar, content, visible in ((self.horizontalScrollBar(), width, viewport.width()),
+                                            (self.verticalScrollBar(), height, viewport.height())):
+            scrollbar.setRange(0, max(0, content - visible))
+            scrollbar.setPageStep(visible)
+            scrollbar.setSingleStep(max(1, visible // 20))
+    
+    def paintEvent(self, event):
+        """Desenha apenas os blocos da pirâmide visíveis na área de exibição."""
+        if self.pyramid is None:
+            return
+        
+        image_rect = self.image_display_rect()
+        visible_rect = image_rect.intersected(QRectF(event.rect()))
+        if visible_rect.isEmpty():
+            return
+        
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+        
+        # Imagens com transparência são exibidas sobre fundo branco
+        if self.pyramid.has_alpha:
+            painter.fillRect(visible_rect, Qt.white)
+        
+        scale = self.display_scale()
+        level = self.pyramid.level_for_scale(scale)
+        level_scale_x, level_scale_y = self.pyramid.level_scale(level)
+        
+        # Fatores de conversão entre coordenadas do nível e da área visível
+        factor_x = scale / level_scale_x
+        factor_y = scale / level_scale_y
+        
+        # Região visível nas coordenadas do nível
+        level_left = (visible_rect.left() - image_rect.left()) / factor_x
+        level_top = (visible_rect.top() - image_rect.top()) / factor_y
+        level_right = (visible_rect.right() - image_rect.left()) / factor_x
+        level_bottom = (visible_rect.bottom() - image_rect.top()) / factor_y
+        
+        tile_size = self.pyramid.TILE_SIZE
+        first_column = max(0, int(level_left // tile_size))
+        last_column = int(level_right // tile_size)
+        first_row = max(0, int(level_top // tile_size))
+        last_row = int(level_bottom // tile_size)
+        
+        level_rect = self.pyramid.levels[level].rect()
+        for tile_y in range(first_row, last_row + 1):
+            for tile_x in range(first_column, last_column + 1):
+                if tile_x * tile_size >= level_rect.width() or tile_y * tile_size >= level_rect.height():
+                    continue
+                
+                pixmap, rect = self.pyramid.tile(level, tile_x, tile_y)
+                target = QRectF(
+                    image_rect.left() + rect.x() * factor_x,
+                    image_rect.top() + rect.y() * factor_y,
+                    rect.width() * factor_x,
+                    rect.height() * factor_y
+                )
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        
+        painter.end()
+    
+    def resizeEvent(self, event):
+        """Atualiza as barras de rolagem quando a área visível é redimensionada."""
+        super().resizeEvent(event)
+        if self.pyramid is not None:
+            self.render_scheduler.interaction()
+        self.update_scrollbars()
+    
+    def scrollContentsBy(self, dx, dy):
+        """Redesenha a área visível quando a imagem é rolada."""
+        self.viewport().update()
+    
+    def mousePressEvent(self, event):
+        """Emite as coordenadas do pixel clicado na imagem original."""
+        super().mousePressEvent(event)
+        position = self.map_to_image(event.position().toPoint())
+        if position is not None:
+            self.image_clicked.emit(*position)
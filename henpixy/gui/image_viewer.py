@@ -3,10 +3,9 @@ Componente para visualização de imagens.
 """
 
 from PySide6.QtWidgets import QLabel, QScrollArea, QSizePolicy, QVBoxLayout, QWidget
-from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtCore import Qt, QSize
-from PIL import Image, ImageQt
-import numpy as np
+
+from henpixy.gui.qt_image import pil_to_pixmap
 
 class ImageViewer(QWidget):
     """
@@ -57,34 +56,8 @@ class ImageViewer(QWidget):
         # Armazena a imagem
         self.current_image = image
         
-        # Preparar a imagem para exibição
-        display_image = image
-        
-        # Tratar diferentes modos de imagem
-        if display_image.mode in ('RGBA', 'LA'):
-            # Converter para RGB mantendo o canal alpha
-            background = Image.new('RGB', display_image.size, (255, 255, 255))
-            background.paste(display_image, mask=display_image.split()[-1])
-            display_image = background
-        elif display_image.mode not in ('RGB', 'L'):
-            # Converter para RGB se não for RGB ou escala de cinza
-            display_image = display_image.convert('RGB')
-        
-        # Converter para array numpy
-        image_array = np.array(display_image)
-        
-        # Determinar o formato QImage baseado no modo da imagem
-        if len(image_array.shape) == 2:  # Imagem em escala de cinza
-            height, width = image_array.shape
-            bytes_per_line = width
-            q_image = QImage(image_array.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
-        else:  # Imagem RGB
-            height, width, channel = image_array.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(image_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
-        
         # Converter para QPixmap e exibir
-        pixmap = QPixmap.fromImage(q_image)
+        pixmap = pil_to_pixmap(image)
         self.image_label.setPixmap(pixmap)
         
         # Ajustar o tamanho mínimo do label para o tamanho da imagem
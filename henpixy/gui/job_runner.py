@@ -0,0 +1,156 @@
+"""
+Execução de operações de processamento fora da thread da interface.
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+class JobSignals(QObject):
+    """Sinais emitidos por uma tarefa durante a execução e ao terminar"""
+    
+    progress = Signal(int)
+    finished = Signal(object)
+    failed = Signal(object)
+
+class Job(QRunnable):
+    """
+    Tarefa executada no pool de threads
+    
+    O resultado (ou a exceção) é emitido pelos sinais de JobSignals; como o
+    objeto de sinais pertence à thread da interface, os receptores são
+    chamados nela.
+    """
+    
+    def __init__(self, func, args, kwargs):
+        """
+        Inicializa a tarefa
+        
+        Args:
+            func (callable): A função executada
+            args (tuple): Argumentos posicionais da função
+            kwargs (dict): Argumentos nomeados da função
+        """
+        super().__init__()
+        
+        # A tarefa é mantida viva pelo JobRunner até terminar
+        self.setAutoDelete(False)
+        
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self._last_percent = -1
+    
+    def report_progress(self, fraction):
+        """
+        Emite o progresso da tarefa (chamado pela função, na thread do pool)
+        
+        O sinal só é emitido quando o percentual inteiro muda.
+        
+        Args:
+            fraction (float): A fração concluída (0.0 a 1.0)
+        """
+        percent = int(fraction * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(percent)
+    
+    def run(self):
+        """Executa a função e emite o resultado ou a exceção."""
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+            return
+        
+        self.signals.finished.emit(result)
+
+class JobRunner(QObject):
+    """
+    Executa funções em um pool de threads e entrega os resultados na thread da interface
+    
+    As funções de henpixy.tools não alteram suas imagens de entrada, então podem
+    ser executadas enquanto a interface continua exibindo a mesma imagem.
+    """
+    
+    # Emitido quando a primeira tarefa começa e quando a última termina
+    busy_changed = Signal(bool)
+    
+    def __init__(self, parent=None):
+        """
+        Inicializa o executor
+        
+        Args:
+            parent (QObject, optional): O objeto pai
+        """
+        super().__init__(parent)
+        
+        self.pool = QThreadPool(self)
+        self._jobs = set()
+    
+    def submit(self, func, *args, on_finished=None, on_failed=None, on_progress=None, **kwargs):
+        """
+        Executa uma função em segundo plano
+        
+        Args:
+            func (callable): A função executada
+            *args: Argumentos posicionais da função
+            on_finished (callable, optional): Chamado na thread da interface com o resultado
+            on_failed (callable, optional): Chamado na thread da interface com a exceção
+            on_progress (callable, optional): Chamado na thread da interface com o
+                                              percentual concluído; a função recebe
+                                              então o argumento progress
+            **kwargs: Argumentos nomeados da função
+        
+        Returns:
+            Job: A tarefa criada
+        """
+        job = Job(func, args, kwargs)
+        if on_progress is not None:
+            kwargs["progress"] = job.report_progress
+            job.signals.progress.connect(on_progress)
+        job.signals.finished.connect(lambda result: self._on_job_done(job, on_finished, result))
+        job.signals.failed.connect(lambda error: self._on_job_done(job, on_failed, error))
+        
+        self._jobs.add(job)
+        if len(self._jobs) == 1:
+            self.busy_changed.emit(True)
+        
+        self.pool.start(job)
+        return job
+    
+    def _on_job_done(self, job, callback, value):
+        """
+        Encerra uma tarefa e repassa seu resultado (thread da interface)
+        
+        Args:
+            job (Job): A tarefa
+            callback (callable): O receptor do resultado ou da exceção, ou None
+            value (object): O resultado ou a exceção
+        """
+        self._jobs.discard(job)
+        if not self._jobs:
+            self.busy_changed.emit(False)
+        
+        if callback is not None:
+            callback(value)
+    
+    def is_busy(self):
+        """
+        Verifica se há tarefas em execução
+        
+        Returns:
+            bool: True se alguma tarefa ainda não terminou
+        """
+        return bool(self._jobs)
+    
+    def wait_for_done(self, msecs=-1):
+        """
+        Aguarda o fim das tarefas em execução
+        
+        Args:
+            msecs (int): Tempo máximo de espera em milissegundos (-1 para sem limite)
+        
+        Returns:
+            bool: True se todas as tarefas terminaram
+        """
+        return self.pool.waitForDone(msecs)
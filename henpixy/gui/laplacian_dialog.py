@@ -12,6 +12,7 @@ from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QPixmap
 
 from henpixy.gui.image_viewer import ImageViewer
+from henpixy.gui.preview import get_preview_image
 from PIL import Image, ImageQt
 
 class LaplacianDialog(QDialog):
@@ -32,8 +33,9 @@ class LaplacianDialog(QDialog):
         self.setMinimumWidth(800)
         self.setMinimumHeight(600)
         
-        # Armazena a imagem original
+        # Armazena a imagem original e seu proxy reduzido, usado nas pré-visualizações
         self.original_image = image
+        self.preview_image = get_preview_image(image)
         
         # Bandeiras para controlar as configurações
         self.include_diagonals = True  # Por padrão, usa o kernel com diagonais
@@ -166,8 +168,9 @@ class LaplacianDialog(QDialog):
         self.preview_filter()
     
     def update_include_diagonals(self, checked):
-        """Atualiza a configuração de incluir diagonais."""
+        """Atualiza a configuração de incluir diagonais e a pré-visualização."""
         self.include_diagonals = checked
+        self.preview_filter()
     
     def update_sharpening_factor(self, value):
         """Atualiza o fator de aguçamento."""
@@ -176,36 +179,43 @@ class LaplacianDialog(QDialog):
     def preview_filter(self):
         """
         Atualiza a pré-visualização dos três resultados do filtro Laplaciano.
+        
+        Os filtros são aplicados ao proxy reduzido da imagem; a imagem original
+        só é filtrada pela janela principal, ao confirmar o diálogo.
         """
-        from henpixy.tools.spatial_filtering import laplacian_filter
+        from henpixy.core.operations import Operation
+        from henpixy.core.result_cache import cached_apply
         
         # Obtém os parâmetros atuais
         include_diagonals = self.include_diagonals
         sharpening_factor = self.sharpening_factor
         
+        # Os resultados ficam no cache compartilhado: reabrir o diálogo na mesma
+        # imagem ou alternar o tipo de kernel não recalcula o filtro
+        
         # Aplica o filtro Laplaciano sem ajuste
-        no_adjust_image = laplacian_filter(
-            self.original_image, 
+        no_adjust_image = cached_apply(Operation(
+            "laplacian_filter",
             include_diagonals=include_diagonals,
             apply_adjustment=False,
             sharpen_image=False
-        )
+        ), self.preview_image)
         
         # Aplica o filtro Laplaciano com ajuste
-        adjusted_image = laplacian_filter(
-            self.original_image, 
+        adjusted_image = cached_apply(Operation(
+            "laplacian_filter",
             include_diagonals=include_diagonals,
             apply_adjustment=True,
             sharpen_image=False
-        )
+        ), self.preview_image)
         
         # Aplica o aguçamento (imagem original + laplaciano)
-        sharpened_image = laplacian_filter(
-            self.original_image, 
+        sharpened_image = cached_apply(Operation(
+            "laplacian_filter",
             include_diagonals=include_diagonals,
             apply_adjustment=False,
             sharpen_image=True
-        )
+        ), self.preview_image)
         
         # Atualiza os visualizadores de imagem
         self.no_adjust_viewer.set_image(no_adjust_image)
@@ -1,8 +1,8 @@
-from PySide6.QtWidgets import (QMainWindow, QMenuBar, QMenu, 
+from PySide6.QtWidgets import (QApplication, QMainWindow, QMenuBar, QMenu, 
                               QFileDialog, QMessageBox, QLabel,
                               QWidget, QVBoxLayout, QDialog,
                               QInputDialog, QDoubleSpinBox, QHBoxLayout,
-                              QPushButton, QFormLayout, QStackedWidget)
+                              QPushButton, QFormLayout, QStackedWidget, QProgressBar)
 from PySide6.QtGui import QAction, QPixmap, QImage, QCursor
 from PySide6.QtCore import Qt, QPoint, QRect
 from .about_dialog import AboutDialog
@@ -14,21 +14,29 @@ from .pseudocolor_dialog import PseudocolorDialog
 from .mean_filter_dialog import MeanFilterDialog
 from .order_statistics_dialog import OrderStatisticsDialog
 from .laplacian_dialog import LaplacianDialog
+from .raw_import_dialog import RawImportDialog
 from .welcome_screen import WelcomeScreen
+from .image_canvas import ImageCanvas
+from .image_viewer import ImageViewer
+from .job_runner import JobRunner
+from .preview import get_preview_image
 from PIL import Image
 import numpy as np
 import os
 
 # Importar nossas ferramentas
-from henpixy.tools.intensity import zero_intensity
-from henpixy.tools.negative import negative
+from henpixy.tools.bit_plane_slicing import (get_image_bit_depth, reconstruct_from_bit_planes,
+                                             evaluate_bit_plane_reconstruction)
 from henpixy.tools.power import power_transform
-from henpixy.tools.contrast_stretching import contrast_stretching
-from henpixy.tools.bit_plane_slicing import extract_bit_plane, get_image_bit_depth
-from henpixy.tools.spatial_filtering import mean_filter, min_filter, max_filter, median_filter, laplacian_filter
 
 # Importar o gerenciador de histórico
 from henpixy.janela.historico import HistoryManager, HistoryDialog
+from henpixy.core.operations import Operation
+from henpixy.core.result_cache import cached_apply
+from henpixy.core.loaders import (open_draft, load_image, open_mapped, open_image, is_raw_file,
+                                  save_image, list_image_files)
+from henpixy.core.prefetch import PrefetchCache, PREFETCH_DEPTH
+from henpixy.tools.cancellation import CancellationToken, OperationCancelled
 
 # Importar o diálogo de intensidade de pixels
 from henpixy.janela.intensidade import PixelIntensityDialog
@@ -39,7 +47,7 @@ from henpixy.janela.informacoes import ImageInfoDialog
 class GammaDialog(QDialog):
     """Diálogo para ajuste dos parâmetros da transformação gama"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, image=None):
         super().__init__(parent)
         
         self.setWindowTitle("Transformação Gama")
@@ -49,6 +57,9 @@ class GammaDialog(QDialog):
         self.gamma_value = 1.0
         self.c_value = 1.0
         
+        # Proxy reduzido da imagem, usado na pré-visualização
+        self.preview_image = get_preview_image(image) if image is not None else None
+        
         # Layout principal
         layout = QVBoxLayout(self)
         
@@ -91,6 +102,16 @@ class GammaDialog(QDialog):
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
         
+        # Pré-visualização (apenas quando o diálogo recebe a imagem)
+        if self.preview_image is not None:
+            self.preview_viewer = ImageViewer()
+            self.preview_viewer.setMinimumSize(400, 300)
+            layout.addWidget(self.preview_viewer)
+            
+            self.gamma_spin.valueChanged.connect(self.update_preview)
+            self.c_spin.valueChanged.connect(self.update_preview)
+            self.update_preview()
+        
         # Botões de OK e Cancelar
         button_layout = QHBoxLayout()
         ok_button = QPushButton("OK")
@@ -103,6 +124,14 @@ class GammaDialog(QDialog):
         button_layout.addWidget(cancel_button)
         layout.addLayout(button_layout)
     
+    def update_preview(self):
+        """Atualiza a pré-visualização, aplicando a transformação ao proxy reduzido da imagem"""
+        if self.preview_image is None:
+            return
+        
+        gamma_value, c_value = self.get_values()
+        self.preview_viewer.set_image(power_transform(self.preview_image, gamma_value, c_value))
+    
     def get_values(self):
         """Retorna os valores dos parâmetros"""
         self.gamma_value = self.gamma_spin.value()
@@ -135,10 +164,10 @@ class MainWindow(QMainWindow):
         self.edit_widget = QWidget()
         self.edit_layout = QVBoxLayout(self.edit_widget)
         
-        # Label para exibir a imagem
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.edit_layout.addWidget(self.image_label)
+        # Área de exibição da imagem (desenha apenas a região visível)
+        self.image_canvas = ImageCanvas()
+        self.image_canvas.image_clicked.connect(self.on_image_click)
+        self.edit_layout.addWidget(self.image_canvas)
         
         self.stacked_widget.addWidget(self.edit_widget)
         
@@ -149,6 +178,19 @@ class MainWindow(QMainWindow):
         # Inicializa o gerenciador de histórico
         self.history_manager = HistoryManager()
         
+        # Executa as ferramentas fora da thread da interface
+        self.job_runner = JobRunner(self)
+        self.job_runner.busy_changed.connect(self.on_job_busy_changed)
+        
+        # Sinalizador de cancelamento da ferramenta em execução
+        self.cancel_token = None
+        
+        # Versão reduzida exibida enquanto a imagem completa é carregada
+        self.pending_draft = None
+        
+        # Imagens vizinhas da pasta lidas antecipadamente para a navegação
+        self.image_prefetcher = PrefetchCache(open_image)
+        
         # Referência para o diálogo de histórico
         self.history_dialog = None
         
@@ -161,6 +203,9 @@ class MainWindow(QMainWindow):
         # Referência para a janela de histograma
         self.histogram_window = None
         
+        # Referência para o diálogo de planos de bits
+        self.bit_plane_dialog = None
+        
         # Menu de amostras (inicializado no create_menu_bar)
         self.sample_menu = None
         
@@ -175,9 +220,21 @@ class MainWindow(QMainWindow):
         # Criar a barra de menus
         self.create_menu_bar()
         
+        # Progresso e cancelamento da ferramenta em execução, na barra de status
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.clicked.connect(self.cancel_job)
+        self.cancel_button.hide()
+        self.statusBar().addPermanentWidget(self.cancel_button)
+        
         # Exibir a tela de boas-vindas inicialmente
         self.stacked_widget.setCurrentIndex(0)
-        
+    
     def create_menu_bar(self):
         menubar = self.menuBar()
         
@@ -195,6 +252,17 @@ class MainWindow(QMainWindow):
         self.update_sample_menu()  # Preenche o submenu com as imagens disponíveis
         file_menu.addMenu(self.sample_menu)
         
+        # Navegação entre as imagens da pasta
+        next_image_action = QAction("Próxima Imagem da Pasta", self)
+        next_image_action.setShortcut("PgDown")
+        next_image_action.triggered.connect(lambda: self.open_adjacent_image(1))
+        file_menu.addAction(next_image_action)
+        
+        previous_image_action = QAction("Imagem Anterior da Pasta", self)
+        previous_image_action.setShortcut("PgUp")
+        previous_image_action.triggered.connect(lambda: self.open_adjacent_image(-1))
+        file_menu.addAction(previous_image_action)
+        
         # Ação Salvar
         save_action = QAction("Salvar", self)
         save_action.setShortcut("Ctrl+S")
@@ -207,6 +275,11 @@ class MainWindow(QMainWindow):
         save_as_action.triggered.connect(self.save_file_as)
         file_menu.addAction(save_as_action)
         
+        # Ação Exportar Pipeline
+        export_pipeline_action = QAction("Exportar Pipeline...", self)
+        export_pipeline_action.triggered.connect(self.export_pipeline)
+        file_menu.addAction(export_pipeline_action)
+        
         # Separador
         file_menu.addSeparator()
         
@@ -246,8 +319,9 @@ class MainWindow(QMainWindow):
         reset_zoom_action.triggered.connect(self.reset_zoom)
         view_menu.addAction(reset_zoom_action)
         
-        # Menu Ferramentas
+        # Menu Ferramentas (desabilitado enquanto uma ferramenta é executada)
         tools_menu = menubar.addMenu("Ferramentas")
+        self.tools_menu = tools_menu
         
         # Ação Intensidade Zero
         zero_intensity_action = QAction("Intensidade Zero", self)
@@ -341,6 +415,15 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            # Aguarda a gravação do histórico pendente e libera a sessão antes de fechar
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                self.cancel_job()
+                self.job_runner.wait_for_done()
+                self.image_prefetcher.close()
+                self.history_manager.close()
+            finally:
+                QApplication.restoreOverrideCursor()
             event.accept()
         else:
             event.ignore()
@@ -373,7 +456,8 @@ class MainWindow(QMainWindow):
     
     def on_history_accepted(self):
         """Chamado quando o diálogo de histórico é aceito"""
-        # O usuário restaurou uma imagem do histórico
+        # O usuário restaurou uma imagem do histórico (e descarta o carregamento em andamento)
+        self.pending_draft = None
         self.current_image = self.history_manager.get_current_image()
         self.update_display_image()
         
@@ -390,24 +474,8 @@ class MainWindow(QMainWindow):
             )
             return
         
-        try:
-            # Aplica a ferramenta de intensidade zero
-            processed_image = zero_intensity(self.current_image)
-            
-            # Adiciona ao histórico
-            self.history_manager.add_item(processed_image, "Intensidade Zero")
-            
-            # Atualiza a imagem atual
-            self.current_image = processed_image
-            
-            # Exibe a imagem processada
-            self.update_display_image()
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erro",
-                f"Não foi possível processar a imagem.\nErro: {str(e)}"
-            )
+        # Aplica a ferramenta de intensidade zero em segundo plano
+        self.apply_operation(Operation("zero_intensity"), "Intensidade Zero", "Não foi possível processar a imagem.")
     
     def apply_negative(self):
         """Aplica a função de negativo na imagem atual"""
@@ -419,81 +487,130 @@ class MainWindow(QMainWindow):
             )
             return
         
-        try:
-            # Aplica a função de negativo
-            processed_image = negative(self.current_image)
-            
-            # Adiciona ao histórico
-            self.history_manager.add_item(processed_image, "Negativo")
-            
-            # Atualiza a imagem atual
-            self.current_image = processed_image
+        # Aplica a função de negativo em segundo plano
+        self.apply_operation(Operation("negative"), "Negativo", "Não foi possível processar a imagem.")
+    
+    def start_job(self, func, *args, description, on_finished, error_message):
+        """
+        Executa uma ferramenta sobre a imagem atual fora da thread da interface
+        
+        O resultado é descartado se a imagem atual mudar durante a execução
+        (por exemplo, ao abrir outra imagem ou navegar pelo histórico). A
+        função recebe os argumentos progress e cancel_token, ligados à barra
+        de progresso e ao botão Cancelar da barra de status.
+        
+        Args:
+            func (callable): A função executada
+            *args: Argumentos da função
+            description (str): Descrição exibida na barra de status
+            on_finished (callable): Chamado com o resultado na thread da interface
+            error_message (str): Mensagem exibida se a função falhar
+        """
+        if self.job_runner.is_busy():
+            QMessageBox.warning(
+                self,
+                "Aviso",
+                "Aguarde o término da operação em andamento."
+            )
+            return
+        
+        source_image = self.current_image
+        self.cancel_token = CancellationToken()
+        
+        def on_job_finished(result):
+            self.statusBar().clearMessage()
+            if self.current_image is source_image:
+                on_finished(result)
+        
+        def on_job_failed(error):
+            if isinstance(error, OperationCancelled):
+                self.statusBar().showMessage("Operação cancelada", 3000)
+                return
             
-            # Exibe a imagem processada
-            self.update_display_image()
-        except Exception as e:
+            self.statusBar().clearMessage()
             QMessageBox.critical(
                 self,
                 "Erro",
-                f"Não foi possível processar a imagem.\nErro: {str(e)}"
+                f"{error_message}\nErro: {str(error)}"
             )
+        
+        self.statusBar().showMessage(f"Processando: {description}...")
+        self.job_runner.submit(
+            func, *args,
+            on_finished=on_job_finished,
+            on_failed=on_job_failed,
+            on_progress=self.progress_bar.setValue,
+            cancel_token=self.cancel_token
+        )
+    
+    def apply_operation(self, operation, description, error_message, cached=False):
+        """
+        Aplica uma operação registrada à imagem atual em segundo plano
+        
+        Ao terminar, o resultado é adicionado ao histórico e exibido.
+        
+        Args:
+            operation (Operation): A operação
+            description (str): Descrição da modificação no histórico
+            error_message (str): Mensagem exibida se a operação falhar
+            cached (bool): Se True, usa o cache de resultados (filtros espaciais)
+        """
+        self.start_job(
+            cached_apply if cached else Operation.apply,
+            operation, self.current_image,
+            description=description,
+            on_finished=lambda image: self.set_processed_image(image, description, operation),
+            error_message=error_message
+        )
+    
+    def set_processed_image(self, image, description, operation=None):
+        """
+        Adiciona uma imagem processada ao histórico e a exibe como imagem atual
+        
+        Args:
+            image (PIL.Image.Image): A imagem processada
+            description (str): Descrição da modificação
+            operation (Operation, optional): A operação que gerou a imagem
+        """
+        self.history_manager.add_item(image, description, operation)
+        self.current_image = image
+        self.update_display_image()
+    
+    def on_job_busy_changed(self, busy):
+        """
+        Desabilita as ferramentas e exibe o progresso enquanto uma delas é executada
+        
+        Args:
+            busy (bool): True se há uma ferramenta em execução
+        """
+        self.tools_menu.setEnabled(not busy)
+        
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(busy)
+        
+        if not busy:
+            self.cancel_token = None
+    
+    def cancel_job(self):
+        """Solicita o cancelamento da ferramenta em execução"""
+        if self.cancel_token is None:
+            return
+        
+        self.cancel_token.cancel()
+        self.cancel_button.setEnabled(False)
+        self.statusBar().showMessage("Cancelando...")
     
     def update_display_image(self):
         """Atualiza a exibição da imagem atual"""
         if self.current_image is None:
             return
         
-        # Preparar a imagem para exibição
-        display_image = self.current_image
-        
-        # Tratar diferentes modos de imagem
-        if display_image.mode in ('RGBA', 'LA'):
-            # Converter para RGB mantendo o canal alpha
-            background = Image.new('RGB', display_image.size, (255, 255, 255))
-            background.paste(display_image, mask=display_image.split()[-1])
-            display_image = background
-        elif display_image.mode not in ('RGB', 'L'):
-            # Converter para RGB se não for RGB ou escala de cinza
-            display_image = display_image.convert('RGB')
-        
-        # Converter para array numpy
-        image_array = np.array(display_image)
-        
-        # Determinar o formato QImage baseado no modo da imagem
-        if len(image_array.shape) == 2:  # Imagem em escala de cinza
-            height, width = image_array.shape
-            bytes_per_line = width
-            q_image = QImage(image_array.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
-        else:  # Imagem RGB
-            height, width, channel = image_array.shape
-            bytes_per_line = 3 * width
-            q_image = QImage(image_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
-        
-        # Converter para QPixmap e exibir
-        pixmap = QPixmap.fromImage(q_image)
-        
-        # Aplicar zoom
-        if self.zoom_factor != 1.0:
-            # Calcula o novo tamanho baseado no zoom
-            new_width = int(pixmap.width() * self.zoom_factor)
-            new_height = int(pixmap.height() * self.zoom_factor)
-            
-            # Redimensiona o pixmap
-            scaled_pixmap = pixmap.scaled(
-                new_width,
-                new_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-        else:
-            # Redimensionar a imagem para caber na janela mantendo a proporção
-            scaled_pixmap = pixmap.scaled(
-                self.image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-        
-        self.image_label.setPixmap(scaled_pixmap)
+        # A pirâmide de resolução só é reconstruída quando a imagem muda; o zoom
+        # apenas escolhe o nível e os blocos visíveis
+        self.image_canvas.set_image(self.current_image)
+        self.image_canvas.set_zoom(self.zoom_factor)
         
         # Alterna para a tela de edição se estiver na tela de boas-vindas
         if self.stacked_widget.currentIndex() == 0:
@@ -547,7 +664,7 @@ class MainWindow(QMainWindow):
     def open_file(self):
         # Filtros para diferentes tipos de imagem
         image_filters = (
-            "Imagens (*.png *.jpg *.jpeg *.bmp *.gif *.tiff *.tif *.webp *.ico *.psd *.xbm *.xpm);;"
+            "Imagens (*.png *.jpg *.jpeg *.bmp *.gif *.tiff *.tif *.webp *.ico *.psd *.xbm *.xpm *.npy *.raw *.bin);;"
             "PNG (*.png);;"
             "JPEG (*.jpg *.jpeg);;"
             "BMP (*.bmp);;"
@@ -558,6 +675,8 @@ class MainWindow(QMainWindow):
             "PSD (*.psd);;"
             "XBM (*.xbm);;"
             "XPM (*.xpm);;"
+            "NumPy (*.npy);;"
+            "Dados brutos (*.raw *.bin);;"
             "Todos os arquivos (*.*)"
         )
         
@@ -573,36 +692,185 @@ class MainWindow(QMainWindow):
     
     def open_image_file(self, file_name):
         """Abre uma imagem a partir de um caminho de arquivo."""
+        raw_format = None
+        if is_raw_file(file_name):
+            # Arquivos de pixels brutos não têm cabeçalho: o formato é informado pelo usuário
+            dialog = RawImportDialog(self, file_name)
+            if dialog.exec() != QDialog.Accepted:
+                return
+            raw_format = dialog.get_format()
+        
+        self.load_image_path(file_name, os.path.basename(file_name), raw_format=raw_format)
+    
+    def open_adjacent_image(self, step):
+        """
+        Abre a imagem seguinte ou anterior da pasta da imagem atual
+        
+        Se a imagem tiver sido agendada para leitura em segundo plano, ela é
+        exibida assim que essa leitura terminar, sem ler o arquivo de novo.
+        Em seguida, as próximas PREFETCH_DEPTH imagens na
+        mesma direção começam a ser lidas (henpixy.core.prefetch.PrefetchCache).
+        A navegação é ignorada enquanto a imagem anterior ainda estiver sendo
+        carregada, pois o caminho atual só é atualizado ao fim do carregamento.
+        
+        Args:
+            step (int): 1 para a próxima imagem, -1 para a anterior
+        """
+        if not self.current_image_path:
+            return
+        
+        if self.pending_draft is not None:
+            self.statusBar().showMessage("Aguarde o carregamento da imagem atual", 3000)
+            return
+        
         try:
-            # Abrir a imagem usando Pillow
-            image = Image.open(file_name)
-            
-            # Guardar a imagem original e o caminho
-            self.current_image = image
-            self.current_image_path = file_name
-            
-            # Adicionar ao histórico
-            self.history_manager.clear()  # Limpa o histórico anterior
-            self.history_manager.add_item(image, f"Original: {os.path.basename(file_name)}")
-            
-            # Redefine o zoom ao abrir uma nova imagem
-            self.zoom_factor = 1.0
-            
-            # Atualizar o título da janela
-            self.update_window_title()
-            
-            # Exibir a imagem
-            self.update_display_image()
-            
-            # Alternar para a tela de edição
-            self.stacked_widget.setCurrentIndex(1)
+            paths = [os.path.abspath(path) for path in
+                     list_image_files(os.path.dirname(os.path.abspath(self.current_image_path)))]
+        except OSError as e:
+            QMessageBox.critical(
+                self,
+                "Erro",
+                f"Não foi possível listar as imagens da pasta.\nErro: {str(e)}"
+            )
+            return
+        
+        current_path = os.path.abspath(self.current_image_path)
+        if current_path not in paths:
+            return
+        
+        index = paths.index(current_path) + step
+        if not 0 <= index < len(paths):
+            self.statusBar().showMessage("Não há mais imagens nesta pasta", 3000)
+            return
+        
+        file_path = paths[index]
+        image = self.image_prefetcher.take(file_path)
+        if image is not None:
+            self.set_opened_image(image, file_path, os.path.basename(file_path))
+        else:
+            self.load_image_path(file_path, os.path.basename(file_path))
+        
+        ahead = range(index + step, index + step * (PREFETCH_DEPTH + 1), step)
+        self.image_prefetcher.prefetch([paths[i] for i in ahead if 0 <= i < len(paths)])
+    
+    def load_image_path(self, file_path, display_name, status_message=None, raw_format=None):
+        """
+        Abre uma imagem e a define como imagem atual
+        
+        TIFFs sem compressão, arquivos .npy e arquivos de pixels brutos são
+        mapeados em memória (henpixy.core.loaders.open_mapped): a abertura não
+        decodifica os pixels, que são lidos do arquivo sob demanda. JPEGs
+        grandes são exibidos primeiro em uma versão reduzida, decodificada
+        rapidamente (Image.draft), enquanto a imagem completa é decodificada em
+        segundo plano; as ferramentas ficam desabilitadas até que ela substitua
+        a versão reduzida. Os demais arquivos são abertos diretamente.
+        
+        Args:
+            file_path (str): Caminho do arquivo
+            display_name (str): Nome exibido no histórico
+            status_message (str, optional): Mensagem exibida na barra de status ao terminar
+            raw_format (dict, optional): Formato de um arquivo de pixels brutos
+                                         (ver RawImportDialog.get_format)
+        """
+        try:
+            mapped_image = open_mapped(file_path, raw_format)
+            if mapped_image is not None:
+                self.set_opened_image(mapped_image, file_path, display_name, status_message)
+                return
             
+            draft = open_draft(file_path)
+            if draft is None:
+                # Abrir a imagem usando Pillow
+                self.set_opened_image(Image.open(file_path), file_path, display_name, status_message)
+                return
         except Exception as e:
             QMessageBox.critical(
                 self,
                 "Erro",
                 f"Não foi possível abrir a imagem.\nErro: {str(e)}"
             )
+            return
+        
+        draft_image, full_size = draft
+        previous_image = self.current_image
+        
+        # Nenhuma ferramenta é aplicada à versão reduzida
+        self.pending_draft = draft_image
+        self.current_image = None
+        
+        # Exibe a versão reduzida no tamanho da imagem completa
+        self.zoom_factor = 1.0
+        self.image_canvas.set_image(draft_image, full_size=full_size)
+        self.image_canvas.set_zoom(self.zoom_factor)
+        self.stacked_widget.setCurrentIndex(1)
+        self.statusBar().showMessage(f"Carregando: {display_name}...")
+        
+        def on_loaded(image):
+            # Outra imagem foi aberta ou restaurada durante o carregamento
+            if self.pending_draft is not draft_image:
+                return
+            self.set_opened_image(image, file_path, display_name, status_message)
+        
+        def on_failed(error):
+            if self.pending_draft is not draft_image:
+                return
+            self.pending_draft = None
+            
+            # Volta para a imagem exibida antes da abertura
+            self.current_image = previous_image
+            if previous_image is not None:
+                self.update_display_image()
+            else:
+                self.image_canvas.clear()
+                self.stacked_widget.setCurrentIndex(0)
+            self.statusBar().clearMessage()
+            
+            QMessageBox.critical(
+                self,
+                "Erro",
+                f"Não foi possível abrir a imagem.\nErro: {str(error)}"
+            )
+        
+        self.job_runner.submit(load_image, file_path, on_finished=on_loaded, on_failed=on_failed)
+    
+    def set_opened_image(self, image, file_path, display_name, status_message=None):
+        """
+        Define uma imagem recém-aberta como imagem atual e reinicia o histórico
+        
+        Args:
+            image (PIL.Image.Image): A imagem
+            file_path (str): Caminho do arquivo
+            display_name (str): Nome exibido no histórico
+            status_message (str, optional): Mensagem exibida na barra de status
+        """
+        self.pending_draft = None
+        
+        # Guardar a imagem original e o caminho
+        self.current_image = image
+        self.current_image_path = file_path
+        
+        # Adicionar ao histórico
+        self.history_manager.clear()  # Limpa o histórico anterior
+        self.history_manager.add_item(image, f"Original: {display_name}")
+        
+        # Redefine o zoom ao abrir uma nova imagem
+        self.zoom_factor = 1.0
+        
+        # Atualizar o título da janela
+        self.update_window_title()
+        
+        # Exibir a imagem
+        self.update_display_image()
+        
+        # Alternar para a tela de edição
+        self.stacked_widget.setCurrentIndex(1)
+        
+        # Informar ao usuário
+        statusBar = self.statusBar()
+        if status_message:
+            statusBar.showMessage(status_message, 3000)
+        else:
+            statusBar.clearMessage()
     
     def save_file(self):
         """Salva a imagem atual no mesmo local onde foi aberta"""
@@ -614,10 +882,11 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Se já temos um caminho, salvar diretamente
-        if self.current_image_path:
+        # Se já temos um caminho, salvar diretamente (arquivos de pixels brutos
+        # não guardam o formato dos pixels e são salvos em outro formato)
+        if self.current_image_path and not is_raw_file(self.current_image_path):
             try:
-                self.current_image.save(self.current_image_path)
+                save_image(self.current_image, self.current_image_path)
                 QMessageBox.information(
                     self,
                     "Sucesso",
@@ -650,7 +919,8 @@ class MainWindow(QMainWindow):
             "BMP (*.bmp);;"
             "GIF (*.gif);;"
             "TIFF (*.tiff);;"
-            "WebP (*.webp)"
+            "WebP (*.webp);;"
+            "NumPy (*.npy)"
         )
         
         # Determinar filtro padrão baseado na extensão do arquivo atual
@@ -667,6 +937,8 @@ class MainWindow(QMainWindow):
                 default_filter = "TIFF (*.tiff)"
             elif ext == ".webp":
                 default_filter = "WebP (*.webp)"
+            elif ext == ".npy":
+                default_filter = "NumPy (*.npy)"
         
         # Abrir diálogo para salvar
         file_path, selected_filter = QFileDialog.getSaveFileName(
@@ -693,9 +965,11 @@ class MainWindow(QMainWindow):
                         file_path += ".tiff"
                     elif selected_filter == "WebP (*.webp)":
                         file_path += ".webp"
+                    elif selected_filter == "NumPy (*.npy)":
+                        file_path += ".npy"
                 
                 # Salvar a imagem
-                self.current_image.save(file_path)
+                save_image(self.current_image, file_path)
                 
                 # Atualizar o caminho atual
                 self.current_image_path = file_path
@@ -715,17 +989,45 @@ class MainWindow(QMainWindow):
                     f"Não foi possível salvar a imagem.\nErro: {str(e)}"
                 )
     
-    def resizeEvent(self, event):
-        """Redimensiona a imagem quando a janela é redimensionada"""
-        super().resizeEvent(event)
-        if hasattr(self, 'image_label') and self.image_label.pixmap() and self.zoom_factor == 1.0:
-            # Só redimensiona automaticamente se o zoom estiver em 100%
-            scaled_pixmap = self.image_label.pixmap().scaled(
-                self.image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
+    def export_pipeline(self):
+        """Grava as operações do histórico em um arquivo de pipeline para o henpixy-batch"""
+        try:
+            pipeline = self.history_manager.get_pipeline()
+        except ValueError as e:
+            QMessageBox.warning(
+                self,
+                "Aviso",
+                f"O histórico não pode ser exportado como pipeline.\n{str(e)}"
+            )
+            return
+        
+        if len(pipeline) == 0:
+            QMessageBox.warning(
+                self,
+                "Aviso",
+                "Não há operações no histórico para exportar."
             )
-            self.image_label.setPixmap(scaled_pixmap)
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exportar Pipeline",
+            "",
+            "Pipeline JSON (*.json)"
+        )
+        
+        if file_path:
+            if not os.path.splitext(file_path)[1]:
+                file_path += ".json"
+            try:
+                pipeline.save(file_path)
+                self.statusBar().showMessage(f"Pipeline exportado: {file_path}", 3000)
+            except Exception as e:
+                QMessageBox.critical(
+                    self,
+                    "Erro",
+                    f"Não foi possível exportar o pipeline.\nErro: {str(e)}"
+                )
     
     def show_about(self):
         dialog = AboutDialog(self)
@@ -765,63 +1067,39 @@ class MainWindow(QMainWindow):
         
         # Muda o cursor para indicar o modo de seleção
         self.setCursor(Qt.CrossCursor)
-        
-        # Conectar o evento de clique na imagem
-        self.image_label.mousePressEvent = self.on_image_click
     
-    def on_image_click(self, event):
-        """Manipula o clique na imagem para selecionar um pixel"""
+    def on_image_click(self, img_x, img_y):
+        """
+        Manipula o clique na imagem para selecionar um pixel
+        
+        Args:
+            img_x (int): Coordenada x do pixel na imagem original
+            img_y (int): Coordenada y do pixel na imagem original
+        """
         if not self.pixel_selection_mode or self.intensity_dialog is None:
-            # Chamada ao método padrão se não estiver no modo de seleção
-            QLabel.mousePressEvent(self.image_label, event)
             return
         
-        # Obtém as coordenadas do clique relativas à imagem
-        pos = event.pos()
-        pixmap = self.image_label.pixmap()
+        # Define o pixel selecionado no diálogo de intensidade
+        self.intensity_dialog.set_selected_pixel(img_x, img_y)
         
-        if pixmap:
-            # Calcula as coordenadas reais na imagem
-            image_rect = self.get_image_display_rect()
-            
-            if image_rect.contains(pos):
-                # Converte as coordenadas do clique para coordenadas na imagem original
-                img_x = int((pos.x() - image_rect.left()) * self.current_image.width / image_rect.width())
-                img_y = int((pos.y() - image_rect.top()) * self.current_image.height / image_rect.height())
-                
-                # Define o pixel selecionado no diálogo de intensidade
-                self.intensity_dialog.set_selected_pixel(img_x, img_y)
-                
-                # Desativa o modo de seleção
-                self.pixel_selection_mode = False
-                
-                # Restaura o cursor
-                self.setCursor(Qt.ArrowCursor)
+        # Desativa o modo de seleção
+        self.pixel_selection_mode = False
+        
+        # Restaura o cursor
+        self.setCursor(Qt.ArrowCursor)
     
     def get_image_display_rect(self):
         """
         Retorna o retângulo onde a imagem está sendo exibida
         
         Returns:
-            QRect: Retângulo da imagem
+            QRect: Retângulo da imagem nas coordenadas da área de exibição
         """
-        pixmap = self.image_label.pixmap()
-        if not pixmap:
+        image_rect = self.image_canvas.image_display_rect()
+        if image_rect is None:
             return None
         
-        # Obtém o tamanho da label
-        label_size = self.image_label.size()
-        
-        # Calcula o tamanho da imagem escalada
-        scaled_size = pixmap.size()
-        scaled_size.scale(label_size, Qt.KeepAspectRatio)
-        
-        # Calcula a posição da imagem dentro da label
-        pos_x = (label_size.width() - scaled_size.width()) / 2
-        pos_y = (label_size.height() - scaled_size.height()) / 2
-        
-        # Retorna o retângulo
-        return QRect(int(pos_x), int(pos_y), scaled_size.width(), scaled_size.height())
+        return image_rect.toRect()
     
     def show_image_info(self):
         """Exibe o diálogo de informações da imagem"""
@@ -919,39 +1197,8 @@ class MainWindow(QMainWindow):
             )
             return
         
-        try:
-            # Abrir a imagem usando Pillow
-            image = Image.open(file_path)
-            
-            # Guardar a imagem original e o caminho
-            self.current_image = image
-            self.current_image_path = file_path
-            
-            # Adicionar ao histórico
-            self.history_manager.clear()  # Limpa o histórico anterior
-            self.history_manager.add_item(image, f"Original: {sample_file}")
-            
-            # Redefine o zoom ao abrir uma nova imagem
-            self.zoom_factor = 1.0
-            
-            # Atualizar o título da janela
-            self.update_window_title()
-            
-            # Exibir a imagem
-            self.update_display_image()
-            
-            # Informar ao usuário
-            statusBar = self.statusBar()
-            if statusBar:
-                statusBar.showMessage(f"Imagem de amostra carregada: {sample_file}", 3000)
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erro",
-                f"Não foi possível abrir a imagem.\nErro: {str(e)}"
-            )
-
+        self.load_image_path(file_path, sample_file, f"Imagem de amostra carregada: {sample_file}")
+    
     def apply_gamma(self):
         """Aplica a transformação gama na imagem atual"""
         if self.current_image is None:
@@ -964,7 +1211,7 @@ class MainWindow(QMainWindow):
         
         try:
             # Abre o diálogo de ajuste dos parâmetros da transformação gama
-            dialog = GammaDialog(self)
+            dialog = GammaDialog(self, self.current_image)
             result = dialog.exec()
             
             # Verifica se o usuário cancelou a operação
@@ -974,17 +1221,12 @@ class MainWindow(QMainWindow):
             # Obtém os valores dos parâmetros
             gamma_value, c_value = dialog.get_values()
             
-            # Aplica a transformação gama
-            processed_image = power_transform(self.current_image, gamma_value, c_value)
-            
-            # Adiciona ao histórico
-            self.history_manager.add_item(processed_image, f"Transformação Gama (γ={gamma_value}, c={c_value})")
-            
-            # Atualiza a imagem atual
-            self.current_image = processed_image
-            
-            # Exibe a imagem processada
-            self.update_display_image()
+            # Aplica a transformação gama em segundo plano
+            self.apply_operation(
+                Operation("power_transform", gamma=gamma_value, c=c_value),
+                f"Transformação Gama (γ={gamma_value}, c={c_value})",
+                "Não foi possível processar a imagem."
+            )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1004,7 +1246,7 @@ class MainWindow(QMainWindow):
         
         try:
             # Abre o diálogo de ajuste dos parâmetros do alargamento de contraste
-            dialog = ContrastStretchingDialog(self)
+            dialog = ContrastStretchingDialog(self, self.current_image)
             result = dialog.exec()
             
             # Verifica se o usuário cancelou a operação
@@ -1015,20 +1257,12 @@ class MainWindow(QMainWindow):
             params = dialog.get_parameters()
             r1, s1, r2, s2 = params["r1"], params["s1"], params["r2"], params["s2"]
             
-            # Aplica o alargamento de contraste
-            processed_image = contrast_stretching(self.current_image, r1, s1, r2, s2)
-            
-            # Adiciona ao histórico
-            self.history_manager.add_item(
-                processed_image, 
-                f"Alargamento de Contraste (r1={r1}, s1={s1}, r2={r2}, s2={s2})"
+            # Aplica o alargamento de contraste em segundo plano
+            self.apply_operation(
+                Operation("contrast_stretching", r1=r1, s1=s1, r2=r2, s2=s2),
+                f"Alargamento de Contraste (r1={r1}, s1={s1}, r2={r2}, s2={s2})",
+                "Não foi possível processar a imagem."
             )
-            
-            # Atualiza a imagem atual
-            self.current_image = processed_image
-            
-            # Exibe a imagem processada
-            self.update_display_image()
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1047,8 +1281,8 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            # Obtém uma cópia da imagem atual para processamento
-            image_to_process = self.current_image.copy()
+            # As ferramentas não alteram a imagem de entrada, então não é preciso copiá-la
+            image_to_process = self.current_image
             
             # Tenta determinar a profundidade de bits e intensidade máxima da imagem
             try:
@@ -1070,12 +1304,14 @@ class MainWindow(QMainWindow):
             # Cria uma instância do diálogo com as informações da imagem
             dialog = BitPlaneDialog(self, bit_depth, max_intensity)
             
-            # Conecta o sinal ao slot correspondente
+            # Conecta os sinais aos slots correspondentes
             dialog.bit_plane_selected.connect(self.on_bit_plane_selected)
+            dialog.reconstruction_requested.connect(self.on_bit_plane_reconstruction)
             
             # Exibe o diálogo (não modal para permitir visualização enquanto aberto)
+            self.bit_plane_dialog = dialog
             dialog.show()
-            
+        
         except ValueError as e:
             # Erro específico ao calcular valores inválidos
             QMessageBox.critical(
@@ -1104,42 +1340,48 @@ class MainWindow(QMainWindow):
         Args:
             plane (int): O plano de bits a ser visualizado
         """
-        try:
-            # Extrai o plano de bits selecionado
-            bit_plane_image = extract_bit_plane(self.current_image, plane)
+        # Extrai o plano de bits selecionado em segundo plano
+        self.apply_operation(
+            Operation("extract_bit_plane", plane=plane),
+            f"Plano de Bits {plane} (peso {2**plane})",
+            "Não foi possível extrair o plano de bits."
+        )
+    
+    def on_bit_plane_reconstruction(self, planes):
+        """
+        Reconstrói a imagem atual a partir dos planos de bits selecionados
+        
+        Args:
+            planes (list): Os planos de bits a serem mantidos
+        """
+        def reconstruct(image, progress=None, cancel_token=None):
+            # Mede o erro e a economia antes de substituir a imagem atual
+            metrics = evaluate_bit_plane_reconstruction(image, planes)
+            cancel_token.raise_if_cancelled()
+            return reconstruct_from_bit_planes(image, planes), metrics
+        
+        def on_reconstructed(result):
+            reconstructed_image, metrics = result
             
-            # Adiciona ao histórico
-            self.history_manager.add_item(
-                bit_plane_image,
-                f"Plano de Bits {plane} (peso {2**plane})"
+            # Adiciona ao histórico e exibe a imagem reconstruída
+            planes_text = ", ".join(str(plane) for plane in sorted(planes, reverse=True))
+            self.set_processed_image(
+                reconstructed_image,
+                f"Reconstrução por Planos de Bits ({planes_text})",
+                Operation("reconstruct_from_bit_planes", planes=list(planes))
             )
             
-            # Atualiza a imagem atual
-            self.current_image = bit_plane_image
-            
-            # Exibe a imagem processada
-            self.update_display_image()
-            
-        except ValueError as e:
-            # Erro específico de validação
-            QMessageBox.warning(
-                self,
-                "Aviso",
-                f"Não foi possível extrair o plano de bits:\n{str(e)}"
-            )
-        except Exception as e:
-            # Erro genérico com mais detalhes
-            import traceback
-            error_details = traceback.format_exc()
-            
-            QMessageBox.critical(
-                self,
-                "Erro",
-                f"Não foi possível extrair o plano de bits.\n"
-                f"Erro: {str(e)}\n\n"
-                f"Detalhes técnicos (para desenvolvimento):\n{error_details}"
-            )
-
+            # Exibe as métricas no diálogo
+            if self.bit_plane_dialog is not None:
+                self.bit_plane_dialog.show_reconstruction_metrics(metrics)
+        
+        self.start_job(
+            reconstruct, self.current_image,
+            description="Reconstrução por Planos de Bits",
+            on_finished=on_reconstructed,
+            error_message="Não foi possível reconstruir a imagem."
+        )
+    
     def apply_histogram_equalization(self):
         """Aplica equalização de histograma na imagem atual"""
         if self.current_image is None:
@@ -1154,20 +1396,13 @@ class MainWindow(QMainWindow):
             # Cria o diálogo de equalização
             dialog = HistogramDialog(self, self.current_image)
             
-            # Se o usuário aceitar, aplica a equalização
+            # Se o usuário aceitar, equaliza a imagem original em segundo plano
             if dialog.exec() == QDialog.Accepted:
-                # Obtém a imagem equalizada
-                equalized_image = dialog.equalized_image
-                
-                if equalized_image:
-                    # Adiciona ao histórico
-                    self.history_manager.add_item(equalized_image, "Equalização de Histograma")
-                    
-                    # Atualiza a imagem atual
-                    self.current_image = equalized_image
-                    
-                    # Exibe a imagem processada
-                    self.update_display_image()
+                self.apply_operation(
+                    dialog.operation,
+                    "Equalização de Histograma",
+                    "Não foi possível equalizar o histograma."
+                )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1189,20 +1424,21 @@ class MainWindow(QMainWindow):
             # Cria o diálogo de pseudocores
             dialog = PseudocolorDialog(self, self.current_image)
             
-            # Se o usuário aceitar, aplica a transformação
-            if dialog.exec() == QDialog.Accepted:
-                # Obtém a imagem com pseudocores
-                pseudocolor_image = dialog.result_image
+            # Se o usuário aceitar, aplica a transformação à imagem original em segundo plano
+            if dialog.exec() == QDialog.Accepted and dialog.transformation is not None:
+                description = "Fatiamento por Intensidades para Pseudocores"
+                error_message = "Não foi possível aplicar o fatiamento por intensidades."
                 
-                if pseudocolor_image:
-                    # Adiciona ao histórico
-                    self.history_manager.add_item(pseudocolor_image, "Fatiamento por Intensidades para Pseudocores")
-                    
-                    # Atualiza a imagem atual
-                    self.current_image = pseudocolor_image
-                    
-                    # Exibe a imagem processada
-                    self.update_display_image()
+                if dialog.operation is not None:
+                    self.apply_operation(dialog.operation, description, error_message)
+                else:
+                    self.start_job(
+                        dialog.transformation,
+                        self.current_image,
+                        description=description,
+                        on_finished=lambda image: self.set_processed_image(image, description),
+                        error_message=error_message
+                    )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1229,17 +1465,14 @@ class MainWindow(QMainWindow):
                 # Obtém o tamanho do kernel selecionado
                 kernel_size = dialog.get_kernel_size()
                 
-                # Aplica o filtro da média
-                filtered_image = mean_filter(self.current_image, kernel_size)
-                
-                # Adiciona ao histórico
-                self.history_manager.add_item(filtered_image, f"Filtro da Média {kernel_size}x{kernel_size}")
-                
-                # Atualiza a imagem atual
-                self.current_image = filtered_image
-                
-                # Exibe a imagem processada
-                self.update_display_image()
+                # Aplica o filtro da média em segundo plano (reaproveitado do cache
+                # se já foi aplicado à mesma imagem com o mesmo tamanho de kernel)
+                self.apply_operation(
+                    Operation("mean_filter", kernel_size=kernel_size),
+                    f"Filtro da Média {kernel_size}x{kernel_size}",
+                    "Não foi possível aplicar o filtro da média.",
+                    cached=True
+                )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1267,25 +1500,25 @@ class MainWindow(QMainWindow):
                 kernel_size = dialog.get_kernel_size()
                 filter_type = dialog.get_filter_type()
                 
-                # Aplica o filtro selecionado
+                # Seleciona o filtro
                 if filter_type == "max":
-                    filtered_image = max_filter(self.current_image, kernel_size)
                     filter_name = "Máximo"
+                    operation_name = "max_filter"
                 elif filter_type == "min":
-                    filtered_image = min_filter(self.current_image, kernel_size)
                     filter_name = "Mínimo"
+                    operation_name = "min_filter"
                 else:  # mediana
-                    filtered_image = median_filter(self.current_image, kernel_size)
                     filter_name = "Mediana"
+                    operation_name = "median_filter"
                 
-                # Adiciona ao histórico
-                self.history_manager.add_item(filtered_image, f"Filtro de {filter_name} {kernel_size}x{kernel_size}")
-                
-                # Atualiza a imagem atual
-                self.current_image = filtered_image
-                
-                # Exibe a imagem processada
-                self.update_display_image()
+                # Aplica o filtro selecionado em segundo plano (reaproveitado do
+                # cache se possível)
+                self.apply_operation(
+                    Operation(operation_name, kernel_size=kernel_size),
+                    f"Filtro de {filter_name} {kernel_size}x{kernel_size}",
+                    "Não foi possível aplicar o filtro de estatística de ordem.",
+                    cached=True
+                )
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1315,7 +1548,7 @@ class MainWindow(QMainWindow):
         
         # Exibe a janela
         self.histogram_window.show()
-
+    
     def apply_laplacian_filter(self):
         """Aplica o filtro Laplaciano na imagem atual"""
         if self.current_image is None:
@@ -1336,28 +1569,23 @@ class MainWindow(QMainWindow):
                 params = dialog.get_parameters()
                 include_diagonals = params['include_diagonals']
                 
-                # Aplica o filtro Laplaciano com aguçamento
-                filtered_image = laplacian_filter(
-                    self.current_image,
+                # Define o nome do tipo de kernel para o histórico
+                kernel_type = "com diagonais" if include_diagonals else "sem diagonais"
+                
+                # Aplica o filtro Laplaciano com aguçamento em segundo plano (o
+                # diálogo pré-visualiza apenas um proxy reduzido da imagem)
+                operation = Operation(
+                    "laplacian_filter",
                     include_diagonals=include_diagonals,
                     apply_adjustment=False,
                     sharpen_image=True
                 )
-                
-                # Define o nome do tipo de kernel para o histórico
-                kernel_type = "com diagonais" if include_diagonals else "sem diagonais"
-                
-                # Adiciona ao histórico
-                self.history_manager.add_item(
-                    filtered_image, 
-                    f"Filtro Laplaciano ({kernel_type})"
+                self.apply_operation(
+                    operation,
+                    f"Filtro Laplaciano ({kernel_type})",
+                    "Não foi possível aplicar o filtro Laplaciano.",
+                    cached=True
                 )
-                
-                # Atualiza a imagem atual
-                self.current_image = filtered_image
-                
-                # Exibe a imagem processada
-                self.update_display_image()
         except Exception as e:
             QMessageBox.critical(
                 self,
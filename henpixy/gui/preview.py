@@ -0,0 +1,103 @@
+"""
+Serviço de pré-visualização: proxies reduzidos da imagem atual para os diálogos.
+"""
+
+import weakref
+from collections import OrderedDict
+
+from henpixy.core.image_handle import ImageHandle
+from henpixy.tools.image_utils import create_proxy_image
+
+# Tamanho máximo dos proxies, próximo da área de exibição dos diálogos
+PREVIEW_MAX_SIZE = (800, 600)
+
+# Quantidade máxima de proxies mantidos
+PREVIEW_CACHE_SIZE = 4
+
+class PreviewService:
+    """
+    Cria e guarda os proxies de pré-visualização das imagens
+    
+    O proxy de uma imagem é criado uma única vez (com Image.reduce) e
+    reaproveitado enquanto a mesma imagem (mesma identidade) for usada, de
+    modo que abrir vários diálogos ou alterar seus parâmetros não reduz a
+    imagem de novo. Os diálogos aplicam suas operações ao proxy durante a
+    edição dos parâmetros e à imagem original apenas ao confirmar.
+    """
+    
+    def __init__(self, max_size=PREVIEW_MAX_SIZE, max_entries=PREVIEW_CACHE_SIZE):
+        """
+        Inicializa o serviço
+        
+        Args:
+            max_size (tuple): Tamanho máximo (largura, altura) dos proxies
+            max_entries (int): Quantidade máxima de proxies mantidos
+        """
+        self.max_size = max_size
+        self.max_entries = max_entries
+        
+        # Proxies por identidade da imagem: id(imagem) -> (referência fraca, ImageHandle)
+        self._proxies = OrderedDict()
+    
+    def get_proxy(self, image):
+        """
+        Retorna o proxy de pré-visualização de uma imagem
+        
+        Args:
+            image (PIL.Image.Image): A imagem original
+        
+        Returns:
+            PIL.Image.Image: O proxy, no mesmo modo da imagem e com no máximo
+                             max_size; a própria imagem se ela já couber
+        """
+        key = id(image)
+        entry = self._proxies.get(key)
+        if entry is not None:
+            image_ref, handle = entry
+            if image_ref() is image:
+                self._proxies.move_to_end(key)
+                return handle.view()
+        
+        proxy = create_proxy_image(image, self.max_size)
+        if proxy is image:
+            return image
+        
+        handle = ImageHandle(proxy)
+        try:
+            image_ref = weakref.ref(image, lambda _ref, key=key: self._proxies.pop(key, None))
+        except TypeError:
+            return handle.view()
+        
+        self._proxies[key] = (image_ref, handle)
+        while len(self._proxies) > self.max_entries:
+            self._proxies.popitem(last=False)
+        
+        return handle.view()
+    
+    def clear(self):
+        """Remove todos os proxies."""
+        self._proxies.clear()
+
+# Serviço compartilhado pela janela principal e pelos diálogos
+_preview_service = PreviewService()
+
+def get_preview_image(image):
+    """
+    Retorna o proxy de pré-visualização de uma imagem usando o serviço compartilhado
+    
+    Args:
+        image (PIL.Image.Image): A imagem original
+    
+    Returns:
+        PIL.Image.Image: O proxy
+    """
+    return _preview_service.get_proxy(image)
+
+def get_preview_service():
+    """
+    Retorna o serviço de pré-visualização compartilhado
+    
+    Returns:
+        PreviewService: O serviço
+    """
+    return _preview_service
@@ -16,6 +16,9 @@ import numpy as np
 from PIL import Image
 import io
 
+from henpixy.gui.qt_image import pil_to_pixmap
+from henpixy.gui.preview import get_preview_image
+from henpixy.core.operations import Operation
 from henpixy.tools.pseudocolor import (
     intensity_slicing, create_predefined_maps, 
     create_color_gradient, apply_custom_transformation,
@@ -115,9 +118,17 @@ class PseudocolorDialog(QDialog):
         # Permitir que a janela seja redimensionável
         self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint | Qt.WindowMinimizeButtonHint)
         
-        # Armazena a imagem original
+        # Armazena a imagem original e seu proxy reduzido: as transformações são
+        # aplicadas apenas ao proxy; a imagem original é transformada pela janela
+        # principal, fora da thread da interface, ao aplicar
         self.original_image = image
-        self.result_image = None
+        self.preview_image = get_preview_image(image) if image is not None else None
+        self.preview_result = None
+        
+        # Função que aplica a transformação selecionada a uma imagem e a operação
+        # registrada correspondente (None para as transformações RGB personalizadas)
+        self.transformation = None
+        self.operation = None
         
         # Layout principal
         self.main_layout = QVBoxLayout(self)
@@ -532,14 +543,8 @@ class PseudocolorDialog(QDialog):
         map_info = self.predefined_maps.get(map_name)
         
         if map_info:
-            slices = map_info["slices"]
-            colors = map_info["colors"]
-            
             # Aplica o fatiamento por intensidades
-            self.result_image = intensity_slicing(self.original_image, slices, colors)
-            
-            # Atualiza a exibição
-            self.update_displays()
+            self.set_slicing(map_info["slices"], map_info["colors"])
     
     def apply_custom_intervals(self):
         """Aplica o fatiamento por intensidades com os intervalos personalizados"""
@@ -575,10 +580,7 @@ class PseudocolorDialog(QDialog):
         colors = colors[:len(slices) + 1]
         
         # Aplica o fatiamento por intensidades
-        self.result_image = intensity_slicing(self.original_image, slices, colors)
-        
-        # Atualiza a exibição
-        self.update_displays()
+        self.set_slicing(slices, colors)
     
     def apply_rgb_transformation(self):
         """Aplica a transformação RGB selecionada"""
@@ -594,20 +596,44 @@ class PseudocolorDialog(QDialog):
             blue_func = transform_info["blue"]
             
             # Aplica a transformação RGB
-            self.result_image = apply_custom_transformation(
-                self.original_image, red_func, green_func, blue_func
-            )
-            
-            # Atualiza a exibição
-            self.update_displays()
+            self.set_transformation(lambda image, progress=None, cancel_token=None: apply_custom_transformation(
+                image, red_func, green_func, blue_func,
+                progress=progress, cancel_token=cancel_token
+            ))
+    
+    def set_slicing(self, slices, colors):
+        """
+        Seleciona o fatiamento por intensidades, registrado como operação
+        
+        Args:
+            slices (list): Os limites das fatias
+            colors (list): As cores (R, G, B) de cada fatia
+        """
+        operation = Operation("intensity_slicing", slices=[int(value) for value in slices],
+                              colors=[[int(channel) for channel in color] for color in colors])
+        self.set_transformation(operation.apply, operation)
+    
+    def set_transformation(self, transformation, operation=None):
+        """
+        Define a transformação selecionada e atualiza a pré-visualização
+        
+        Args:
+            transformation (callable): Recebe uma imagem (e, opcionalmente, os argumentos
+                                       progress e cancel_token) e retorna a imagem com pseudocores
+            operation (Operation, optional): A operação registrada equivalente à transformação
+        """
+        self.transformation = transformation
+        self.operation = operation
+        self.preview_result = transformation(self.preview_image)
+        self.update_displays()
     
     def update_displays(self):
-        """Atualiza a exibição das imagens"""
+        """Atualiza a exibição das imagens (proxies reduzidos)"""
         if self.original_image is None:
             return
         
         # Exibe a imagem original
-        original_pixmap = self.pil_to_pixmap(self.original_image)
+        original_pixmap = pil_to_pixmap(self.preview_image)
         if original_pixmap:
             # Redimensiona para caber no label
             scaled_original = original_pixmap.scaled(
@@ -618,8 +644,8 @@ class PseudocolorDialog(QDialog):
             self.original_label.setPixmap(scaled_original)
         
         # Exibe a imagem com pseudocores (se disponível)
-        if self.result_image is not None:
-            pseudo_pixmap = self.pil_to_pixmap(self.result_image)
+        if self.preview_result is not None:
+            pseudo_pixmap = pil_to_pixmap(self.preview_result)
             if pseudo_pixmap:
                 # Redimensiona para caber no label
                 scaled_pseudo = pseudo_pixmap.scaled(
@@ -629,39 +655,6 @@ class PseudocolorDialog(QDialog):
                 )
                 self.pseudo_label.setPixmap(scaled_pseudo)
     
-    def pil_to_pixmap(self, pil_image):
-        """Converte uma imagem PIL para QPixmap"""
-        if pil_image.mode == "L":
-            # Imagem em escala de cinza
-            q_image = QImage(
-                pil_image.tobytes(), 
-                pil_image.width, 
-                pil_image.height, 
-                pil_image.width, 
-                QImage.Format_Grayscale8
-            )
-        elif pil_image.mode == "RGB":
-            # Imagem RGB
-            q_image = QImage(
-                pil_image.tobytes(), 
-                pil_image.width, 
-                pil_image.height, 
-                pil_image.width * 3, 
-                QImage.Format_RGB888
-            )
-        else:
-            # Converte para RGB para outros modos
-            pil_image = pil_image.convert("RGB")
-            q_image = QImage(
-                pil_image.tobytes(), 
-                pil_image.width, 
-                pil_image.height, 
-                pil_image.width * 3, 
-                QImage.Format_RGB888
-            )
-        
-        return QPixmap.fromImage(q_image)
-    
     def resizeEvent(self, event):
         """Redimensiona as imagens quando a janela é redimensionada"""
         super().resizeEvent(event)
@@ -670,5 +663,8 @@ class PseudocolorDialog(QDialog):
     def set_image(self, image):
         """Define a imagem a ser processada"""
         self.original_image = image
-        self.result_image = None
+        self.preview_image = get_preview_image(image) if image is not None else None
+        self.preview_result = None
+        self.transformation = None
+        self.operation = None
         self.update_displays() 
\ No newline at end of file
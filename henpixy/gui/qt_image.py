@@ -0,0 +1,127 @@
+"""
+Conversão de imagens PIL para QImage/QPixmap compartilhada por todos os visualizadores.
+"""
+
+import weakref
+from collections import OrderedDict
+
+from PySide6.QtGui import QImage, QPixmap, QPainter
+from PySide6.QtCore import Qt
+
+from henpixy.tools.image_utils import get_pixel_array, to_display_image
+
+# Formatos QImage que podem envolver diretamente o buffer de uma imagem PIL
+_QIMAGE_FORMATS = {
+    'L': (QImage.Format_Grayscale8, 1),
+    'RGB': (QImage.Format_RGB888, 3),
+    'RGBA': (QImage.Format_RGBA8888, 4),
+}
+
+# Quantidade máxima de QPixmaps mantidos no cache
+PIXMAP_CACHE_SIZE = 8
+
+# Cache de QPixmaps por identidade da imagem: id(imagem) -> (referência fraca, QPixmap)
+_pixmap_cache = OrderedDict()
+
+def prepare_for_display(image):
+    """
+    Converte a imagem para um dos modos exibidos diretamente pelo Qt (L, RGB ou RGBA)
+    
+    Imagens de alta profundidade de bits são reduzidas para 8 bits e os demais
+    modos são convertidos para RGB (ou RGBA, quando possuem canal alpha).
+    Imagens que já estão em um desses modos são retornadas sem cópia.
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+    
+    Returns:
+        PIL.Image.Image: A imagem pronta para exibição
+    """
+    image = to_display_image(image)
+    
+    if image.mode not in _QIMAGE_FORMATS:
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    
+    return image
+
+def pil_to_qimage(image):
+    """
+    Converte uma imagem PIL para QImage
+    
+    Quando a imagem (já nos modos L, RGB ou RGBA) tem um array de pixels
+    associado, como as criadas pelas ferramentas e as views do ImageHandle, o
+    QImage envolve diretamente esse array, sem cópia; a única cópia é o envio
+    para o QPixmap. As demais imagens passam antes por Image.tobytes, que copia
+    os pixels uma vez. Os outros modos são convertidos por prepare_for_display.
+    
+    Args:
+        image (PIL.Image.Image): A imagem a ser convertida
+    
+    Returns:
+        QImage: A imagem convertida
+    """
+    image = prepare_for_display(image)
+    
+    qimage_format, bytes_per_pixel = _QIMAGE_FORMATS[image.mode]
+    data = get_pixel_array(image)
+    if data is None or data.dtype != 'uint8' or not data.flags.c_contiguous:
+        data = image.tobytes()
+    
+    # O PySide6 mantém uma referência a 'data' (array somente leitura ou bytes),
+    # então o buffer continua válido durante toda a vida do QImage
+    return QImage(data, image.width, image.height, image.width * bytes_per_pixel, qimage_format)
+
+def pil_to_pixmap(image, cache=True):
+    """
+    Converte uma imagem PIL para QPixmap
+    
+    Imagens com canal alpha são compostas sobre um fundo branco durante o
+    desenho no QPixmap, sem criar uma imagem intermediária. Com o cache
+    habilitado, o QPixmap é reutilizado enquanto a mesma imagem (mesma
+    identidade) for exibida novamente, por exemplo ao redimensionar a janela.
+    As ferramentas sempre criam novas imagens em vez de alterar as existentes,
+    então a identidade é suficiente como chave.
+    
+    Args:
+        image (PIL.Image.Image): A imagem a ser convertida
+        cache (bool): Se True, usa e alimenta o cache de QPixmaps
+    
+    Returns:
+        QPixmap: A imagem convertida
+    """
+    key = id(image)
+    if cache and key in _pixmap_cache:
+        image_ref, pixmap = _pixmap_cache[key]
+        if image_ref() is image:
+            _pixmap_cache.move_to_end(key)
+            return pixmap
+        # O id foi reutilizado por outra imagem
+        del _pixmap_cache[key]
+    
+    qimage = pil_to_qimage(image)
+    
+    if qimage.hasAlphaChannel():
+        # Achata o canal alpha sobre um fundo branco
+        pixmap = QPixmap(qimage.size())
+        pixmap.fill(Qt.white)
+        painter = QPainter(pixmap)
+        painter.drawImage(0, 0, qimage)
+        painter.end()
+    else:
+        pixmap = QPixmap.fromImage(qimage)
+    
+    if cache:
+        try:
+            image_ref = weakref.ref(image, lambda _ref, key=key: _pixmap_cache.pop(key, None))
+        except TypeError:
+            # Objetos sem suporte a referências fracas não são armazenados
+            return pixmap
+        _pixmap_cache[key] = (image_ref, pixmap)
+        while len(_pixmap_cache) > PIXMAP_CACHE_SIZE:
+            _pixmap_cache.popitem(last=False)
+    
+    return pixmap
+
+def clear_pixmap_cache():
+    """Remove todos os QPixmaps do cache."""
+    _pixmap_cache.clear()
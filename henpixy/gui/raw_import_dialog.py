@@ -0,0 +1,125 @@
+"""
+Diálogo para informar o formato de arquivos de pixels brutos.
+"""
+
+import os
+
+import numpy as np
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QGroupBox, QPushButton, QSpinBox, QFormLayout,
+    QComboBox
+)
+from PySide6.QtCore import Qt
+
+from henpixy.core.loaders import RAW_DTYPES
+
+class RawImportDialog(QDialog):
+    """
+    Diálogo para informar o formato de um arquivo de pixels brutos (sem cabeçalho).
+    Permite ao usuário definir as dimensões, os canais, o tipo das amostras e
+    o deslocamento dos pixels no arquivo.
+    """
+    
+    def __init__(self, parent=None, file_path=None):
+        super().__init__(parent)
+        
+        self.setWindowTitle("Abrir Dados Brutos")
+        self.setMinimumWidth(350)
+        
+        # Tamanho do arquivo, usado para conferir o formato informado
+        self.file_size = os.path.getsize(file_path) if file_path else None
+        
+        # Layout principal
+        layout = QVBoxLayout(self)
+        
+        # Grupo para o formato dos pixels
+        format_group = QGroupBox("Formato dos Pixels")
+        format_layout = QFormLayout(format_group)
+        
+        self.width_spin = QSpinBox()
+        self.width_spin.setRange(1, 1000000)
+        self.width_spin.setValue(512)
+        format_layout.addRow("Largura:", self.width_spin)
+        
+        self.height_spin = QSpinBox()
+        self.height_spin.setRange(1, 1000000)
+        self.height_spin.setValue(512)
+        format_layout.addRow("Altura:", self.height_spin)
+        
+        self.channels_combo = QComboBox()
+        self.channels_combo.addItem("1 (escala de cinza)", 1)
+        self.channels_combo.addItem("3 (RGB)", 3)
+        self.channels_combo.addItem("4 (RGBA)", 4)
+        format_layout.addRow("Canais:", self.channels_combo)
+        
+        self.dtype_combo = QComboBox()
+        self.dtype_combo.addItems(list(RAW_DTYPES))
+        format_layout.addRow("Tipo das amostras:", self.dtype_combo)
+        
+        self.offset_spin = QSpinBox()
+        self.offset_spin.setRange(0, 2**31 - 1)
+        format_layout.addRow("Deslocamento (bytes):", self.offset_spin)
+        
+        layout.addWidget(format_group)
+        
+        # Tamanho esperado em relação ao tamanho do arquivo
+        self.size_label = QLabel()
+        self.size_label.setWordWrap(True)
+        self.size_label.setTextFormat(Qt.PlainText)
+        layout.addWidget(self.size_label)
+        
+        for spin in (self.width_spin, self.height_spin, self.offset_spin):
+            spin.valueChanged.connect(self.update_size_label)
+        self.channels_combo.currentIndexChanged.connect(self.update_size_label)
+        self.dtype_combo.currentIndexChanged.connect(self.update_size_label)
+        
+        # Botões de OK e Cancelar
+        button_layout = QHBoxLayout()
+        self.ok_button = QPushButton("OK")
+        cancel_button = QPushButton("Cancelar")
+        
+        self.ok_button.clicked.connect(self.accept)
+        cancel_button.clicked.connect(self.reject)
+        
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        self.update_size_label()
+    
+    def expected_size(self):
+        """
+        Calcula o tamanho em bytes exigido pelo formato informado.
+        
+        Returns:
+            int: O tamanho, incluindo o deslocamento
+        """
+        itemsize = np.dtype(RAW_DTYPES[self.dtype_combo.currentText()]).itemsize
+        return (self.offset_spin.value() + self.width_spin.value() * self.height_spin.value()
+                * self.channels_combo.currentData() * itemsize)
+    
+    def update_size_label(self):
+        """Exibe o tamanho exigido pelo formato e habilita o OK se o arquivo o comportar."""
+        expected = self.expected_size()
+        if self.file_size is None:
+            self.size_label.setText(f"Tamanho exigido: {expected} bytes")
+            return
+        
+        self.size_label.setText(f"Tamanho exigido: {expected} bytes (arquivo: {self.file_size} bytes)")
+        self.ok_button.setEnabled(expected <= self.file_size)
+    
+    def get_format(self):
+        """
+        Retorna o formato informado pelo usuário.
+        
+        Returns:
+            dict: Os argumentos de map_raw_array (width, height, channels, dtype, offset)
+        """
+        return {
+            "width": self.width_spin.value(),
+            "height": self.height_spin.value(),
+            "channels": self.channels_combo.currentData(),
+            "dtype": self.dtype_combo.currentText(),
+            "offset": self.offset_spin.value(),
+        }
@@ -7,38 +7,236 @@ import json
 import tempfile
 import shutil
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 from PIL import Image
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QListWidget, QListWidgetItem, 
                              QScrollArea, QWidget, QMessageBox)
-from PySide6.QtGui import QPixmap, QImage
 from PySide6.QtCore import Qt, QSize
 
+from henpixy.tools.image_utils import create_thumbnail_image
+from henpixy.gui.qt_image import pil_to_pixmap
+from henpixy.core.background_writer import BackgroundWriter
+from henpixy.core.journal import HistoryJournal
+from henpixy.core.session import HistorySession
+from henpixy.core.operations import Operation
+from henpixy.core.pipeline import Pipeline
+from henpixy.core.image_handle import ImageHandle
+from henpixy.core.snapshot import SNAPSHOT_EXTENSION, is_snapshot, read_snapshot, write_snapshot
+
+def load_history_image(filepath):
+    """
+    Lê a imagem de um arquivo de histórico
+    
+    Instantâneos (.hpxs) são mapeados em memória; arquivos PNG de versões
+    anteriores continuam sendo aceitos.
+    
+    Args:
+        filepath (str): Caminho do arquivo
+        
+    Returns:
+        PIL.Image.Image: A imagem
+    """
+    if is_snapshot(filepath):
+        return read_snapshot(filepath)
+    
+    image = Image.open(filepath)
+    image.load()
+    return image
+
 class HistoryItem:
-    """Representa um item no histórico de modificações"""
+    """
+    Representa um item no histórico de modificações
+    
+    Um item é um ponto de controle, cuja imagem é gravada em disco, ou um
+    passo de reaplicação, que guarda apenas a operação e seus parâmetros e
+    recalcula a imagem a partir do item anterior (parent) quando necessário.
+    
+    Uma miniatura é criada junto com o item e gravada ao lado do instantâneo,
+    para que o diálogo de histórico não precise ler as imagens completas.
+    """
     
-    def __init__(self, image, description, timestamp=None):
+    # Tamanho máximo das miniaturas
+    THUMBNAIL_SIZE = (100, 100)
+    
+    # Sufixo dos arquivos de miniatura
+    THUMBNAIL_SUFFIX = ".thumb.png"
+    
+    def __init__(self, image, description, timestamp=None, operation=None, parent=None):
         """
         Inicializa um item do histórico
         
         Args:
-            image (PIL.Image.Image): A imagem
+            image (PIL.Image.Image): A imagem, ou None se ainda não estiver carregada
             description (str): Descrição da modificação
             timestamp (float, optional): Timestamp da modificação. Se None, usa o tempo atual.
+            operation (Operation, optional): A operação que gerou a imagem
+            parent (HistoryItem, optional): O item ao qual a operação é reaplicada.
+                                            Se None, o item é um ponto de controle.
         """
-        self.image = image.copy()  # Cópia da imagem
+        self._handle = ImageHandle(image) if image is not None else None  # Pixels da imagem, sem cópia (None quando descarregada)
         self.description = description
         self.timestamp = timestamp if timestamp is not None else time.time()
         self.temp_path = None  # Caminho temporário para a imagem salva
+        self.saved = False  # Indica se a imagem já foi gravada em disco
+        self.save_failed = False  # Indica se a gravação da imagem em disco falhou
+        self.operation = operation
+        self.parent = parent
+        self.file_id = uuid.uuid4().hex[:8]  # Torna o nome do arquivo único
+        self.thumbnail_path = None  # Caminho da miniatura salva
+        self._thumbnail = create_thumbnail_image(image, self.THUMBNAIL_SIZE) if image is not None else None
+        self.nbytes = self._handle.nbytes if self._handle is not None else 0  # Memória ocupada pela imagem
+    
+    @property
+    def is_checkpoint(self):
+        """
+        Indica se a imagem do item é gravada em disco
+        
+        Returns:
+            bool: True para pontos de controle, False para passos de reaplicação
+        """
+        return self.parent is None
+    
+    @property
+    def image(self):
+        """
+        A imagem do item, carregada do disco ou recalculada se tiver sido descarregada
+        
+        A imagem retornada compartilha os pixels do item (ver ImageHandle) e pode
+        ser usada livremente: alterações no lugar não afetam o histórico.
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        if self._handle is None:
+            self._handle = ImageHandle(self.load_image())
+            self.nbytes = self._handle.nbytes
+        return self._handle.view()
+    
+    def is_loaded(self):
+        """
+        Verifica se a imagem está na memória
+        
+        Returns:
+            bool: True se a imagem está carregada
+        """
+        return self._handle is not None
+    
+    def load_image(self):
+        """
+        Lê a imagem do disco, ou a recalcula a partir do item anterior, sem mantê-la no item
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        if not self.is_checkpoint:
+            return self.operation.apply(self.parent.peek_image())
+        
+        return load_history_image(self.temp_path)
+    
+    def peek_image(self):
+        """
+        Retorna a imagem sem carregá-la permanentemente na memória
+        
+        Usada para leituras ocasionais (como miniaturas), que não devem
+        contar para o limite de memória do histórico.
+        
+        Returns:
+            PIL.Image.Image: A imagem
+        """
+        return self._handle.view() if self._handle is not None else self.load_image()
+    
+    def get_thumbnail(self):
+        """
+        Retorna a miniatura do item
+        
+        A miniatura é lida do arquivo gravado ou, na falta dele, criada a partir
+        da imagem.
+        
+        Returns:
+            PIL.Image.Image: A miniatura, ou None se a imagem não puder ser lida
+        """
+        if self._thumbnail is None:
+            try:
+                if self.thumbnail_path and os.path.exists(self.thumbnail_path):
+                    self._thumbnail = Image.open(self.thumbnail_path)
+                    self._thumbnail.load()
+                else:
+                    self._thumbnail = create_thumbnail_image(self.peek_image(), self.THUMBNAIL_SIZE)
+            except Exception as e:
+                print(f"Erro ao carregar miniatura do histórico: {e}")
+                return None
+        return self._thumbnail
+    
+    def save_thumbnail(self, history_dir):
+        """
+        Salva a miniatura em disco
+        
+        Args:
+            history_dir (str): Diretório para salvar a miniatura
+            
+        Returns:
+            str: Caminho para a miniatura salva
+        """
+        os.makedirs(history_dir, exist_ok=True)
+        
+        filepath = self.get_thumbnail_path(history_dir)
+        self.get_thumbnail().save(filepath)
+        self.thumbnail_path = filepath
         
-    def save_to_disk(self, history_dir):
+        return filepath
+    
+    def unload(self):
         """
-        Salva a imagem em disco
+        Descarrega a imagem da memória, se ela puder ser recuperada
+        
+        Pontos de controle só são descarregados depois de gravados em disco;
+        passos de reaplicação podem ser descarregados a qualquer momento.
+        
+        Returns:
+            bool: True se a imagem foi descarregada
+        """
+        if self._handle is None or (self.is_checkpoint and not self.saved):
+            return False
+        self._handle = None
+        return True
+    
+    def get_disk_path(self, history_dir):
+        """
+        Retorna o caminho em que a imagem é salva
         
         Args:
             history_dir (str): Diretório para salvar a imagem
             
+        Returns:
+            str: Caminho para a imagem
+        """
+        filename = f"history_{int(self.timestamp)}_{self.file_id}{SNAPSHOT_EXTENSION}"
+        return os.path.join(history_dir, filename)
+    
+    def get_thumbnail_path(self, history_dir):
+        """
+        Retorna o caminho em que a miniatura é salva
+        
+        Args:
+            history_dir (str): Diretório para salvar a miniatura
+            
+        Returns:
+            str: Caminho para a miniatura
+        """
+        filename = f"history_{int(self.timestamp)}_{self.file_id}{self.THUMBNAIL_SUFFIX}"
+        return os.path.join(history_dir, filename)
+        
+    def save_to_disk(self, history_dir, compress=False):
+        """
+        Salva a imagem em disco como instantâneo (pixels brutos)
+        
+        Args:
+            history_dir (str): Diretório para salvar a imagem
+            compress (bool): Se True, comprime os pixels com zlib no nível mais rápido
+            
         Returns:
             str: Caminho para a imagem salva
         """
@@ -46,12 +244,16 @@ class HistoryItem:
         os.makedirs(history_dir, exist_ok=True)
         
         # Gera nome de arquivo baseado no timestamp
-        filename = f"history_{int(self.timestamp)}_{self.description.replace(' ', '_')}.png"
-        filepath = os.path.join(history_dir, filename)
+        filepath = self.get_disk_path(history_dir)
         
         # Salva a imagem
-        self.image.save(filepath)
+        try:
+            write_snapshot(self.image, filepath, compress)
+        except Exception:
+            self.save_failed = True
+            raise
         self.temp_path = filepath
+        self.saved = True
         
         return filepath
     
@@ -65,55 +267,122 @@ class HistoryItem:
         return {
             "description": self.description,
             "timestamp": self.timestamp,
-            "filepath": self.temp_path
+            "filepath": self.temp_path,
+            "thumbnail": self.thumbnail_path,
+            "operation": self.operation.to_dict() if self.operation is not None else None,
+            "checkpoint": self.is_checkpoint
         }
     
     @classmethod
-    def from_dict(cls, data, history_dir):
+    def from_dict(cls, data, history_dir, parent=None):
         """
         Cria um item a partir de um dicionário
         
+        Apenas os metadados são lidos: a imagem e a miniatura são carregadas no
+        primeiro acesso.
+        
         Args:
             data (dict): Dicionário com os dados do item
             history_dir (str): Diretório dos arquivos de histórico
+            parent (HistoryItem, optional): O item anterior, usado pelos passos de reaplicação
             
         Returns:
             HistoryItem: O item criado
         """
-        filepath = data["filepath"]
+        operation = Operation.from_dict(data["operation"]) if data.get("operation") else None
         
-        # Verifica se o arquivo existe
-        if not os.path.exists(filepath):
-            # Tenta reconstruir o caminho
-            filename = os.path.basename(filepath)
-            filepath = os.path.join(history_dir, filename)
-            
-            if not os.path.exists(filepath):
+        # Passos de reaplicação não têm arquivo: a imagem é recalculada quando acessada
+        if not data.get("checkpoint", True):
+            if parent is None:
                 return None
-        
-        # Carrega a imagem
-        try:
-            image = Image.open(filepath)
-            item = cls(image, data["description"], data["timestamp"])
+            item = cls(None, data["description"], data["timestamp"], operation, parent)
+        else:
+            filepath = cls._locate_file(data["filepath"], history_dir)
+            if filepath is None:
+                return None
+            
+            # A imagem permanece em disco até ser acessada
+            item = cls(None, data["description"], data["timestamp"], operation)
             item.temp_path = filepath
-            return item
-        except Exception as e:
-            print(f"Erro ao carregar imagem do histórico: {e}")
-            return None
+            item.saved = True
+        
+        if data.get("thumbnail"):
+            item.thumbnail_path = cls._locate_file(data["thumbnail"], history_dir)
+        
+        return item
+    
+    @staticmethod
+    def _locate_file(filepath, history_dir):
+        """
+        Localiza um arquivo do histórico, inclusive se o diretório tiver mudado
+        
+        Args:
+            filepath (str): Caminho registrado do arquivo
+            history_dir (str): Diretório dos arquivos de histórico
+            
+        Returns:
+            str: O caminho do arquivo, ou None se ele não existir
+        """
+        if os.path.exists(filepath):
+            return filepath
+        
+        # Tenta reconstruir o caminho
+        filepath = os.path.join(history_dir, os.path.basename(filepath))
+        return filepath if os.path.exists(filepath) else None
 
 class HistoryManager:
-    """Gerencia o histórico de modificações de imagens"""
+    """
+    Gerencia o histórico de modificações de imagens
+    
+    As imagens usadas mais recentemente são mantidas na memória até o limite
+    memory_budget; as mais antigas são descarregadas (permanecem em disco) e
+    carregadas novamente quando acessadas.
+    
+    Passos gerados por operações baratas registradas (ver
+    henpixy.core.operations) guardam apenas a operação; a imagem é gravada em
+    disco somente nos pontos de controle, a cada CHECKPOINT_INTERVAL passos
+    ou quando a operação não pode ser reaplicada.
+    """
     
-    def __init__(self, app_name="henpixy"):
+    # Limite padrão de memória para as imagens do histórico (512 MB)
+    DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+    
+    # Quantidade máxima de passos entre dois pontos de controle
+    CHECKPOINT_INTERVAL = 8
+    
+    # Diário do histórico e arquivo completo usado por versões anteriores
+    JOURNAL_FILENAME = "history.journal"
+    LEGACY_HISTORY_FILENAME = "history.json"
+    
+    def __init__(self, app_name="henpixy", memory_budget=None, compress_snapshots=False):
         """
         Inicializa o gerenciador de histórico
         
         Args:
             app_name (str): Nome da aplicação para criar o diretório de histórico
-        """
-        # Diretório base para armazenar o histórico
-        self.history_dir = os.path.join(tempfile.gettempdir(), app_name, "history")
-        os.makedirs(self.history_dir, exist_ok=True)
+            memory_budget (int, optional): Limite de memória em bytes para as imagens
+                                           do histórico. Se None, usa DEFAULT_MEMORY_BUDGET.
+            compress_snapshots (bool): Se True, comprime os instantâneos com zlib
+                                       (arquivos menores, mas sem mapeamento em memória)
+        """
+        # Cada instância usa seu próprio diretório de sessão; o diretório
+        # "history" de versões anteriores é adotado como sessão, se existir
+        app_dir = os.path.join(tempfile.gettempdir(), app_name)
+        self.session = HistorySession.acquire(os.path.join(app_dir, "sessions"),
+                                              legacy_dir=os.path.join(app_dir, "history"))
+        self.history_dir = self.session.path
+        
+        # Grava imagens e o arquivo de histórico fora da thread da interface
+        self.writer = BackgroundWriter()
+        self.compress_snapshots = compress_snapshots
+        
+        # Cada alteração do histórico é acrescentada ao diário
+        self.journal = HistoryJournal(os.path.join(self.history_dir, self.JOURNAL_FILENAME))
+        self._journal_records = 0
+        
+        # Limite de memória e itens carregados, do menos para o mais recente
+        self.memory_budget = memory_budget if memory_budget is not None else self.DEFAULT_MEMORY_BUDGET
+        self._loaded_items = OrderedDict()
         
         # Lista de itens do histórico
         self.history_items = []
@@ -124,13 +393,15 @@ class HistoryManager:
         # Carrega o histórico do disco
         self.load_from_disk()
     
-    def add_item(self, image, description):
+    def add_item(self, image, description, operation=None):
         """
         Adiciona um item ao histórico
         
         Args:
             image (PIL.Image.Image): A imagem
             description (str): Descrição da modificação
+            operation (Operation, optional): A operação que gerou a imagem a partir
+                                             da imagem atual do histórico
             
         Returns:
             int: O índice do novo item
@@ -139,30 +410,97 @@ class HistoryManager:
         if self.current_index < len(self.history_items) - 1:
             # Remove os arquivos temporários dos itens que serão excluídos
             for item in self.history_items[self.current_index + 1:]:
-                if item.temp_path and os.path.exists(item.temp_path):
-                    try:
-                        os.remove(item.temp_path)
-                    except Exception as e:
-                        print(f"Erro ao remover arquivo: {e}")
+                self.remove_item_file(item)
+                self._loaded_items.pop(id(item), None)
             
             # Remove os itens do histórico
             self.history_items = self.history_items[:self.current_index + 1]
         
         # Cria o novo item
-        item = HistoryItem(image, description)
+        parent = self.get_replay_parent(operation)
+        item = HistoryItem(image, description, operation=operation, parent=parent)
         
-        # Salva a imagem em disco
-        item.save_to_disk(self.history_dir)
+        # Salva a imagem de pontos de controle em disco em segundo plano; o
+        # caminho é definido agora para que o arquivo de histórico já possa referenciá-lo
+        if item.is_checkpoint:
+            item.temp_path = item.get_disk_path(self.history_dir)
+            self.writer.submit(item.save_to_disk, self.history_dir, self.compress_snapshots)
+        
+        # A miniatura é gravada para todos os itens, inclusive passos de reaplicação
+        item.thumbnail_path = item.get_thumbnail_path(self.history_dir)
+        self.writer.submit(item.save_thumbnail, self.history_dir)
         
         # Adiciona o item ao histórico
         self.history_items.append(item)
         self.current_index = len(self.history_items) - 1
+        self.touch_item(item)
         
-        # Salva o histórico no disco
-        self.save_to_disk()
+        # Registra o item no diário (os itens posteriores a ele são descartados na leitura)
+        self.append_record({"type": "add", "position": self.current_index, "item": item.to_dict()}, item)
         
         return self.current_index
     
+    def get_replay_parent(self, operation):
+        """
+        Determina o item ao qual uma nova operação pode ser reaplicada
+        
+        Args:
+            operation (Operation): A operação do novo item, ou None
+            
+        Returns:
+            HistoryItem: O item atual, ou None se o novo item deve ser um ponto de controle
+        """
+        if operation is None or not operation.is_cheap or not self.history_items:
+            return None
+        
+        # Limita a quantidade de passos recalculados a partir de um ponto de controle
+        parent = self.history_items[-1]
+        steps = 1
+        ancestor = parent
+        while not ancestor.is_checkpoint:
+            ancestor = ancestor.parent
+            steps += 1
+        
+        return parent if steps < self.CHECKPOINT_INTERVAL else None
+    
+    def touch_item(self, item):
+        """
+        Marca um item como usado recentemente e aplica o limite de memória
+        
+        Args:
+            item (HistoryItem): O item acessado
+        """
+        self._loaded_items[id(item)] = item
+        self._loaded_items.move_to_end(id(item))
+        self.enforce_memory_budget()
+    
+    def memory_usage(self):
+        """
+        Retorna a memória ocupada pelas imagens carregadas
+        
+        Returns:
+            int: O total em bytes
+        """
+        return sum(item.nbytes for item in self._loaded_items.values() if item.is_loaded())
+    
+    def enforce_memory_budget(self):
+        """
+        Descarrega os itens usados há mais tempo até respeitar o limite de memória
+        
+        O item atual e os itens ainda não gravados em disco nunca são descarregados.
+        """
+        usage = self.memory_usage()
+        current_item = self.get_current_item()
+        
+        for key, item in list(self._loaded_items.items()):
+            if usage <= self.memory_budget:
+                break
+            if not item.is_loaded():
+                del self._loaded_items[key]
+            elif item is not current_item and item.unload():
+                usage -= item.nbytes
+                del self._loaded_items[key]
+    
     def get_current_item(self):
         """
         Retorna o item atual do histórico
@@ -183,7 +521,17 @@ class HistoryManager:
             PIL.Image.Image: A imagem atual ou None se o histórico estiver vazio
         """
         item = self.get_current_item()
-        return item.image.copy() if item else None
+        if item is None:
+            return None
+        
+        try:
+            image = item.image
+        except Exception as e:
+            print(f"Erro ao carregar imagem do histórico: {e}")
+            return None
+        
+        self.touch_item(item)
+        return image
     
     def go_to_item(self, index):
         """
@@ -199,56 +547,197 @@ class HistoryManager:
             return None
         
         self.current_index = index
-        self.save_to_disk()
+        self.append_record({"type": "index", "current_index": index})
         return self.get_current_image()
     
+    def get_pipeline(self):
+        """
+        Converte os passos do histórico, da imagem original até o item atual, em um pipeline
+        
+        O pipeline pode ser gravado (Pipeline.save) e aplicado a outras imagens
+        pelo henpixy-batch.
+        
+        Returns:
+            Pipeline: As operações dos passos, em ordem
+        
+        Raises:
+            ValueError: Se algum passo posterior à imagem original não tiver uma
+                        operação registrada (por exemplo, uma transformação RGB personalizada)
+        """
+        operations = []
+        for item in self.history_items[1:self.current_index + 1]:
+            if item.operation is None:
+                raise ValueError(f"O passo \"{item.description}\" não pode ser reproduzido em um pipeline")
+            operations.append(item.operation)
+        return Pipeline(operations)
+    
+    def append_record(self, record, item=None):
+        """
+        Acrescenta um registro ao diário do histórico em segundo plano
+        
+        O diário é compactado quando acumula HistoryJournal.COMPACT_THRESHOLD registros.
+        
+        Args:
+            record (dict): O registro (capturado imediatamente)
+            item (HistoryItem, optional): O item adicionado pelo registro; se a
+                                          gravação de sua imagem falhar, o
+                                          registro não é acrescentado
+        """
+        self.writer.submit(self._append_journal, record, item)
+        self._journal_records += 1
+        
+        if self._journal_records >= self.journal.COMPACT_THRESHOLD:
+            self.save_to_disk()
+    
     def save_to_disk(self):
         """
-        Salva o histórico no disco
+        Salva o estado completo do histórico no disco, compactando o diário
+        
+        O conteúdo é capturado imediatamente e gravado em segundo plano, depois
+        das imagens enfileiradas antes dele.
+        """
+        history_data = {
+            "current_index": self.current_index,
+            "items": [item.to_dict() for item in self.history_items]
+        }
+        self.writer.submit(self._compact_journal, history_data)
+        self._journal_records = 1
+    
+    def _append_journal(self, record, item=None):
         """
+        Acrescenta um registro ao diário (executado na thread de gravação)
+        
+        A imagem do item é gravada antes, pela mesma thread; um registro que
+        referencia uma imagem não gravada tornaria o histórico inválido após
+        uma falha.
+        
+        Args:
+            record (dict): O registro
+            item (HistoryItem, optional): O item adicionado pelo registro
+        """
+        if item is not None and item.save_failed:
+            print(f"Registro do histórico ignorado: a imagem de \"{item.description}\" não foi gravada")
+            return
+        
         try:
-            # Cria o diretório se não existir
-            os.makedirs(self.history_dir, exist_ok=True)
-            
-            # Salva o histórico como JSON
-            history_data = {
-                "current_index": self.current_index,
-                "items": [item.to_dict() for item in self.history_items]
-            }
+            self.journal.append(record)
+        except Exception as e:
+            print(f"Erro ao salvar histórico: {e}")
+    
+    def _compact_journal(self, history_data):
+        """
+        Substitui o diário pelo estado completo (executado na thread de gravação)
+        
+        Args:
+            history_data (dict): O estado do histórico
+        """
+        try:
+            self.journal.compact(history_data)
             
-            with open(os.path.join(self.history_dir, "history.json"), "w") as f:
-                json.dump(history_data, f)
+            # O arquivo completo de versões anteriores já foi incorporado ao diário
+            self._remove_file(os.path.join(self.history_dir, self.LEGACY_HISTORY_FILENAME))
         except Exception as e:
             print(f"Erro ao salvar histórico: {e}")
     
+    def _sync_journal(self):
+        """
+        Sincroniza o diário com o disco (executado na thread de gravação)
+        """
+        try:
+            self.journal.sync()
+        except Exception as e:
+            print(f"Erro ao salvar histórico: {e}")
+    
+    def remove_item_file(self, item):
+        """
+        Remove os arquivos (imagem e miniatura) de um item em segundo plano
+        
+        A remoção é enfileirada depois de uma eventual gravação pendente dos
+        mesmos arquivos.
+        
+        Args:
+            item (HistoryItem): O item
+        """
+        for filepath in (item.temp_path, item.thumbnail_path):
+            if filepath:
+                self.writer.submit(self._remove_file, filepath)
+    
+    @staticmethod
+    def _remove_file(filepath):
+        """
+        Remove um arquivo, se existir (executado na thread de gravação)
+        
+        Args:
+            filepath (str): Caminho do arquivo
+        """
+        if os.path.exists(filepath):
+            try:
+                os.remove(filepath)
+            except Exception as e:
+                print(f"Erro ao remover arquivo: {e}")
+    
+    def flush(self):
+        """
+        Aguarda a gravação de todas as alterações pendentes do histórico
+        
+        Ao retornar, o diário também está sincronizado com o disco.
+        """
+        self.writer.submit(self._sync_journal)
+        self.writer.flush()
+    
+    def close(self):
+        """
+        Conclui as gravações pendentes e libera a sessão do histórico
+        
+        O diretório da sessão é mantido e será reaproveitado pela próxima
+        instância iniciada.
+        """
+        self.flush()
+        self.journal.close()
+        self.session.release()
+    
     def load_from_disk(self):
         """
         Carrega o histórico do disco
         """
         try:
-            # Verifica se o arquivo de histórico existe
-            history_file = os.path.join(self.history_dir, "history.json")
-            if not os.path.exists(history_file):
+            # Reconstrói o histórico a partir do diário; sem diário, aceita o
+            # arquivo completo de versões anteriores
+            legacy_file = os.path.join(self.history_dir, self.LEGACY_HISTORY_FILENAME)
+            if os.path.exists(self.journal.path):
+                history_data = self.journal.read_state()
+                self._journal_records = self.journal.record_count
+            elif os.path.exists(legacy_file):
+                with open(legacy_file, "r") as f:
+                    history_data = json.load(f)
+                self._journal_records = self.journal.COMPACT_THRESHOLD
+            else:
                 return
             
-            # Carrega o histórico
-            with open(history_file, "r") as f:
-                history_data = json.load(f)
-            
-            # Carrega os itens
+            # Carrega os itens; passos de reaplicação dependem do item anterior
             self.history_items = []
+            previous = None
             for item_data in history_data["items"]:
-                item = HistoryItem.from_dict(item_data, self.history_dir)
+                item = HistoryItem.from_dict(item_data, self.history_dir, previous)
                 if item:
                     self.history_items.append(item)
+                previous = item
             
             # Carrega o índice atual
             self.current_index = history_data["current_index"]
             if self.current_index >= len(self.history_items):
                 self.current_index = len(self.history_items) - 1
+            
+            # Compacta diários longos, migra o arquivo de versões anteriores e
+            # regrava o estado se itens sem arquivo foram descartados, para que
+            # as posições dos próximos registros correspondam à lista carregada
+            if (self._journal_records >= self.journal.COMPACT_THRESHOLD
+                    or len(self.history_items) != len(history_data["items"])):
+                self.save_to_disk()
         except Exception as e:
             print(f"Erro ao carregar histórico: {e}")
             self.history_items = []
+            self._loaded_items.clear()
             self.current_index = -1
     
     def clear(self):
@@ -257,17 +746,14 @@ class HistoryManager:
         """
         # Remove os arquivos temporários
         for item in self.history_items:
-            if item.temp_path and os.path.exists(item.temp_path):
-                try:
-                    os.remove(item.temp_path)
-                except Exception as e:
-                    print(f"Erro ao remover arquivo: {e}")
+            self.remove_item_file(item)
         
         # Limpa a lista de itens
         self.history_items = []
+        self._loaded_items.clear()
         self.current_index = -1
         
-        # Salva o histórico no disco
+        # O diário é reiniciado com o histórico vazio
         self.save_to_disk()
 
 class HistoryDialog(QDialog):
@@ -332,9 +818,10 @@ class HistoryDialog(QDialog):
             # Cria o widget do item
             list_item = QListWidgetItem()
             
-            # Cria a miniatura
-            thumbnail = self.create_thumbnail(item.image)
-            list_item.setIcon(thumbnail)
+            # Usa a miniatura gravada junto com o item
+            thumbnail = item.get_thumbnail()
+            if thumbnail is not None:
+                list_item.setIcon(self.create_thumbnail(thumbnail))
             
             # Formata o timestamp
             timestamp = datetime.fromtimestamp(item.timestamp).strftime("%d/%m/%Y %H:%M:%S")
@@ -352,34 +839,18 @@ class HistoryDialog(QDialog):
         if self.history_manager.current_index >= 0:
             self.history_list.setCurrentRow(self.history_manager.current_index)
     
-    def create_thumbnail(self, image):
+    def create_thumbnail(self, thumbnail_img):
         """
-        Cria uma miniatura da imagem
+        Converte a miniatura de um item para exibição na lista
         
         Args:
-            image (PIL.Image.Image): A imagem
+            thumbnail_img (PIL.Image.Image): A miniatura (ver HistoryItem.get_thumbnail)
             
         Returns:
             QPixmap: A miniatura
         """
-        # Redimensiona a imagem para caber na miniatura
-        thumbnail_size = (self.thumbnail_size.width(), self.thumbnail_size.height())
-        thumbnail_img = image.copy()
-        thumbnail_img.thumbnail(thumbnail_size, Image.LANCZOS)
-        
-        # Converte para QPixmap
-        if thumbnail_img.mode == "RGB":
-            format = QImage.Format_RGB888
-        elif thumbnail_img.mode == "RGBA":
-            format = QImage.Format_RGBA8888
-        else:
-            thumbnail_img = thumbnail_img.convert("RGB")
-            format = QImage.Format_RGB888
-        
-        img_data = thumbnail_img.tobytes("raw", thumbnail_img.mode)
-        q_image = QImage(img_data, thumbnail_img.width, thumbnail_img.height, format)
-        
-        return QPixmap.fromImage(q_image)
+        # Miniaturas são temporárias e não vão para o cache
+        return pil_to_pixmap(thumbnail_img, cache=False)
     
     def on_item_selected(self, row):
         """
@@ -133,6 +133,18 @@ class ImageInfoDialog(QDialog):
             info_list.append(("Espaço de cores:", "Escala de cinza"))
             info_list.append(("Canais:", "1"))
             info_list.append(("Profundidade de bits:", "8 bits"))
+        elif pil_image.mode.startswith('I;16'):
+            info_list.append(("Espaço de cores:", "Escala de cinza"))
+            info_list.append(("Canais:", "1"))
+            info_list.append(("Profundidade de bits:", "16 bits"))
+        elif pil_image.mode == 'I':
+            info_list.append(("Espaço de cores:", "Escala de cinza"))
+            info_list.append(("Canais:", "1"))
+            info_list.append(("Profundidade de bits:", "32 bits (inteiro)"))
+        elif pil_image.mode == 'F':
+            info_list.append(("Espaço de cores:", "Escala de cinza"))
+            info_list.append(("Canais:", "1"))
+            info_list.append(("Profundidade de bits:", "32 bits (ponto flutuante)"))
         elif pil_image.mode == 'CMYK':
             info_list.append(("Espaço de cores:", "CMYK (Ciano, Magenta, Amarelo, Preto)"))
             info_list.append(("Canais:", "4 (C, M, Y, K)"))
@@ -6,11 +6,24 @@ import numpy as np
 from PIL import Image
 import math
 import logging
+import weakref
+
+from henpixy.tools.image_utils import get_integer_intensity_array
+
+# Cache das intensidades da última imagem decomposta em planos de bits. A chave
+# é uma referência fraca para a imagem, de modo que o cache não mantém a imagem
+# viva e é invalidado automaticamente quando outra imagem é decomposta. Apenas
+# as intensidades são guardadas (do tamanho da imagem); os planos são obtidos
+# delas por máscaras de bits quando necessários.
+_intensity_cache = {"ref": None, "array": None, "bit_depth": None}
 
 def get_image_bit_depth(image):
     """
     Determina a profundidade de bits (quantidade de planos) e intensidade máxima da imagem
     
+    Imagens de alta profundidade de bits (modos I;16, I e F) são analisadas em
+    sua precisão nativa, resultando em até 16 planos.
+    
     Args:
         image (PIL.Image.Image): A imagem de entrada
     
@@ -18,14 +31,9 @@ def get_image_bit_depth(image):
         tuple: (profundidade de bits, intensidade máxima)
     """
     try:
-        # Converte para escala de cinza se necessário
-        if image.mode != 'L':
-            gray_image = image.convert('L')
-        else:
-            gray_image = image.copy()
-        
-        # Converte para array numpy
-        image_array = np.array(gray_image)
+        # Obtém as intensidades em escala de cinza na precisão nativa
+        # (imagens de 16 bits, modos I;16 e I, não são reduzidas para 8 bits)
+        image_array = get_integer_intensity_array(image)
         
         # Encontra o valor máximo de intensidade na imagem
         max_intensity = int(np.max(image_array))
@@ -82,17 +90,11 @@ def extract_bit_plane(image, plane):
         # Se a intensidade máxima é zero ou muito baixa, retornar uma imagem preta
         if max_intensity <= 1:
             print(f"Aviso: Imagem com intensidade máxima muito baixa ({max_intensity})")
-            # Retorna uma cópia da imagem (que já é preta)
-            return image.copy() if image.mode == 'L' else image.convert('L')
-        
-        # Converte para escala de cinza se necessário
-        if image.mode != 'L':
-            gray_image = image.convert('L')
-        else:
-            gray_image = image.copy()
+            # Retorna uma imagem preta do mesmo tamanho
+            return Image.new('L', image.size, 0)
         
-        # Converte para array numpy
-        image_array = np.array(gray_image)
+        # Obtém as intensidades em escala de cinza na precisão nativa
+        image_array = get_integer_intensity_array(image)
         
         # Extrai o plano de bits específico
         # Usamos a operação AND bit a bit com a máscara (2^plane)
@@ -134,4 +136,172 @@ def get_bit_plane_contribution(plane):
     Returns:
         int: O valor máximo de contribuição deste plano (2^plane)
     """
-    return 2 ** plane 
\ No newline at end of file
+    return 2 ** plane 
+
+def _get_cached_intensities(image):
+    """
+    Obtém as intensidades inteiras e a profundidade de bits da imagem, com cache
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        tuple: (array somente leitura com as intensidades, profundidade de bits)
+    """
+    cached_ref = _intensity_cache["ref"]
+    if cached_ref is not None and cached_ref() is image:
+        return _intensity_cache["array"], _intensity_cache["bit_depth"]
+    
+    # Obtém as intensidades em escala de cinza na precisão nativa
+    image_array = get_integer_intensity_array(image)
+    if image_array.flags.writeable:
+        image_array.setflags(write=False)
+    
+    bit_depth, _ = get_image_bit_depth(image)
+    
+    _intensity_cache["ref"] = weakref.ref(image)
+    _intensity_cache["array"] = image_array
+    _intensity_cache["bit_depth"] = bit_depth
+    
+    return image_array, bit_depth
+
+def decompose_bit_planes(image):
+    """
+    Decompõe a imagem em todos os seus planos de bits
+    
+    A decomposição é calculada de forma vetorizada a partir das intensidades
+    da imagem, que ficam em cache para a última imagem processada (os planos
+    em si não são guardados: ocupariam um byte por pixel em cada plano).
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        numpy.ndarray: Array de formato (profundidade de bits, altura, largura)
+                      com valores 0 ou 1, onde o índice 0 é o bit menos significativo (LSB)
+    """
+    image_array, bit_depth = _get_cached_intensities(image)
+    
+    # Desloca cada pixel para a direita e isola o bit de cada plano de uma só vez
+    shifts = np.arange(bit_depth, dtype=image_array.dtype).reshape(-1, 1, 1)
+    return ((image_array[np.newaxis] >> shifts) & 1).astype(np.uint8)
+
+def _validate_planes(planes, bit_depth):
+    """
+    Normaliza a lista de planos selecionados
+    
+    Args:
+        planes (iterable): Os planos de bits selecionados
+        bit_depth (int): A profundidade de bits da imagem
+    
+    Returns:
+        list: Os planos ordenados, sem repetições
+    """
+    selected = sorted(set(int(plane) for plane in planes))
+    for plane in selected:
+        if not 0 <= plane < bit_depth:
+            raise ValueError(f"Plano {plane} fora do intervalo válido [0, {bit_depth - 1}]")
+    return selected
+
+def _reconstruct_array(image_array, selected, dtype):
+    """
+    Mantém apenas os bits dos planos selecionados (soma de suas contribuições 2^plano)
+    
+    Args:
+        image_array (numpy.ndarray): As intensidades inteiras da imagem
+        selected (list): Os planos a serem mantidos
+        dtype (numpy.dtype): O tipo de dados do resultado
+    
+    Returns:
+        numpy.ndarray: O array reconstruído
+    """
+    mask = sum(1 << plane for plane in selected)
+    return (image_array & image_array.dtype.type(mask)).astype(dtype, copy=False)
+
+def reconstruct_from_bit_planes(image, planes):
+    """
+    Reconstrói uma imagem usando apenas um subconjunto de seus planos de bits
+    
+    Cada plano mantido contribui com o seu peso (2^plano) para a intensidade
+    do pixel, enquanto os planos descartados são considerados zero. Por exemplo,
+    manter os planos [4, 5, 6, 7] de uma imagem de 8 bits equivale a quantizá-la
+    em 16 níveis de intensidade.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+        planes (iterable): Os planos de bits a serem mantidos (0 é o LSB)
+    
+    Returns:
+        PIL.Image.Image: A imagem reconstruída em escala de cinza (modo L, ou I;16 para
+                        imagens com mais de 8 planos)
+    """
+    image_array, bit_depth = _get_cached_intensities(image)
+    selected = _validate_planes(planes, bit_depth)
+    
+    if bit_depth <= 8:
+        return Image.fromarray(_reconstruct_array(image_array, selected, np.uint8), mode='L')
+    
+    # Imagens com mais de 8 planos são reconstruídas em 16 bits (modo I;16)
+    return Image.fromarray(_reconstruct_array(image_array, selected, np.uint16))
+
+def evaluate_bit_plane_reconstruction(image, planes):
+    """
+    Mede o erro e a economia de armazenamento de uma reconstrução por planos de bits
+    
+    O erro de cada pixel é exatamente o valor formado pelos planos descartados,
+    então o erro quadrático médio é calculado a partir do histograma desses
+    valores, sem criar arrays de ponto flutuante do tamanho da imagem.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+        planes (iterable): Os planos de bits a serem mantidos (0 é o LSB)
+    
+    Returns:
+        dict: Dicionário com as métricas da reconstrução:
+            - planes: planos mantidos
+            - bit_depth: profundidade de bits da imagem
+            - mse: erro quadrático médio
+            - psnr: relação sinal-ruído de pico em dB (inf se não houver erro)
+            - max_error: maior erro absoluto
+            - original_bytes: bytes necessários para todos os planos
+            - compressed_bytes: bytes necessários para os planos mantidos (1 bit por pixel cada)
+            - compression_ratio: razão entre os tamanhos original e comprimido
+            - savings: fração do armazenamento economizada (0 a 1)
+    """
+    image_array, bit_depth = _get_cached_intensities(image)
+    height, width = image_array.shape
+    selected = _validate_planes(planes, bit_depth)
+    discarded = [plane for plane in range(bit_depth) if plane not in selected]
+    
+    # O erro é o valor formado pelos planos descartados
+    error_dtype = np.uint8 if bit_depth <= 8 else np.uint16
+    error = _reconstruct_array(image_array, discarded, error_dtype)
+    counts = np.bincount(error.ravel())
+    values = np.arange(len(counts), dtype=np.float64)
+    
+    num_pixels = height * width
+    mse = float(np.sum(counts * values ** 2) / num_pixels) if num_pixels else 0.0
+    max_error = int(len(counts) - 1) if num_pixels else 0
+    
+    # A PSNR usa o maior valor representável com a profundidade de bits da imagem
+    peak = float((1 << bit_depth) - 1)
+    psnr = float('inf') if mse == 0 else 10 * math.log10(peak ** 2 / mse)
+    
+    # Cada plano ocupa 1 bit por pixel quando empacotado
+    plane_bytes = math.ceil(num_pixels / 8)
+    original_bytes = plane_bytes * bit_depth
+    compressed_bytes = plane_bytes * len(selected)
+    compression_ratio = float('inf') if compressed_bytes == 0 else original_bytes / compressed_bytes
+    savings = 1 - len(selected) / bit_depth
+    
+    return {
+        "planes": selected,
+        "bit_depth": bit_depth,
+        "mse": mse,
+        "psnr": psnr,
+        "max_error": max_error,
+        "original_bytes": original_bytes,
+        "compressed_bytes": compressed_bytes,
+        "compression_ratio": compression_ratio,
+        "savings": savings,
+    }
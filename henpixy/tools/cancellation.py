@@ -0,0 +1,57 @@
+"""
+Cancelamento e acompanhamento do progresso das ferramentas de processamento
+"""
+
+import threading
+
+class OperationCancelled(Exception):
+    """Exceção lançada por uma ferramenta quando sua execução é cancelada"""
+
+class CancellationToken:
+    """
+    Sinalizador de cancelamento compartilhado entre quem inicia e quem executa uma ferramenta
+    
+    A ferramenta verifica o sinalizador entre blocos de trabalho (faixas de
+    linhas, canais) e interrompe a execução lançando OperationCancelled.
+    """
+    
+    def __init__(self):
+        """Inicializa o sinalizador, não cancelado."""
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """Solicita o cancelamento."""
+        self._event.set()
+    
+    @property
+    def is_cancelled(self):
+        """bool: True se o cancelamento foi solicitado."""
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self):
+        """
+        Interrompe a execução se o cancelamento foi solicitado
+        
+        Raises:
+            OperationCancelled: Se o cancelamento foi solicitado
+        """
+        if self._event.is_set():
+            raise OperationCancelled("Operação cancelada")
+
+def check_progress(progress, cancel_token, done, total):
+    """
+    Informa o progresso de uma ferramenta e verifica o cancelamento
+    
+    Args:
+        progress (callable): Recebe a fração concluída (0.0 a 1.0), ou None
+        cancel_token (CancellationToken): O sinalizador de cancelamento, ou None
+        done (int): Unidades de trabalho concluídas
+        total (int): Total de unidades de trabalho
+    
+    Raises:
+        OperationCancelled: Se o cancelamento foi solicitado
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    if progress is not None and total > 0:
+        progress(min(done / total, 1.0))
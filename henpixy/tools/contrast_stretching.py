@@ -5,6 +5,8 @@ Módulo com funções para aplicar alargamento de contraste em imagens
 import numpy as np
 from PIL import Image
 
+from henpixy.tools.image_utils import get_native_array, get_max_value, array_to_image
+
 def contrast_stretching(image, r1, s1, r2, s2):
     """
     Aplica o alargamento de contraste em uma imagem
@@ -35,31 +37,15 @@ def contrast_stretching(image, r1, s1, r2, s2):
     if not (0 <= s1 <= s2 <= 255):
         raise ValueError("Deve ser 0 <= s1 <= s2 <= 255")
     
-    # Cria uma cópia da imagem para não modificar a original
-    result_image = image.copy()
-    
-    # Converte a imagem para array numpy para processamento mais eficiente
-    image_array = np.array(result_image, dtype=np.float32)
+    # Converte a imagem para array numpy preservando a profundidade de bits
+    image_array = get_native_array(image)
     
     # Determina as características da imagem
-    if len(image_array.shape) == 2:
-        # Imagem em escala de cinza
-        is_grayscale = True
-        depth = 1
-    else:
-        # Imagem colorida (RGB ou RGBA)
-        is_grayscale = False
-        depth = image_array.shape[2]
+    is_grayscale = image_array.ndim == 2
+    depth = 1 if is_grayscale else image_array.shape[2]
     
     # Determina o valor máximo baseado no tipo de dados da imagem original
-    original_array = np.array(image)
-    dtype = original_array.dtype
-    if dtype == np.uint8:
-        max_value = 255.0
-    elif dtype == np.uint16:
-        max_value = 65535.0
-    else:
-        max_value = 255.0  # Padrão para outros tipos
+    max_value = float(get_max_value(image_array))
     
     # Normaliza os valores r1, s1, r2, s2 para o intervalo da imagem
     if max_value != 255.0:
@@ -92,50 +78,32 @@ def contrast_stretching(image, r1, s1, r2, s2):
     b2 = s1_norm - a2 * r1_norm
     b3 = s2_norm - a3 * r2_norm
     
-    # Define a função de transformação
-    def transform(pixel):
-        if pixel <= r1_norm:
-            return a1 * pixel
-        elif pixel <= r2_norm:
-            return a2 * pixel + b2
-        else:
-            return a3 * pixel + b3
-    
-    # Vetoriza a função de transformação para melhor desempenho
-    transform_vec = np.vectorize(transform)
-    
-    # Aplica a transformação
-    if is_grayscale:
-        # Processamento para imagem em escala de cinza
-        transformed_array = transform_vec(image_array)
+    # Define a função de transformação, vetorizada sobre um array de intensidades
+    def transform(values):
+        values = values.astype(np.float32)
+        transformed = np.where(
+            values <= r1_norm,
+            a1 * values,
+            np.where(values <= r2_norm, a2 * values + b2, a3 * values + b3)
+        )
+        # Garante que os valores estejam no intervalo correto
+        return np.clip(transformed, 0, max_value)
+    
+    if image_array.dtype.kind == 'f':
+        # Imagens de ponto flutuante (modo F) são transformadas diretamente
+        color_channels = transform(image_array)
     else:
-        # Processamento para imagem colorida (RGB ou RGBA)
-        transformed_array = image_array.copy()
-        
-        # Aplica a transformação em cada canal RGB
-        for i in range(min(3, depth)):  # Primeiros 3 canais (RGB)
-            channel = image_array[:, :, i]
-            transformed_array[:, :, i] = transform_vec(channel)
-        
-        # Preserva o canal alpha (se existir)
-        if depth > 3:
-            transformed_array[:, :, 3:] = image_array[:, :, 3:]
-    
-    # Garante que os valores estejam no intervalo correto
-    transformed_array = np.clip(transformed_array, 0, max_value)
+        # Para inteiros, a transformação é calculada uma única vez para cada nível
+        # (tabela de 256 entradas para 8 bits, 65536 entradas para 16 bits)
+        lut = transform(np.arange(int(max_value) + 1)).astype(image_array.dtype)
+        color_channels = lut[image_array if depth <= 3 else image_array[:, :, :3]]
     
-    # Converte de volta para o tipo de dados original
-    if dtype == np.uint8:
-        transformed_array = transformed_array.astype(np.uint8)
-    elif dtype == np.uint16:
-        transformed_array = transformed_array.astype(np.uint16)
-    else:
-        transformed_array = transformed_array.astype(np.uint8)
-    
-    # Converte de volta para uma imagem PIL
-    if is_grayscale:
-        result_image = Image.fromarray(transformed_array)
+    # Preserva o canal alpha (se existir)
+    if depth > 3:
+        transformed_array = image_array.copy()
+        transformed_array[:, :, :3] = color_channels[:, :, :3]
     else:
-        result_image = Image.fromarray(transformed_array, mode=image.mode)
+        transformed_array = color_channels
     
-    return result_image 
\ No newline at end of file
+    # Converte de volta para uma imagem PIL no modo original
+    return array_to_image(transformed_array, image.mode)
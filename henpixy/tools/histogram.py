@@ -8,40 +8,44 @@ import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
-def calculate_histogram(image, bins=256):
+from henpixy.tools.image_utils import get_integer_intensity_array, get_max_value
+
+def calculate_histogram(image, bins=None):
     """
     Calcula o histograma de uma imagem em escala de cinza
     
     Args:
         image (PIL.Image.Image): A imagem de entrada
-        bins (int): Número de bins do histograma (padrão: 256 para 8 bits)
+        bins (int, optional): Número de bins do histograma. Se None, usa a quantidade
+                              de níveis da imagem (256 para 8 bits, 65536 para 16 bits)
     
     Returns:
         tuple: (histograma, histograma normalizado)
     """
-    # Converte para escala de cinza se necessário
-    if image.mode != 'L':
-        gray_image = image.convert('L')
-    else:
-        gray_image = image.copy()
+    # Obtém as intensidades em escala de cinza na precisão nativa
+    image_array = get_integer_intensity_array(image)
     
-    # Converte para array numpy
-    image_array = np.array(gray_image)
+    if bins is None:
+        bins = get_max_value(image_array) + 1
     
-    # Calcula o histograma
-    histogram = np.zeros(bins, dtype=np.int32)
+    return _histogram_from_array(image_array, bins)
+
+def _histogram_from_array(image_array, bins):
+    """
+    Calcula o histograma e o histograma normalizado de um array de intensidades
     
-    # Altura e largura da imagem
-    height, width = image_array.shape
+    Args:
+        image_array (numpy.ndarray): Array de intensidades inteiras
+        bins (int): Número de bins do histograma
     
-    # Contador de pixels para cada intensidade
-    for i in range(height):
-        for j in range(width):
-            intensity = image_array[i, j]
-            histogram[intensity] += 1
+    Returns:
+        tuple: (histograma, histograma normalizado)
+    """
+    # Conta os pixels de cada intensidade de uma só vez
+    histogram = np.bincount(image_array.ravel(), minlength=bins)[:bins].astype(np.int64)
     
     # Histograma normalizado (probabilidades)
-    normalized_histogram = histogram / (height * width)
+    normalized_histogram = histogram / image_array.size
     
     return histogram, normalized_histogram
 
@@ -57,6 +61,21 @@ def calculate_cumulative_distribution(normalized_histogram):
     """
     return np.cumsum(normalized_histogram)
 
+def calculate_equalization_map(normalized_histogram, dtype):
+    """
+    Calcula a tabela de busca da equalização a partir de um histograma normalizado
+    
+    Args:
+        normalized_histogram (numpy.ndarray): Histograma normalizado com L níveis
+        dtype (numpy.dtype): Tipo das intensidades (uint8 ou uint16)
+    
+    Returns:
+        numpy.ndarray: A tabela sk = T(rk) = (L-1) * cdf(rk), com L entradas
+    """
+    L = len(normalized_histogram)
+    cdf = calculate_cumulative_distribution(normalized_histogram)
+    return np.round((L - 1) * cdf).astype(dtype)
+
 def equalize_histogram(image):
     """
     Realiza a equalização do histograma de uma imagem
@@ -67,43 +86,34 @@ def equalize_histogram(image):
     Returns:
         tuple: (imagem equalizada, histograma original, histograma equalizado)
     """
-    # Converte para escala de cinza se necessário
-    if image.mode != 'L':
-        gray_image = image.convert('L')
-    else:
-        gray_image = image.copy()
-    
-    # Converte para array numpy
-    image_array = np.array(gray_image)
+    # Obtém as intensidades em escala de cinza na precisão nativa
+    image_array = get_integer_intensity_array(image)
     
-    # Altura e largura da imagem
-    height, width = image_array.shape
+    # Número de níveis de intensidade (256 para 8 bits, 65536 para 16 bits)
+    L = get_max_value(image_array) + 1
     
     # Calcula o histograma original e normalizado
-    original_histogram, original_normalized = calculate_histogram(gray_image)
-    
-    # Calcula a CDF
-    cdf = calculate_cumulative_distribution(original_normalized)
+    original_histogram, original_normalized = _histogram_from_array(image_array, L)
     
-    # Número de níveis de intensidade
-    L = 256  # Para imagens de 8 bits
-    
-    # Mapeamento de equalização (transformação)
+    # Mapeamento de equalização (transformação) a partir da CDF
     # sk = T(rk) = (L-1) * cdf(rk)
-    equalization_map = np.round((L - 1) * cdf).astype(np.uint8)
+    equalization_map = calculate_equalization_map(original_normalized, image_array.dtype)
     
-    # Aplicar a transformação em cada pixel
-    equalized_array = np.zeros_like(image_array)
-    for i in range(height):
-        for j in range(width):
-            intensity = image_array[i, j]
-            equalized_array[i, j] = equalization_map[intensity]
+    # Aplica a transformação em todos os pixels pela tabela de busca
+    equalized_array = equalization_map[image_array]
     
-    # Criar a imagem equalizada
+    # Criar a imagem equalizada (modo L para 8 bits, I;16 para 16 bits); imagens
+    # no modo I continuam no modo I
     equalized_image = Image.fromarray(equalized_array)
+    if image.mode == 'I':
+        equalized_image = equalized_image.convert('I')
     
-    # Calcular o histograma equalizado
-    equalized_histogram, equalized_normalized = calculate_histogram(equalized_image)
+    # Calcular o histograma equalizado, redistribuindo as contagens do original
+    # pelo mapeamento em vez de percorrer os pixels novamente
+    equalized_histogram = np.bincount(
+        equalization_map, weights=original_histogram, minlength=L
+    ).astype(np.int64)
+    equalized_normalized = equalized_histogram / image_array.size
     
     return equalized_image, original_histogram, equalized_histogram, original_normalized, equalized_normalized
 
@@ -131,7 +141,11 @@ def create_histogram_figure(hist, normalized_hist, title="Histograma", figsize=(
     width = 0.8  # Largura das barras
     
     # Plotar o histograma
-    ax.bar(x, hist, width, alpha=0.7, color='blue')
+    if len(hist) > 256:
+        # Histogramas de 16 bits têm níveis demais para serem desenhados como barras
+        ax.fill_between(x, hist, step='mid', alpha=0.7, color='blue')
+    else:
+        ax.bar(x, hist, width, alpha=0.7, color='blue')
     
     # Configurar eixos e título
     ax.set_xlabel('Intensidade')
@@ -0,0 +1,376 @@
+"""
+Funções auxiliares para acesso aos pixels das imagens em sua precisão nativa
+"""
+
+import math
+import weakref
+
+import numpy as np
+from PIL import Image
+
+# Modos do Pillow com mais de 8 bits por amostra (escala de cinza)
+HIGH_BIT_DEPTH_MODES = ('I;16', 'I;16L', 'I;16B', 'I;16N', 'I', 'F')
+
+# Arrays que guardam os pixels de imagens abertas por mapeamento em memória:
+# id(imagem) -> (referência fraca, núcleo da imagem, array)
+_pixel_arrays = {}
+
+def is_high_bit_depth(image):
+    """
+    Verifica se a imagem tem mais de 8 bits por amostra
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        bool: True para imagens nos modos I;16, I e F
+    """
+    return image.mode in HIGH_BIT_DEPTH_MODES
+
+def get_image_nbytes(image):
+    """
+    Estima a memória ocupada pelos pixels da imagem
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        int: O tamanho aproximado em bytes
+    """
+    if image.mode in ('I', 'F'):
+        bytes_per_sample = 4
+    elif image.mode.startswith('I;16'):
+        bytes_per_sample = 2
+    else:
+        bytes_per_sample = 1
+    return image.width * image.height * len(image.getbands()) * bytes_per_sample
+
+# Modos cujos pixels, no formato de Image.tobytes, formam diretamente o array
+# de get_native_array: modo -> (dtype numpy, canais)
+_NATIVE_LAYOUTS = {
+    'L': ('|u1', 1),
+    'P': ('|u1', 1),
+    'LA': ('|u1', 2),
+    'RGB': ('|u1', 3),
+    'RGBA': ('|u1', 4),
+    'CMYK': ('|u1', 4),
+    'I;16': ('<u2', 1),
+    'I;16L': ('<u2', 1),
+    'I;16B': ('>u2', 1),
+    'F': ('=f4', 1),
+}
+
+def register_pixel_array(image, array):
+    """
+    Associa a uma imagem o array (por exemplo, um np.memmap) que contém seus pixels
+    
+    get_native_array passa a retornar esse array em vez de copiar os pixels
+    da imagem, enquanto ela não for alterada no lugar.
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+        array (numpy.ndarray): Os pixels, no formato retornado por get_native_array
+    """
+    key = id(image)
+    image_ref = weakref.ref(image, lambda _ref, key=key: _pixel_arrays.pop(key, None))
+    _pixel_arrays[key] = (image_ref, image.im, array)
+
+def attach_pixel_array(image, array):
+    """
+    Associa a uma imagem recém-criada o array que contém seus pixels
+    
+    Como em register_pixel_array, mas a imagem e o array são marcados como
+    somente leitura: uma alteração no lugar da imagem faz antes uma cópia
+    privada dos pixels (e desfaz a associação), e o array não pode ser alterado.
+    Arrays fora do formato de get_native_array para o modo não são associados.
+    
+    Args:
+        image (PIL.Image.Image): A imagem, criada a partir do array
+        array (numpy.ndarray): Os pixels
+    
+    Returns:
+        PIL.Image.Image: A própria imagem
+    """
+    layout = get_native_layout(image.mode, image.size)
+    if layout is None or array.dtype != layout[0] or array.shape != layout[1]:
+        return image
+    
+    array.flags.writeable = False
+    image.readonly = 1
+    register_pixel_array(image, array)
+    return image
+
+def get_native_layout(mode, size):
+    """
+    Retorna o formato de get_native_array nos modos em que ele coincide com Image.tobytes
+    
+    Args:
+        mode (str): O modo da imagem
+        size (tuple): O tamanho (largura, altura) da imagem
+    
+    Returns:
+        tuple: (numpy.dtype, formato do array), ou None nos demais modos
+    """
+    layout = _NATIVE_LAYOUTS.get(mode)
+    if layout is None:
+        return None
+    dtype, channels = layout
+    width, height = size
+    return np.dtype(dtype), (height, width) + ((channels,) if channels > 1 else ())
+
+def get_pixel_array(image):
+    """
+    Retorna o array associado a uma imagem por register_pixel_array
+    
+    Args:
+        image (PIL.Image.Image): A imagem
+    
+    Returns:
+        numpy.ndarray: Os pixels, ou None se não houver array associado ou se a
+                       imagem tiver sido alterada no lugar desde a associação
+    """
+    entry = _pixel_arrays.get(id(image))
+    if entry is None:
+        return None
+    
+    image_ref, core, array = entry
+    # Uma alteração no lugar substitui o núcleo da imagem (cópia sob demanda)
+    if image_ref() is not image or image.im is not core:
+        return None
+    return array
+
+def get_native_array(image):
+    """
+    Converte a imagem para um array numpy preservando a precisão original
+    
+    - Modos de 8 bits (L, RGB, RGBA, ...) resultam em arrays uint8, assim
+      como as imagens binárias (modo 1)
+    - Modos I;16 (em qualquer ordem de bytes) resultam em arrays uint16
+    - O modo I é tratado como 16 bits (é como o Pillow abre PNGs de 16 bits)
+      e seus valores são limitados ao intervalo [0, 65535]; valores negativos
+      ou acima de 16 bits são alterados, com um aviso
+    - O modo F resulta em arrays float32
+    - Imagens mapeadas em memória resultam no próprio array mapeado, sem cópia
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        numpy.ndarray: Os pixels da imagem
+    """
+    pixel_array = get_pixel_array(image)
+    if pixel_array is not None:
+        # Somente leitura: as ferramentas não alteram suas imagens de entrada
+        return pixel_array.astype(np.uint16, copy=False) if image.mode.startswith('I;16') else pixel_array
+    
+    if image.mode.startswith('I;16'):
+        # Garante a ordem de bytes nativa (I;16B é big-endian)
+        return np.asarray(image).astype(np.uint16, copy=False)
+    if image.mode == 'I':
+        array = np.asarray(image)
+        if array.size and (array.min() < 0 or array.max() > 65535):
+            print("Aviso: Imagem no modo I com valores fora do intervalo de 16 bits; "
+                  "os valores foram limitados a [0, 65535]")
+        return np.clip(array, 0, 65535).astype(np.uint16)
+    if image.mode == 'F':
+        return np.asarray(image, dtype=np.float32)
+    if image.mode == '1':
+        # Imagens binárias são tratadas como escala de cinza de 8 bits
+        image = image.convert('L')
+    return np.asarray(image)
+
+def get_max_value(array):
+    """
+    Determina o valor máximo representável (L-1) para os pixels de um array
+    
+    Para arrays de ponto flutuante, usa o menor entre 1, 255 e 65535 que
+    comporte os dados, ou o próprio máximo se ele for maior.
+    
+    Args:
+        array (numpy.ndarray): Os pixels da imagem
+    
+    Returns:
+        float: O valor máximo representável
+    """
+    if array.dtype == np.uint8:
+        return 255
+    if array.dtype == np.uint16:
+        return 65535
+    
+    data_max = float(np.max(array)) if array.size else 0.0
+    for limit in (1.0, 255.0, 65535.0):
+        if data_max <= limit:
+            return limit
+    return data_max
+
+def get_intensity_array(image):
+    """
+    Obtém as intensidades em escala de cinza da imagem em sua precisão nativa
+    
+    Imagens de alta profundidade de bits são mantidas como estão; as demais
+    são convertidas para o modo L.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        numpy.ndarray: Array 2D com as intensidades
+    """
+    if is_high_bit_depth(image):
+        return get_native_array(image)
+    if image.mode != 'L':
+        image = image.convert('L')
+    return np.asarray(image)
+
+def get_integer_intensity_array(image):
+    """
+    Obtém as intensidades da imagem como inteiros sem sinal
+    
+    Usada pelas operações que dependem de níveis discretos (planos de bits,
+    histogramas). Imagens do modo F são quantizadas em 8 bits quando seus
+    valores estão no intervalo [0, 255] e em 16 bits nos demais casos.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        numpy.ndarray: Array 2D uint8 ou uint16 com as intensidades
+    """
+    intensity_array = get_intensity_array(image)
+    if intensity_array.dtype.kind != 'f':
+        return intensity_array
+    
+    max_value = get_max_value(intensity_array)
+    if max_value == 255.0:
+        return np.clip(np.rint(intensity_array), 0, 255).astype(np.uint8)
+    
+    scale = 65535.0 / max_value
+    return np.clip(np.rint(intensity_array * scale), 0, 65535).astype(np.uint16)
+
+def array_to_image(array, mode):
+    """
+    Converte um array de volta para imagem PIL no modo indicado
+    
+    Args:
+        array (numpy.ndarray): Os pixels processados
+        mode (str): O modo da imagem de origem
+    
+    O array resultante fica associado à imagem (attach_pixel_array), de modo
+    que a próxima ferramenta e a exibição leem os pixels sem cópia; a imagem
+    é somente leitura.
+    
+    Returns:
+        PIL.Image.Image: A imagem resultante
+    """
+    if mode == 'I':
+        return Image.fromarray(array.astype(np.int32))
+    if mode == 'F':
+        array = array.astype(np.float32)
+    elif mode.startswith('I;16'):
+        array = array.astype(np.uint16)
+    
+    if mode == 'F' or mode.startswith('I;16'):
+        image = Image.fromarray(array)
+    elif array.ndim == 2:
+        # Arrays 2D de 8 bits sempre resultam em imagens em escala de cinza
+        image = Image.fromarray(array, mode='L')
+    else:
+        image = Image.fromarray(array, mode=mode)
+    return attach_pixel_array(image, array)
+
+def to_display_image(image):
+    """
+    Converte imagens de alta profundidade de bits para 8 bits para exibição
+    
+    A escala usa a profundidade de bits efetiva dos dados (por exemplo, 12 bits
+    em um contêiner de 16 bits), de modo que dados de sensores não apareçam
+    escuros. Imagens de 8 bits são retornadas sem alteração.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+    
+    Returns:
+        PIL.Image.Image: A imagem pronta para exibição
+    """
+    if not is_high_bit_depth(image):
+        return image
+    
+    return array_to_image(scale_to_8bit(get_native_array(image)), 'L')
+
+def scale_to_8bit(intensity_array):
+    """
+    Reduz intensidades de alta profundidade de bits para 8 bits, como na exibição
+    
+    A escala usa a profundidade de bits efetiva dos dados (ver to_display_image).
+    
+    Args:
+        intensity_array (numpy.ndarray): As intensidades (inteiras ou de ponto flutuante)
+    
+    Returns:
+        numpy.ndarray: As intensidades em uint8
+    """
+    if intensity_array.dtype.kind == 'f':
+        max_value = get_max_value(intensity_array)
+    else:
+        data_max = int(np.max(intensity_array)) if intensity_array.size else 0
+        max_value = (1 << max(1, data_max.bit_length())) - 1
+    
+    scaled = intensity_array.astype(np.float32) * (255.0 / max_value)
+    return np.clip(scaled, 0, 255).astype(np.uint8)
+
+def create_thumbnail_image(image, size):
+    """
+    Cria uma miniatura de 8 bits da imagem sem copiá-la em tamanho original
+    
+    A imagem é primeiro reduzida por um fator inteiro com Image.reduce (média
+    de blocos, rápida) e só então redimensionada para caber em size.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+        size (tuple): Tamanho máximo (largura, altura) da miniatura
+    
+    Returns:
+        PIL.Image.Image: A miniatura nos modos L, RGB ou RGBA
+    """
+    # Image.reduce não aceita os modos I;16, P e 1
+    if image.mode.startswith('I;16'):
+        image = image.convert('I')
+    elif image.mode in ('P', '1'):
+        image = image.convert('L' if image.mode == '1' else 'RGBA' if 'transparency' in image.info else 'RGB')
+    
+    factor = max(1, min(image.width // size[0], image.height // size[1]))
+    thumbnail = image.reduce(factor) if factor > 1 else image.copy()
+    
+    thumbnail = to_display_image(thumbnail)
+    if thumbnail.mode not in ('L', 'RGB', 'RGBA'):
+        thumbnail = thumbnail.convert('RGBA' if 'A' in thumbnail.getbands() else 'RGB')
+    
+    thumbnail.thumbnail(size, Image.BILINEAR)
+    return thumbnail
+
+def create_proxy_image(image, max_size):
+    """
+    Cria uma versão reduzida da imagem no mesmo modo, para pré-visualizações
+    
+    A imagem é reduzida por um fator inteiro até caber em max_size: com
+    Image.reduce (média de blocos) nos modos que o aceitam e por amostragem
+    (vizinho mais próximo) nos modos I;16, P e 1. Ao contrário de
+    create_thumbnail_image, o modo e a profundidade de bits são mantidos, então
+    as ferramentas produzem no proxy o mesmo tipo de resultado que na imagem original.
+    
+    Args:
+        image (PIL.Image.Image): A imagem de entrada
+        max_size (tuple): Tamanho máximo (largura, altura) do proxy
+    
+    Returns:
+        PIL.Image.Image: O proxy, ou a própria imagem se ela já couber em max_size
+    """
+    factor = max(math.ceil(image.width / max_size[0]), math.ceil(image.height / max_size[1]))
+    if factor <= 1:
+        return image
+    
+    if image.mode in ('P', '1') or image.mode.startswith('I;16'):
+        size = (math.ceil(image.width / factor), math.ceil(image.height / factor))
+        return image.resize(size, Image.NEAREST)
+    
+    return image.reduce(factor)
@@ -5,6 +5,8 @@ Ferramentas de manipulação de intensidade de imagem
 import numpy as np
 from PIL import Image
 
+from henpixy.tools.image_utils import array_to_image
+
 def zero_intensity(image):
     """
     Altera a intensidade de todos os pixels da imagem para zero.
@@ -15,21 +17,19 @@ def zero_intensity(image):
     Returns:
         PIL.Image.Image: A imagem resultante com intensidade zero
     """
-    # Criamos uma cópia da imagem para não modificar a original
-    result = image.copy()
-    
-    # Convertemos para o formato adequado para trabalhar
+    # A imagem original não é modificada: o resultado é sempre uma nova imagem
     # Preservamos o modo da imagem original
-    original_mode = result.mode
+    original_mode = image.mode
     
-    # Transformamos em array numpy
-    img_array = np.array(result)
+    # Transformamos em array numpy (somente leitura, sem cópia adicional)
+    img_array = np.asarray(image)
     
     # Se for imagem em escala de cinza
     if len(img_array.shape) == 2:
         # Criar um array de zeros com o mesmo tamanho
+        # (imagens de 16 bits e de ponto flutuante mantêm o modo original)
         zeros = np.zeros_like(img_array)
-        new_img = Image.fromarray(zeros, mode='L')
+        new_img = array_to_image(zeros, original_mode)
     
     # Se for RGB
     elif original_mode == 'RGB':
@@ -49,9 +49,9 @@ def zero_intensity(image):
     # Outros modos (como L, LA, etc.)
     else:
         # Convertemos para RGB primeiro
-        rgb_image = result.convert('RGB')
+        rgb_image = image.convert('RGB')
         # Aplicamos a função de intensidade zero
-        img_array = np.array(rgb_image)
+        img_array = np.asarray(rgb_image)
         zeros = np.zeros_like(img_array)
         # Convertemos de volta para o modo original
         new_img = Image.fromarray(zeros, mode='RGB').convert(original_mode)
@@ -5,6 +5,8 @@ Módulo com funções para calcular o negativo de uma imagem
 import numpy as np
 from PIL import Image
 
+from henpixy.tools.image_utils import get_native_array, get_max_value, array_to_image
+
 def negative(image):
     """
     Calcula o negativo de uma imagem
@@ -20,61 +22,34 @@ def negative(image):
     Returns:
         PIL.Image.Image: Uma nova imagem com a transformação aplicada
     """
-    # Cria uma cópia da imagem para não modificar a original
-    result_image = image.copy()
-    
-    # Converte a imagem para array numpy para processamento mais eficiente
-    image_array = np.array(result_image)
+    # Converte a imagem para array numpy preservando a profundidade de bits
+    image_array = get_native_array(image)
     
     # Determina as características da imagem
-    if len(image_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = image_array.shape
-        depth = 1
-        is_grayscale = True
-    else:
-        # Imagem colorida (RGB ou RGBA)
-        height, width, depth = image_array.shape
-        is_grayscale = False
+    is_grayscale = image_array.ndim == 2
+    depth = 1 if is_grayscale else image_array.shape[2]
     
     # Determina o valor máximo (L-1) baseado no tipo de dados
-    dtype = image_array.dtype
-    if dtype == np.uint8:
-        max_value = 255  # 8 bits
-    elif dtype == np.uint16:
-        max_value = 65535  # 16 bits
-    else:
-        # Para outros tipos, converte para uint8 primeiro
-        image_array = image_array.astype(np.uint8)
-        max_value = 255
+    max_value = get_max_value(image_array)
     
-    # Cria lookup table (tabela de busca) para a transformação
-    lut = np.arange(max_value + 1, dtype=dtype)
-    lut = max_value - lut  # S = L-1 - r
-    
-    # Aplica a transformação
-    if is_grayscale:
-        # Imagem em escala de cinza
-        transformed_array = lut[image_array]
+    if image_array.dtype.kind == 'f':
+        # Imagens de ponto flutuante (modo F) não admitem tabela de busca
+        transformed_array = (max_value - image_array).astype(np.float32)
     else:
-        # Imagem colorida (RGB ou RGBA)
-        if depth == 3:  # RGB
-            # Aplica a transformação em cada canal de cor (R, G, B)
-            transformed_array = np.zeros_like(image_array)
-            for i in range(3):  # 3 canais: R, G, B
-                transformed_array[:, :, i] = lut[image_array[:, :, i]]
-        else:  # RGBA ou outros formatos com canal alpha
+        # Cria lookup table (tabela de busca) para a transformação
+        # (256 entradas para 8 bits, 65536 entradas para 16 bits)
+        lut = np.arange(max_value + 1, dtype=image_array.dtype)
+        lut = max_value - lut  # S = L-1 - r
+        
+        # Aplica a transformação
+        if is_grayscale or depth <= 3:
+            # Escala de cinza ou RGB: todos os canais são transformados
+            transformed_array = lut[image_array]
+        else:
+            # RGBA ou outros formatos com canal alpha
             # Aplica a transformação em cada canal de cor, preservando o canal alpha
-            transformed_array = np.zeros_like(image_array)
-            for i in range(3):  # primeiros 3 canais: R, G, B
-                transformed_array[:, :, i] = lut[image_array[:, :, i]]
-            if depth > 3:
-                transformed_array[:, :, 3:] = image_array[:, :, 3:]  # Preserva o canal alpha e outros
-    
-    # Converte de volta para uma imagem PIL
-    if is_grayscale:
-        result_image = Image.fromarray(transformed_array)
-    else:
-        result_image = Image.fromarray(transformed_array, mode=image.mode)
+            transformed_array = image_array.copy()
+            transformed_array[:, :, :3] = lut[image_array[:, :, :3]]
     
-    return result_image 
\ No newline at end of file
+    # Converte de volta para uma imagem PIL no modo original
+    return array_to_image(transformed_array, image.mode)
@@ -5,6 +5,8 @@ Módulo com funções para aplicar transformação de potência (gama) em imagen
 import numpy as np
 from PIL import Image
 
+from henpixy.tools.image_utils import get_native_array, get_max_value, array_to_image
+
 def power_transform(image, gamma, c=1.0):
     """
     Aplica a transformação de potência (gama) em uma imagem
@@ -32,70 +34,40 @@ def power_transform(image, gamma, c=1.0):
     if gamma <= 0:
         raise ValueError("O valor de gama deve ser positivo")
     
-    # Cria uma cópia da imagem para não modificar a original
-    result_image = image.copy()
-    
-    # Converte a imagem para array numpy para processamento mais eficiente
-    image_array = np.array(result_image, dtype=np.float32)
+    # Converte a imagem para array numpy preservando a profundidade de bits
+    image_array = get_native_array(image)
     
     # Determina as características da imagem
-    if len(image_array.shape) == 2:
-        # Imagem em escala de cinza
-        is_grayscale = True
-        depth = 1
-    else:
-        # Imagem colorida (RGB ou RGBA)
-        is_grayscale = False
-        depth = image_array.shape[2]
+    is_grayscale = image_array.ndim == 2
+    depth = 1 if is_grayscale else image_array.shape[2]
     
     # Determina o valor máximo baseado no tipo de dados da imagem original
-    original_array = np.array(image)
-    dtype = original_array.dtype
-    if dtype == np.uint8:
-        max_value = 255.0
-    elif dtype == np.uint16:
-        max_value = 65535.0
-    else:
-        max_value = 255.0  # Padrão para outros tipos
-    
-    # Normalizamos os valores para o intervalo [0, 1]
-    image_array = image_array / max_value
+    max_value = get_max_value(image_array)
     
-    # Aplicamos a transformação de potência
-    if is_grayscale:
-        # Processamento para imagem em escala de cinza
-        transformed_array = c * np.power(image_array, gamma)
-    else:
-        # Processamento para imagem colorida (RGB ou RGBA)
-        transformed_array = image_array.copy()
-        
-        # Aplicamos a transformação em cada canal RGB
-        for i in range(min(3, depth)):  # Primeiros 3 canais (RGB)
-            channel = image_array[:, :, i]
-            transformed_array[:, :, i] = c * np.power(channel, gamma)
+    def transform(values):
+        # Normaliza para [0, 1], aplica S = c * r^γ e volta para a escala original
+        normalized = values.astype(np.float32) / np.float32(max_value)
+        transformed = np.float32(c) * np.power(normalized, np.float32(gamma)) * np.float32(max_value)
         
-        # Preservamos o canal alpha (se existir)
-        if depth > 3:
-            transformed_array[:, :, 3:] = image_array[:, :, 3:]
-    
-    # Voltamos para a escala original [0, max_value]
-    transformed_array = transformed_array * max_value
+        # Garantimos que os valores estejam no intervalo correto
+        return np.clip(transformed, 0, max_value)
     
-    # Garantimos que os valores estejam no intervalo correto
-    transformed_array = np.clip(transformed_array, 0, max_value)
-    
-    # Convertemos de volta para o tipo de dados original
-    if dtype == np.uint8:
-        transformed_array = transformed_array.astype(np.uint8)
-    elif dtype == np.uint16:
-        transformed_array = transformed_array.astype(np.uint16)
+    if image_array.dtype.kind == 'f':
+        # Imagens de ponto flutuante (modo F) são transformadas diretamente em float32
+        color_channels = transform(image_array)
     else:
-        transformed_array = transformed_array.astype(np.uint8)
+        # Para inteiros, a transformação é calculada uma única vez para cada nível
+        # (tabela de 256 entradas para 8 bits, 65536 entradas para 16 bits)
+        # em vez de para cada pixel
+        lut = transform(np.arange(max_value + 1)).astype(image_array.dtype)
+        color_channels = lut[image_array if depth <= 3 else image_array[:, :, :3]]
     
-    # Convertemos de volta para uma imagem PIL
-    if is_grayscale:
-        result_image = Image.fromarray(transformed_array)
+    # Preservamos o canal alpha (se existir)
+    if depth > 3:
+        transformed_array = image_array.copy()
+        transformed_array[:, :, :3] = color_channels[:, :, :3]
     else:
-        result_image = Image.fromarray(transformed_array, mode=image.mode)
+        transformed_array = color_channels
     
-    return result_image 
\ No newline at end of file
+    # Convertemos de volta para uma imagem PIL no modo original
+    return array_to_image(transformed_array, image.mode)
@@ -6,6 +6,9 @@ através de fatiamento por intensidades.
 import numpy as np
 from PIL import Image
 
+from henpixy.tools.image_utils import get_integer_intensity_array, get_max_value, scale_to_8bit
+from henpixy.tools.cancellation import check_progress
+
 def intensity_slicing(image, slices=None, colors=None):
     """
     Realiza o fatiamento por intensidades de uma imagem em escala de cinza,
@@ -21,14 +24,8 @@ def intensity_slicing(image, slices=None, colors=None):
     Returns:
         PIL.Image.Image: Imagem colorida com pseudocores
     """
-    # Converte para escala de cinza se necessário
-    if image.mode != 'L':
-        gray_image = image.convert('L')
-    else:
-        gray_image = image.copy()
-    
-    # Converte para array numpy
-    image_array = np.array(gray_image)
+    # Obtém as intensidades em escala de cinza na precisão nativa
+    image_array = get_integer_intensity_array(image)
     
     # Se não foram fornecidas fatias, usa divisão em 8 níveis iguais (0-31, 32-63, ..., 224-255)
     if slices is None:
@@ -51,6 +48,12 @@ def intensity_slicing(image, slices=None, colors=None):
     if len(colors) != len(slices) + 1:
         raise ValueError(f"O número de cores ({len(colors)}) deve ser igual ao número de fatias + 1 ({len(slices) + 1})")
     
+    # Os limites são definidos na escala de 8 bits; em imagens de 16 bits eles são
+    # ampliados para a escala da imagem em vez de reduzir a precisão dos pixels
+    if image_array.dtype != np.uint8:
+        scale = (get_max_value(image_array) + 1) // 256
+        slices = [limit * scale for limit in slices]
+    
     # Cria uma imagem RGB vazia com o mesmo tamanho da imagem original
     height, width = image_array.shape
     pseudocolor_array = np.zeros((height, width, 3), dtype=np.uint8)
@@ -185,39 +188,48 @@ def create_predefined_maps():
     
     return maps
 
-def apply_custom_transformation(image, red_function, green_function, blue_function):
+def apply_custom_transformation(image, red_function, green_function, blue_function,
+                                progress=None, cancel_token=None):
     """
     Aplica transformações personalizadas a cada canal de cor da imagem.
     
+    Cada função é avaliada uma única vez para cada uma das 256 intensidades,
+    formando uma tabela de busca aplicada a todos os pixels.
+    
     Args:
         image (PIL.Image.Image): Imagem de entrada em escala de cinza
         red_function (function): Função para transformar intensidades no canal vermelho
         green_function (function): Função para transformar intensidades no canal verde
         blue_function (function): Função para transformar intensidades no canal azul
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe a transformação se for cancelada
     
     Returns:
         PIL.Image.Image: Imagem colorida resultante
-    """
-    # Converte para escala de cinza se necessário
-    if image.mode != 'L':
-        gray_image = image.convert('L')
-    else:
-        gray_image = image.copy()
     
-    # Converte para array numpy
-    image_array = np.array(gray_image)
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
+    """
+    # Obtém as intensidades em escala de cinza; as funções de transformação
+    # recebem intensidades de 8 bits, então imagens de 16 bits são reduzidas
+    # com a mesma escala da exibição (profundidade de bits efetiva)
+    image_array = get_integer_intensity_array(image)
+    if image_array.dtype == np.uint16:
+        image_array = scale_to_8bit(image_array)
     
-    # Cria uma imagem RGB vazia com o mesmo tamanho da imagem original
-    height, width = image_array.shape
-    color_array = np.zeros((height, width, 3), dtype=np.uint8)
+    # Cria a tabela de busca (256 x 3) avaliando as funções de cada canal
+    # com as intensidades no mesmo tipo dos pixels
+    lut = np.zeros((256, 3), dtype=np.uint8)
+    functions = (red_function, green_function, blue_function)
+    for channel, function in enumerate(functions):
+        check_progress(progress, cancel_token, channel, len(functions) + 1)
+        for intensity in range(256):
+            lut[intensity, channel] = np.clip(function(np.uint8(intensity)), 0, 255)
     
-    # Aplica as funções de transformação para cada canal
-    for i in range(height):
-        for j in range(width):
-            intensity = image_array[i, j]
-            color_array[i, j, 0] = np.clip(red_function(intensity), 0, 255)    # Canal R
-            color_array[i, j, 1] = np.clip(green_function(intensity), 0, 255)  # Canal G
-            color_array[i, j, 2] = np.clip(blue_function(intensity), 0, 255)   # Canal B
+    # Aplica a tabela a todos os pixels de uma só vez
+    check_progress(progress, cancel_token, len(functions), len(functions) + 1)
+    color_array = lut[image_array]
+    check_progress(progress, cancel_token, len(functions) + 1, len(functions) + 1)
     
     # Converte de volta para imagem PIL
     color_image = Image.fromarray(color_array, mode='RGB')
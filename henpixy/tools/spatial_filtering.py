@@ -3,9 +3,157 @@ Módulo para implementação de filtros espaciais.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from PIL import Image
 
-def mean_filter(image, kernel_size=3):
+from henpixy.tools.image_utils import is_high_bit_depth, get_native_array, get_max_value, array_to_image
+from henpixy.tools.cancellation import check_progress
+
+# Quantidade aproximada de elementos lidos por faixa de linhas; limita a
+# memória usada pelos resultados intermediários e define com que frequência o
+# progresso é informado e o cancelamento é verificado
+BAND_ELEMENTS = 4 * 1024 * 1024
+
+def _prepare_filter_input(image):
+    """
+    Obtém os pixels da imagem em ponto flutuante para a filtragem
+    
+    Imagens de alta profundidade de bits (modos I;16, I e F) são mantidas em
+    escala de cinza com sua precisão original; imagens RGBA têm o canal alpha
+    separado e os demais modos são convertidos para RGB.
+    
+    Args:
+        image (PIL.Image.Image): Imagem de entrada
+    
+    Returns:
+        tuple: (array float32, canal alpha ou None, valor máximo representável)
+    """
+    if is_high_bit_depth(image):
+        native_array = get_native_array(image)
+        return native_array.astype(np.float32), None, get_max_value(native_array)
+    
+    if image.mode in ('L', 'RGB'):
+        return np.asarray(image, dtype=np.float32), None, 255
+    
+    if image.mode == 'RGBA':
+        # Imagem colorida com canal alpha
+        alpha_channel = np.asarray(image.getchannel('A'))
+        return np.asarray(image.convert('RGB'), dtype=np.float32), alpha_channel, 255
+    
+    # Converte outros modos para RGB
+    return np.asarray(image.convert('RGB'), dtype=np.float32), None, 255
+
+def _filter_output(result_array, image, alpha_channel, max_value):
+    """
+    Converte o resultado de um filtro de volta para imagem PIL
+    
+    Args:
+        result_array (numpy.ndarray): Pixels filtrados em ponto flutuante
+        image (PIL.Image.Image): Imagem de entrada (define o modo do resultado)
+        alpha_channel (numpy.ndarray): Canal alpha a ser reaplicado, ou None
+        max_value (float): Valor máximo representável
+    
+    Returns:
+        PIL.Image.Image: Imagem filtrada
+    """
+    if is_high_bit_depth(image):
+        result_array = np.clip(result_array, 0, max_value)
+        if image.mode != 'F':
+            result_array = result_array.astype(np.uint16)
+        return array_to_image(result_array, image.mode)
+    
+    result_image = Image.fromarray(result_array.astype(np.uint8), mode='L' if result_array.ndim == 2 else 'RGB')
+    
+    # Reaplica o canal alpha se necessário
+    if alpha_channel is not None:
+        result_image.putalpha(Image.fromarray(alpha_channel, mode='L'))
+    
+    return result_image
+
+def _apply_window_filter(img_array, kernel_size, band_filter, window_cost, progress=None, cancel_token=None):
+    """
+    Aplica um filtro de vizinhança kernel_size x kernel_size por faixas de linhas
+    
+    Os pixels da borda, cuja vizinhança sai da imagem, permanecem com valor zero.
+    
+    Args:
+        img_array (numpy.ndarray): Pixels em ponto flutuante (altura, largura[, canais])
+        kernel_size (int): Tamanho do kernel
+        band_filter (callable): Recebe uma faixa de linhas (com kernel_size // 2
+                                linhas extras acima e abaixo) e retorna os pixels
+                                filtrados das linhas e colunas internas
+        window_cost (int): Elementos lidos por pixel filtrado; define a altura das faixas
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
+    
+    Returns:
+        numpy.ndarray: Pixels filtrados
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
+    """
+    filtered_array = np.zeros_like(img_array)
+    
+    height, width = img_array.shape[:2]
+    channels = img_array.shape[2] if img_array.ndim == 3 else 1
+    padding = kernel_size // 2
+    if height < kernel_size or width < kernel_size:
+        return filtered_array
+    
+    # Linhas de saída por faixa
+    band_rows = max(1, BAND_ELEMENTS // (width * channels * window_cost))
+    total_rows = height - 2 * padding
+    
+    for start in range(padding, height - padding, band_rows):
+        check_progress(progress, cancel_token, start - padding, total_rows)
+        
+        end = min(start + band_rows, height - padding)
+        band = img_array[start - padding:end + padding]
+        filtered_array[start:end, padding:width - padding] = band_filter(band)
+    
+    check_progress(progress, cancel_token, total_rows, total_rows)
+    return filtered_array
+
+def _window_reduce(band, kernel_size, reducer):
+    """
+    Reduz cada janela kernel_size x kernel_size de uma faixa a um valor
+    
+    As janelas são uma visão deslizante da faixa, sem cópia dos pixels.
+    
+    Args:
+        band (numpy.ndarray): A faixa de linhas
+        kernel_size (int): Tamanho do kernel
+        reducer (callable): Função de redução com argumento axis (np.median, ...)
+    
+    Returns:
+        numpy.ndarray: O valor de cada janela
+    """
+    windows = sliding_window_view(band, (kernel_size, kernel_size), axis=(0, 1))
+    return reducer(windows, axis=(-2, -1))
+
+def _separable_reduce(band, kernel_size, reducer):
+    """
+    Reduz cada janela kernel_size x kernel_size reduzindo primeiro as colunas e depois as linhas
+    
+    Vale para reduções separáveis (máximo, mínimo, soma) e lê 2 * kernel_size
+    elementos por pixel, em vez de kernel_size².
+    
+    Args:
+        band (numpy.ndarray): A faixa de linhas
+        kernel_size (int): Tamanho do kernel
+        reducer (callable): Função de redução com argumento axis (np.max, np.min, np.sum)
+    
+    Returns:
+        numpy.ndarray: O valor de cada janela
+    """
+    vertical = reducer(sliding_window_view(band, kernel_size, axis=0), axis=-1)
+    return reducer(sliding_window_view(vertical, kernel_size, axis=1), axis=-1)
+
+def _window_sum(array, axis):
+    """Soma em precisão dupla, usada pelo filtro da média."""
+    return np.sum(array, axis=axis, dtype=np.float64)
+
+def mean_filter(image, kernel_size=3, progress=None, cancel_token=None):
     """
     Aplica um filtro de suavização da média na imagem.
     
@@ -16,88 +164,33 @@ def mean_filter(image, kernel_size=3):
         image (PIL.Image.Image): Imagem de entrada
         kernel_size (int): Tamanho do kernel (vizinhança) para o filtro.
                           Deve ser um número ímpar (3, 5, 7, etc.)
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
     
     Returns:
         PIL.Image.Image: Imagem suavizada
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     # Verifica se o tamanho do kernel é válido (deve ser ímpar)
     if kernel_size % 2 == 0:
         raise ValueError("O tamanho do kernel deve ser um número ímpar")
     
-    # Obtém uma cópia da imagem de entrada para evitar modificar a original
-    if image.mode == 'L':
-        # Imagem em escala de cinza
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGB':
-        # Imagem colorida RGB
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGBA':
-        # Imagem colorida com canal alpha
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = True
-        alpha_channel = np.array(image.getchannel('A'))
-    else:
-        # Converte outros modos para RGB
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    
-    # Obtém as dimensões da imagem
-    if len(img_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = img_array.shape
-        channels = 1
-    else:
-        # Imagem colorida (RGB)
-        height, width, channels = img_array.shape
-    
-    # Calcula a borda (padding) necessária para processar os pixels da borda
-    padding = kernel_size // 2
-    
-    # Cria uma nova matriz para armazenar a imagem filtrada
-    filtered_array = np.zeros_like(img_array)
+    # Obtém os pixels da imagem em ponto flutuante
+    img_array, alpha_channel, max_value = _prepare_filter_input(image)
     
-    # Aplica o filtro da média
-    if channels == 1:
-        # Para imagens em escala de cinza
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Extrai a vizinhança do pixel
-                neighborhood = img_array[y - padding:y + padding + 1, x - padding:x + padding + 1]
-                # Calcula a média da vizinhança
-                filtered_array[y, x] = np.mean(neighborhood)
-    else:
-        # Para imagens coloridas
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Processa cada canal de cor separadamente
-                for c in range(channels):
-                    # Extrai a vizinhança do pixel para o canal atual
-                    neighborhood = img_array[y - padding:y + padding + 1, 
-                                           x - padding:x + padding + 1, c]
-                    # Calcula a média da vizinhança
-                    filtered_array[y, x, c] = np.mean(neighborhood)
-    
-    # Converte de volta para imagem PIL
-    if channels == 1:
-        # Escala de cinza
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='L')
-    else:
-        # RGB
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='RGB')
-    
-    # Reaplica o canal alpha se necessário
-    if has_alpha:
-        alpha_img = Image.fromarray(alpha_channel, mode='L')
-        filtered_image.putalpha(alpha_img)
+    # Aplica o filtro da média por faixas de linhas
+    filtered_array = _apply_window_filter(
+        img_array, kernel_size,
+        lambda band: _separable_reduce(band, kernel_size, _window_sum) / (kernel_size * kernel_size),
+        2 * kernel_size, progress, cancel_token
+    )
     
-    return filtered_image
+    # Converte de volta para imagem PIL, reaplicando o canal alpha se necessário
+    return _filter_output(filtered_array, image, alpha_channel, max_value)
 
-def max_filter(image, kernel_size=3):
+def max_filter(image, kernel_size=3, progress=None, cancel_token=None):
     """
     Aplica um filtro de máximo na imagem.
     
@@ -108,88 +201,33 @@ def max_filter(image, kernel_size=3):
         image (PIL.Image.Image): Imagem de entrada
         kernel_size (int): Tamanho do kernel (vizinhança) para o filtro.
                           Deve ser um número ímpar (3, 5, 7, etc.)
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
     
     Returns:
         PIL.Image.Image: Imagem filtrada
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     # Verifica se o tamanho do kernel é válido (deve ser ímpar)
     if kernel_size % 2 == 0:
         raise ValueError("O tamanho do kernel deve ser um número ímpar")
     
-    # Obtém uma cópia da imagem de entrada para evitar modificar a original
-    if image.mode == 'L':
-        # Imagem em escala de cinza
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGB':
-        # Imagem colorida RGB
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGBA':
-        # Imagem colorida com canal alpha
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = True
-        alpha_channel = np.array(image.getchannel('A'))
-    else:
-        # Converte outros modos para RGB
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    
-    # Obtém as dimensões da imagem
-    if len(img_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = img_array.shape
-        channels = 1
-    else:
-        # Imagem colorida (RGB)
-        height, width, channels = img_array.shape
-    
-    # Calcula a borda (padding) necessária para processar os pixels da borda
-    padding = kernel_size // 2
-    
-    # Cria uma nova matriz para armazenar a imagem filtrada
-    filtered_array = np.zeros_like(img_array)
-    
-    # Aplica o filtro de máximo
-    if channels == 1:
-        # Para imagens em escala de cinza
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Extrai a vizinhança do pixel
-                neighborhood = img_array[y - padding:y + padding + 1, x - padding:x + padding + 1]
-                # Calcula o máximo da vizinhança
-                filtered_array[y, x] = np.max(neighborhood)
-    else:
-        # Para imagens coloridas
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Processa cada canal de cor separadamente
-                for c in range(channels):
-                    # Extrai a vizinhança do pixel para o canal atual
-                    neighborhood = img_array[y - padding:y + padding + 1, 
-                                           x - padding:x + padding + 1, c]
-                    # Calcula o máximo da vizinhança
-                    filtered_array[y, x, c] = np.max(neighborhood)
-    
-    # Converte de volta para imagem PIL
-    if channels == 1:
-        # Escala de cinza
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='L')
-    else:
-        # RGB
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='RGB')
+    # Obtém os pixels da imagem em ponto flutuante
+    img_array, alpha_channel, max_value = _prepare_filter_input(image)
     
-    # Reaplica o canal alpha se necessário
-    if has_alpha:
-        alpha_img = Image.fromarray(alpha_channel, mode='L')
-        filtered_image.putalpha(alpha_img)
+    # Aplica o filtro de máximo por faixas de linhas
+    filtered_array = _apply_window_filter(
+        img_array, kernel_size,
+        lambda band: _separable_reduce(band, kernel_size, np.max),
+        2 * kernel_size, progress, cancel_token
+    )
     
-    return filtered_image
+    # Converte de volta para imagem PIL, reaplicando o canal alpha se necessário
+    return _filter_output(filtered_array, image, alpha_channel, max_value)
 
-def min_filter(image, kernel_size=3):
+def min_filter(image, kernel_size=3, progress=None, cancel_token=None):
     """
     Aplica um filtro de mínimo na imagem.
     
@@ -200,88 +238,33 @@ def min_filter(image, kernel_size=3):
         image (PIL.Image.Image): Imagem de entrada
         kernel_size (int): Tamanho do kernel (vizinhança) para o filtro.
                           Deve ser um número ímpar (3, 5, 7, etc.)
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
     
     Returns:
         PIL.Image.Image: Imagem filtrada
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     # Verifica se o tamanho do kernel é válido (deve ser ímpar)
     if kernel_size % 2 == 0:
         raise ValueError("O tamanho do kernel deve ser um número ímpar")
     
-    # Obtém uma cópia da imagem de entrada para evitar modificar a original
-    if image.mode == 'L':
-        # Imagem em escala de cinza
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGB':
-        # Imagem colorida RGB
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGBA':
-        # Imagem colorida com canal alpha
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = True
-        alpha_channel = np.array(image.getchannel('A'))
-    else:
-        # Converte outros modos para RGB
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    
-    # Obtém as dimensões da imagem
-    if len(img_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = img_array.shape
-        channels = 1
-    else:
-        # Imagem colorida (RGB)
-        height, width, channels = img_array.shape
-    
-    # Calcula a borda (padding) necessária para processar os pixels da borda
-    padding = kernel_size // 2
-    
-    # Cria uma nova matriz para armazenar a imagem filtrada
-    filtered_array = np.zeros_like(img_array)
+    # Obtém os pixels da imagem em ponto flutuante
+    img_array, alpha_channel, max_value = _prepare_filter_input(image)
     
-    # Aplica o filtro de mínimo
-    if channels == 1:
-        # Para imagens em escala de cinza
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Extrai a vizinhança do pixel
-                neighborhood = img_array[y - padding:y + padding + 1, x - padding:x + padding + 1]
-                # Calcula o mínimo da vizinhança
-                filtered_array[y, x] = np.min(neighborhood)
-    else:
-        # Para imagens coloridas
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Processa cada canal de cor separadamente
-                for c in range(channels):
-                    # Extrai a vizinhança do pixel para o canal atual
-                    neighborhood = img_array[y - padding:y + padding + 1, 
-                                           x - padding:x + padding + 1, c]
-                    # Calcula o mínimo da vizinhança
-                    filtered_array[y, x, c] = np.min(neighborhood)
-    
-    # Converte de volta para imagem PIL
-    if channels == 1:
-        # Escala de cinza
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='L')
-    else:
-        # RGB
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='RGB')
-    
-    # Reaplica o canal alpha se necessário
-    if has_alpha:
-        alpha_img = Image.fromarray(alpha_channel, mode='L')
-        filtered_image.putalpha(alpha_img)
+    # Aplica o filtro de mínimo por faixas de linhas
+    filtered_array = _apply_window_filter(
+        img_array, kernel_size,
+        lambda band: _separable_reduce(band, kernel_size, np.min),
+        2 * kernel_size, progress, cancel_token
+    )
     
-    return filtered_image
+    # Converte de volta para imagem PIL, reaplicando o canal alpha se necessário
+    return _filter_output(filtered_array, image, alpha_channel, max_value)
 
-def median_filter(image, kernel_size=3):
+def median_filter(image, kernel_size=3, progress=None, cancel_token=None):
     """
     Aplica um filtro de mediana na imagem.
     
@@ -293,88 +276,34 @@ def median_filter(image, kernel_size=3):
         image (PIL.Image.Image): Imagem de entrada
         kernel_size (int): Tamanho do kernel (vizinhança) para o filtro.
                           Deve ser um número ímpar (3, 5, 7, etc.)
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
     
     Returns:
         PIL.Image.Image: Imagem filtrada
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
     # Verifica se o tamanho do kernel é válido (deve ser ímpar)
     if kernel_size % 2 == 0:
         raise ValueError("O tamanho do kernel deve ser um número ímpar")
     
-    # Obtém uma cópia da imagem de entrada para evitar modificar a original
-    if image.mode == 'L':
-        # Imagem em escala de cinza
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGB':
-        # Imagem colorida RGB
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGBA':
-        # Imagem colorida com canal alpha
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = True
-        alpha_channel = np.array(image.getchannel('A'))
-    else:
-        # Converte outros modos para RGB
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    
-    # Obtém as dimensões da imagem
-    if len(img_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = img_array.shape
-        channels = 1
-    else:
-        # Imagem colorida (RGB)
-        height, width, channels = img_array.shape
-    
-    # Calcula a borda (padding) necessária para processar os pixels da borda
-    padding = kernel_size // 2
-    
-    # Cria uma nova matriz para armazenar a imagem filtrada
-    filtered_array = np.zeros_like(img_array)
+    # Obtém os pixels da imagem em ponto flutuante
+    img_array, alpha_channel, max_value = _prepare_filter_input(image)
     
-    # Aplica o filtro de mediana
-    if channels == 1:
-        # Para imagens em escala de cinza
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Extrai a vizinhança do pixel
-                neighborhood = img_array[y - padding:y + padding + 1, x - padding:x + padding + 1]
-                # Calcula a mediana da vizinhança
-                filtered_array[y, x] = np.median(neighborhood)
-    else:
-        # Para imagens coloridas
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Processa cada canal de cor separadamente
-                for c in range(channels):
-                    # Extrai a vizinhança do pixel para o canal atual
-                    neighborhood = img_array[y - padding:y + padding + 1, 
-                                           x - padding:x + padding + 1, c]
-                    # Calcula a mediana da vizinhança
-                    filtered_array[y, x, c] = np.median(neighborhood)
-    
-    # Converte de volta para imagem PIL
-    if channels == 1:
-        # Escala de cinza
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='L')
-    else:
-        # RGB
-        filtered_image = Image.fromarray(filtered_array.astype(np.uint8), mode='RGB')
+    # Aplica o filtro de mediana por faixas de linhas
+    filtered_array = _apply_window_filter(
+        img_array, kernel_size,
+        lambda band: _window_reduce(band, kernel_size, np.median),
+        kernel_size * kernel_size, progress, cancel_token
+    )
     
-    # Reaplica o canal alpha se necessário
-    if has_alpha:
-        alpha_img = Image.fromarray(alpha_channel, mode='L')
-        filtered_image.putalpha(alpha_img)
-    
-    return filtered_image
+    # Converte de volta para imagem PIL, reaplicando o canal alpha se necessário
+    return _filter_output(filtered_array, image, alpha_channel, max_value)
 
-def laplacian_filter(image, include_diagonals=True, apply_adjustment=False, sharpen_image=False):
+def laplacian_filter(image, include_diagonals=True, apply_adjustment=False, sharpen_image=False,
+                     progress=None, cancel_token=None):
     """
     Aplica o filtro Laplaciano na imagem.
     
@@ -389,40 +318,17 @@ def laplacian_filter(image, include_diagonals=True, apply_adjustment=False, shar
                                adicionando 128 a todos os pixels para centralizar em cinza médio.
         sharpen_image (bool): Se True, combina a imagem original com a Laplaciana para
                              aguçamento (resultado = original - constante * laplaciano).
+        progress (callable, optional): Recebe a fração concluída (0.0 a 1.0)
+        cancel_token (CancellationToken, optional): Interrompe o filtro se for cancelado
     
     Returns:
         PIL.Image.Image: Imagem processada pelo filtro Laplaciano
+    
+    Raises:
+        OperationCancelled: Se o cancelamento for solicitado
     """
-    # Obtém uma cópia da imagem de entrada para evitar modificar a original
-    if image.mode == 'L':
-        # Imagem em escala de cinza
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGB':
-        # Imagem colorida RGB
-        img_array = np.array(image.copy(), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    elif image.mode == 'RGBA':
-        # Imagem colorida com canal alpha
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = True
-        alpha_channel = np.array(image.getchannel('A'))
-    else:
-        # Converte outros modos para RGB
-        img_array = np.array(image.convert('RGB'), dtype=np.float32)
-        has_alpha = False
-        alpha_channel = None
-    
-    # Obtém as dimensões da imagem
-    if len(img_array.shape) == 2:
-        # Imagem em escala de cinza
-        height, width = img_array.shape
-        channels = 1
-    else:
-        # Imagem colorida (RGB)
-        height, width, channels = img_array.shape
+    # Obtém os pixels da imagem em ponto flutuante
+    img_array, alpha_channel, max_value = _prepare_filter_input(image)
     
     # Define o kernel Laplaciano
     if include_diagonals:
@@ -442,35 +348,12 @@ def laplacian_filter(image, include_diagonals=True, apply_adjustment=False, shar
                           [1, -4, 1],
                           [0, 1, 0]], dtype=np.float32)
     
-    # Calcula a borda (padding) necessária
-    padding = 1  # Para kernel 3x3
-    
-    # Cria uma matriz para a imagem filtrada
-    laplacian_array = np.zeros_like(img_array)
-    
-    # Aplica o filtro Laplaciano
-    if channels == 1:
-        # Para imagens em escala de cinza
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Extrai a vizinhança do pixel
-                neighborhood = img_array[y - padding:y + padding + 1, 
-                                      x - padding:x + padding + 1]
-                
-                # Aplica o kernel Laplaciano (convolução)
-                laplacian_array[y, x] = np.sum(neighborhood * kernel)
-    else:
-        # Para imagens coloridas
-        for y in range(padding, height - padding):
-            for x in range(padding, width - padding):
-                # Processa cada canal de cor separadamente
-                for c in range(channels):
-                    # Extrai a vizinhança do pixel para o canal atual
-                    neighborhood = img_array[y - padding:y + padding + 1, 
-                                          x - padding:x + padding + 1, c]
-                    
-                    # Aplica o kernel Laplaciano (convolução)
-                    laplacian_array[y, x, c] = np.sum(neighborhood * kernel)
+    # Aplica o filtro Laplaciano (convolução) por faixas de linhas
+    laplacian_array = _apply_window_filter(
+        img_array, 3,
+        lambda band: np.einsum('...ij,ij->...', sliding_window_view(band, (3, 3), axis=(0, 1)), kernel),
+        9, progress, cancel_token
+    )
     
     # Decide qual resultado retornar com base nos parâmetros
     if sharpen_image:
@@ -478,32 +361,21 @@ def laplacian_filter(image, include_diagonals=True, apply_adjustment=False, shar
         # Usa subtração porque o Laplaciano detecta bordas com valores positivos
         # nas transições de claro para escuro
         sharpened_array = img_array - 0.5 * laplacian_array
-        # Clip para garantir que os valores estejam no intervalo válido [0, 255]
-        sharpened_array = np.clip(sharpened_array, 0, 255)
+        # Clip para garantir que os valores estejam no intervalo válido [0, L-1]
+        sharpened_array = np.clip(sharpened_array, 0, max_value)
         result_array = sharpened_array
     elif apply_adjustment:
         # Ajusta o resultado do Laplaciano para visualização
-        # Adiciona 128 para centralizar em torno de cinza médio
-        adjusted_array = laplacian_array + 128
-        # Clip para garantir que os valores estejam no intervalo válido [0, 255]
-        adjusted_array = np.clip(adjusted_array, 0, 255)
+        # Adiciona o nível médio (128 para 8 bits) para centralizar em torno de cinza médio
+        midpoint = (max_value + 1) // 2 if isinstance(max_value, int) else max_value / 2
+        adjusted_array = laplacian_array + midpoint
+        # Clip para garantir que os valores estejam no intervalo válido [0, L-1]
+        adjusted_array = np.clip(adjusted_array, 0, max_value)
         result_array = adjusted_array
     else:
         # Laplaciano sem ajuste (pode ter valores negativos que serão truncados)
-        # Clip para garantir que os valores estejam no intervalo válido [0, 255]
-        result_array = np.clip(laplacian_array, 0, 255)
-    
-    # Converte o array processado de volta para imagem PIL
-    if channels == 1:
-        # Escala de cinza
-        result_image = Image.fromarray(result_array.astype(np.uint8), mode='L')
-    else:
-        # RGB
-        result_image = Image.fromarray(result_array.astype(np.uint8), mode='RGB')
-    
-    # Reaplica o canal alpha se necessário
-    if has_alpha:
-        alpha_img = Image.fromarray(alpha_channel, mode='L')
-        result_image.putalpha(alpha_img)
+        # Clip para garantir que os valores estejam no intervalo válido [0, L-1]
+        result_array = np.clip(laplacian_array, 0, max_value)
     
-    return result_image 
\ No newline at end of file
+    # Converte o array processado de volta para imagem PIL, reaplicando o canal alpha se necessário
+    return _filter_output(result_array, image, alpha_channel, max_value) 
\ No newline at end of file
@@ -11,4 +11,13 @@ setup(
         "scikit-image>=0.21.0",
         "matplotlib>=3.7.0"
     ],
+    extras_require={
+        # Pipelines do henpixy-batch descritos em YAML
+        "yaml": ["pyyaml>=6.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "henpixy-batch=henpixy.batch:main",
+        ],
+    },
 ) 
\ No newline at end of file
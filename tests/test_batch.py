@@ -0,0 +1,124 @@
+"""
+Testes do henpixy-batch: códigos de saída da linha de comando e arquivos gerados
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.batch import main
+from henpixy.core.operations import Operation
+from henpixy.core.pipeline import Pipeline
+
+PIPELINE = Pipeline([
+    Operation("negative"),
+    Operation("power_transform", gamma=0.5),
+])
+
+
+def _make_image(seed):
+    """Cria uma imagem de teste pequena e determinística"""
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (24, 32, 3), dtype=np.uint8))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Cria um pipeline e três imagens de entrada em um diretório temporário do teste"""
+    pipeline_path = tmp_path / "pipeline.json"
+    PIPELINE.save(str(pipeline_path))
+    
+    input_dir = tmp_path / "entrada"
+    input_dir.mkdir()
+    for index in range(3):
+        _make_image(index).save(input_dir / f"imagem{index}.png")
+    
+    return tmp_path
+
+
+def _run(workspace, *args):
+    """Executa o henpixy-batch com o pipeline e as entradas do diretório de teste"""
+    return main([str(workspace / "pipeline.json"), str(workspace / "entrada" / "*.png"),
+                 "-j", "2", "-q"] + list(args))
+
+
+def test_success_returns_zero(workspace):
+    output_dir = workspace / "saida"
+    
+    assert _run(workspace, "-o", str(output_dir)) == 0
+    
+    for index in range(3):
+        with Image.open(output_dir / f"imagem{index}.png") as result:
+            expected = PIPELINE.apply(_make_image(index))
+            assert result.tobytes() == expected.tobytes()
+
+
+def test_format_and_suffix(workspace):
+    output_dir = workspace / "saida"
+    
+    assert _run(workspace, "-o", str(output_dir), "--format", "tif", "--suffix", "_proc") == 0
+    
+    assert sorted(os.listdir(output_dir)) == [f"imagem{index}_proc.tif" for index in range(3)]
+
+
+def test_failed_file_returns_one(workspace):
+    (workspace / "entrada" / "corrompida.png").write_bytes(b"nao e uma imagem")
+    output_dir = workspace / "saida"
+    
+    assert _run(workspace, "-o", str(output_dir)) == 1
+    
+    # Os demais arquivos continuam sendo processados
+    assert sorted(os.listdir(output_dir)) == [f"imagem{index}.png" for index in range(3)]
+
+
+@pytest.mark.parametrize("content", [
+    "{não é json",
+    '{"steps": [{"name": "inexistente"}]}',
+    '{"steps": [{"name": "power_transform", "params": {"gama": 0.5}}]}',
+    '{"steps": [{"name": "negative", "params": [1, 2]}]}',
+])
+def test_invalid_pipeline_returns_two(workspace, content):
+    (workspace / "pipeline.json").write_text(content, encoding="utf-8")
+    output_dir = workspace / "saida"
+    
+    assert _run(workspace, "-o", str(output_dir)) == 2
+    assert not output_dir.exists()
+
+
+def test_missing_pipeline_returns_two(workspace):
+    (workspace / "pipeline.json").unlink()
+    
+    assert _run(workspace, "-o", str(workspace / "saida")) == 2
+
+
+def test_no_inputs_returns_two(workspace):
+    result = main([str(workspace / "pipeline.json"), str(workspace / "entrada" / "*.jpg"),
+                   "-o", str(workspace / "saida")])
+    
+    assert result == 2
+
+
+def test_overwriting_input_returns_two(workspace):
+    input_dir = workspace / "entrada"
+    before = {name: (input_dir / name).read_bytes() for name in os.listdir(input_dir)}
+    
+    assert _run(workspace, "-o", str(input_dir)) == 2
+    
+    assert {name: (input_dir / name).read_bytes() for name in os.listdir(input_dir)} == before
+
+
+def test_duplicate_output_names_are_skipped(workspace, capsys):
+    other_dir = workspace / "outra"
+    other_dir.mkdir()
+    _make_image(10).save(other_dir / "imagem0.png")
+    output_dir = workspace / "saida"
+    
+    result = main([str(workspace / "pipeline.json"), str(workspace / "entrada" / "*.png"),
+                   str(other_dir / "*.png"), "-o", str(output_dir), "-j", "2", "-q"])
+    
+    assert result == 0
+    assert "Ignorando" in capsys.readouterr().err
+    with Image.open(output_dir / "imagem0.png") as output:
+        assert output.tobytes() == PIPELINE.apply(_make_image(0)).tobytes()
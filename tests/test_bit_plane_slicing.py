@@ -0,0 +1,118 @@
+"""
+Testes do fatiamento por planos de bits: a reconstrução deve manter apenas os
+bits dos planos escolhidos e as métricas devem corresponder ao erro real
+"""
+
+import math
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.tools.bit_plane_slicing import (
+    decompose_bit_planes,
+    evaluate_bit_plane_reconstruction,
+    reconstruct_from_bit_planes,
+)
+
+
+def _make_image(mode):
+    """Cria uma imagem de teste pequena e determinística no modo dado"""
+    rng = np.random.default_rng(7)
+    
+    if mode == 'L':
+        array = rng.integers(0, 256, (20, 30), dtype=np.uint8)
+        # Garante o valor máximo, para que a imagem tenha exatamente 8 planos
+        array[0, 0] = 255
+        return Image.fromarray(array)
+    if mode == 'I;16':
+        array = rng.integers(0, 4096, (20, 30), dtype=np.uint16)
+        array[0, 0] = 4095
+        return Image.fromarray(array)
+    raise ValueError(mode)
+
+BIT_DEPTHS = {'L': 8, 'I;16': 12}
+
+PLANE_SETS = [[], [0], [7], [4, 5, 6, 7], [0, 2, 4, 6], list(range(8))]
+
+
+def _expected_array(image, planes):
+    """Mantém os bits dos planos escolhidos diretamente nos pixels"""
+    mask = sum(1 << plane for plane in planes)
+    return np.asarray(image).astype(np.int64) & mask
+
+
+@pytest.mark.parametrize("mode", sorted(BIT_DEPTHS))
+@pytest.mark.parametrize("planes", PLANE_SETS)
+def test_reconstruction_keeps_selected_bits(mode, planes):
+    image = _make_image(mode)
+    
+    result = reconstruct_from_bit_planes(image, planes)
+    
+    assert result.mode == ('L' if mode == 'L' else 'I;16')
+    assert result.size == image.size
+    np.testing.assert_array_equal(np.asarray(result), _expected_array(image, planes))
+
+
+@pytest.mark.parametrize("mode", sorted(BIT_DEPTHS))
+def test_all_planes_reconstruct_original(mode):
+    image = _make_image(mode)
+    
+    result = reconstruct_from_bit_planes(image, range(BIT_DEPTHS[mode]))
+    
+    np.testing.assert_array_equal(np.asarray(result), np.asarray(image))
+
+
+@pytest.mark.parametrize("mode", sorted(BIT_DEPTHS))
+def test_decomposition_sums_to_original(mode):
+    image = _make_image(mode)
+    
+    planes = decompose_bit_planes(image)
+    
+    assert planes.shape == (BIT_DEPTHS[mode],) + np.asarray(image).shape
+    weights = (1 << np.arange(len(planes), dtype=np.int64)).reshape(-1, 1, 1)
+    np.testing.assert_array_equal((planes * weights).sum(axis=0), np.asarray(image))
+
+
+@pytest.mark.parametrize("mode", sorted(BIT_DEPTHS))
+@pytest.mark.parametrize("planes", PLANE_SETS)
+def test_metrics_match_reconstruction_error(mode, planes):
+    image = _make_image(mode)
+    bit_depth = BIT_DEPTHS[mode]
+    
+    metrics = evaluate_bit_plane_reconstruction(image, planes)
+    
+    error = np.asarray(image).astype(np.float64) - _expected_array(image, planes)
+    mse = float(np.mean(error ** 2))
+    
+    assert metrics["bit_depth"] == bit_depth
+    assert metrics["planes"] == sorted(planes)
+    assert metrics["mse"] == pytest.approx(mse)
+    assert metrics["max_error"] == int(error.max())
+    if mse == 0:
+        assert metrics["psnr"] == float('inf')
+    else:
+        peak = (1 << bit_depth) - 1
+        assert metrics["psnr"] == pytest.approx(10 * math.log10(peak ** 2 / mse))
+    
+    plane_bytes = math.ceil(image.width * image.height / 8)
+    assert metrics["original_bytes"] == plane_bytes * bit_depth
+    assert metrics["compressed_bytes"] == plane_bytes * len(planes)
+    assert metrics["savings"] == pytest.approx(1 - len(planes) / bit_depth)
+
+
+def test_cache_follows_the_image():
+    first = _make_image('L')
+    second = Image.fromarray(255 - np.asarray(first))
+    
+    reconstruct_from_bit_planes(first, [7])
+    result = reconstruct_from_bit_planes(second, [7])
+    
+    np.testing.assert_array_equal(np.asarray(result), _expected_array(second, [7]))
+
+
+def test_invalid_plane_raises():
+    image = _make_image('L')
+    
+    with pytest.raises(ValueError):
+        reconstruct_from_bit_planes(image, [8])
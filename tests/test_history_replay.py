@@ -0,0 +1,126 @@
+"""
+Testes da reaplicação de operações no histórico: os passos que guardam apenas
+a operação devem produzir as mesmas imagens que seriam gravadas em disco
+"""
+
+import tempfile
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.core.operations import Operation
+from henpixy.janela.historico import HistoryManager
+
+OPERATIONS = [
+    Operation("negative"),
+    Operation("power_transform", gamma=0.5),
+    Operation("contrast_stretching", r1=50, s1=20, r2=200, s2=230),
+    Operation("equalize_histogram"),
+    Operation("negative"),
+    Operation("power_transform", gamma=2.0),
+    Operation("reconstruct_from_bit_planes", planes=[4, 5, 6, 7]),
+    Operation("negative"),
+    Operation("power_transform", gamma=1.5),
+    Operation("negative"),
+]
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    """Direciona os diretórios de sessão do histórico para um diretório temporário do teste"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def _make_image():
+    """Cria uma imagem de teste pequena e determinística"""
+    rng = np.random.default_rng(33)
+    return Image.fromarray(rng.integers(0, 256, (24, 32), dtype=np.uint8))
+
+
+def _fill_history(manager, operations):
+    """Adiciona a imagem original e os passos ao histórico, retornando as imagens esperadas"""
+    image = _make_image()
+    manager.add_item(image, "Imagem original")
+    expected = [image]
+    for operation in operations:
+        image = operation.apply(image)
+        manager.add_item(image, operation.name, operation)
+        expected.append(image)
+    return expected
+
+
+def _assert_same_image(result, expected):
+    """Compara modo, tamanho e pixels de duas imagens"""
+    assert result.mode == expected.mode
+    assert result.size == expected.size
+    assert result.tobytes() == expected.tobytes()
+
+
+def test_cheap_steps_are_replayed_between_checkpoints(temp_dir):
+    manager = HistoryManager(app_name="henpixy-test")
+    try:
+        _fill_history(manager, OPERATIONS)
+        
+        interval = HistoryManager.CHECKPOINT_INTERVAL
+        checkpoints = [index for index, item in enumerate(manager.history_items) if item.is_checkpoint]
+        assert checkpoints == list(range(0, len(OPERATIONS) + 1, interval))
+    finally:
+        manager.close()
+
+
+def test_replayed_images_match_direct_results(temp_dir):
+    manager = HistoryManager(app_name="henpixy-test", memory_budget=0)
+    try:
+        expected = _fill_history(manager, OPERATIONS)
+        manager.flush()
+        
+        # Sem memória disponível, cada item é descarregado e recalculado no acesso
+        for index in range(len(expected)):
+            image = manager.go_to_item(index)
+            _assert_same_image(image, expected[index])
+        assert not any(item.is_loaded() for item in manager.history_items[:-1])
+    finally:
+        manager.close()
+
+
+def test_reloaded_history_matches_direct_results(temp_dir):
+    manager = HistoryManager(app_name="henpixy-test")
+    expected = _fill_history(manager, OPERATIONS)
+    manager.go_to_item(5)
+    manager.close()
+    
+    # A próxima instância reaproveita a sessão e reconstrói os itens pelo diário
+    reloaded = HistoryManager(app_name="henpixy-test")
+    try:
+        assert len(reloaded.history_items) == len(expected)
+        assert reloaded.current_index == 5
+        assert [item.is_checkpoint for item in reloaded.history_items] == \
+               [item.is_checkpoint for item in manager.history_items]
+        for item, image in zip(reloaded.history_items, expected):
+            _assert_same_image(item.image, image)
+    finally:
+        reloaded.close()
+
+
+def test_expensive_operation_is_a_checkpoint(temp_dir):
+    manager = HistoryManager(app_name="henpixy-test")
+    try:
+        _fill_history(manager, [Operation("negative"), Operation("median_filter", kernel_size=3)])
+        
+        assert [item.is_checkpoint for item in manager.history_items] == [True, False, True]
+    finally:
+        manager.close()
+
+
+def test_pipeline_reproduces_current_item(temp_dir):
+    manager = HistoryManager(app_name="henpixy-test")
+    try:
+        expected = _fill_history(manager, OPERATIONS)
+        
+        pipeline = manager.get_pipeline()
+        
+        _assert_same_image(pipeline.apply(expected[0]), expected[-1])
+    finally:
+        manager.close()
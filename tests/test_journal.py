@@ -0,0 +1,137 @@
+"""
+Testes do diário do histórico: reconstrução do estado, recuperação de linhas
+incompletas deixadas por gravações interrompidas e compactação
+"""
+
+import json
+import os
+
+import pytest
+
+from henpixy.core.journal import HistoryJournal
+
+
+def _item(name):
+    """Cria os dados de um item do histórico"""
+    return {"description": name, "timestamp": 0, "filepath": f"{name}.hpxs",
+            "thumbnail": None, "operation": None, "checkpoint": True}
+
+RECORDS = [
+    {"type": "add", "position": 0, "item": _item("a")},
+    {"type": "add", "position": 1, "item": _item("b")},
+    {"type": "add", "position": 2, "item": _item("c")},
+    {"type": "index", "current_index": 0},
+    # Um novo item no meio do histórico descarta os posteriores
+    {"type": "add", "position": 1, "item": _item("d")},
+]
+
+EXPECTED_STATE = {"current_index": 1, "items": [_item("a"), _item("d")]}
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Caminho do diário em um diretório temporário do teste"""
+    return str(tmp_path / "history.journal")
+
+
+def _write_records(path, records):
+    """Acrescenta os registros a um diário e o fecha"""
+    journal = HistoryJournal(path)
+    for record in records:
+        journal.append(record)
+    journal.close()
+
+
+def test_records_rebuild_state(journal_path):
+    _write_records(journal_path, RECORDS)
+    
+    journal = HistoryJournal(journal_path)
+    
+    assert journal.read_state() == EXPECTED_STATE
+    assert journal.record_count == len(RECORDS)
+
+
+def test_clear_record_empties_state(journal_path):
+    _write_records(journal_path, RECORDS + [{"type": "clear"}])
+    
+    assert HistoryJournal(journal_path).read_state() == HistoryJournal.empty_state()
+
+
+def test_missing_journal_is_empty(journal_path):
+    journal = HistoryJournal(journal_path)
+    
+    assert journal.read_state() == HistoryJournal.empty_state()
+    assert journal.record_count == 0
+
+
+@pytest.mark.parametrize("torn_line", [
+    b'{"type": "index", "curr',
+    # JSON válido, mas sem a quebra de linha: a gravação pode ter sido interrompida
+    b'{"type": "index", "current_index": 0}',
+])
+def test_torn_last_line_is_dropped(journal_path, torn_line):
+    _write_records(journal_path, RECORDS)
+    valid_size = os.path.getsize(journal_path)
+    with open(journal_path, "ab") as f:
+        f.write(torn_line)
+    
+    journal = HistoryJournal(journal_path)
+    
+    assert journal.read_state() == EXPECTED_STATE
+    assert journal.record_count == len(RECORDS)
+    assert os.path.getsize(journal_path) == valid_size
+
+
+def test_append_after_torn_line_is_readable(journal_path):
+    _write_records(journal_path, RECORDS)
+    with open(journal_path, "ab") as f:
+        f.write(b'{"type": "add", "posi')
+    
+    journal = HistoryJournal(journal_path)
+    journal.read_state()
+    journal.append({"type": "index", "current_index": 0})
+    journal.close()
+    
+    state = HistoryJournal(journal_path).read_state()
+    assert state == dict(EXPECTED_STATE, current_index=0)
+
+
+def test_corrupt_complete_line_is_skipped(journal_path):
+    _write_records(journal_path, RECORDS[:3])
+    with open(journal_path, "ab") as f:
+        f.write(b"registro corrompido\n")
+    _write_records(journal_path, RECORDS[3:])
+    
+    assert HistoryJournal(journal_path).read_state() == EXPECTED_STATE
+
+
+def test_compaction_keeps_state_in_one_record(journal_path):
+    journal = HistoryJournal(journal_path)
+    for record in RECORDS:
+        journal.append(record)
+    
+    journal.compact(journal.read_state())
+    
+    assert journal.record_count == 1
+    assert not os.path.exists(journal_path + ".tmp")
+    with open(journal_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["type"] == "state"
+    
+    reloaded = HistoryJournal(journal_path)
+    assert reloaded.read_state() == EXPECTED_STATE
+
+
+def test_append_after_compaction(journal_path):
+    journal = HistoryJournal(journal_path)
+    for record in RECORDS:
+        journal.append(record)
+    journal.compact(EXPECTED_STATE)
+    
+    journal.append({"type": "add", "position": 2, "item": _item("e")})
+    journal.close()
+    
+    reloaded = HistoryJournal(journal_path)
+    assert reloaded.read_state() == {"current_index": 2, "items": [_item("a"), _item("d"), _item("e")]}
+    assert reloaded.record_count == 2
@@ -0,0 +1,98 @@
+"""
+Testes da execução otimizada de pipelines: Pipeline.apply deve produzir o
+mesmo resultado da aplicação das operações uma a uma
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.core.operations import Operation
+from henpixy.core.pipeline import Pipeline
+
+
+def _make_image(mode):
+    """Cria uma imagem de teste pequena e determinística no modo dado"""
+    rng = np.random.default_rng(42)
+    gray = rng.integers(0, 256, (24, 32), dtype=np.uint8)
+    
+    if mode == 'L':
+        return Image.fromarray(gray)
+    if mode == 'RGB':
+        return Image.fromarray(rng.integers(0, 256, (24, 32, 3), dtype=np.uint8))
+    if mode == 'RGBA':
+        return Image.fromarray(rng.integers(0, 256, (24, 32, 4), dtype=np.uint8))
+    if mode == 'I;16':
+        return Image.fromarray(rng.integers(0, 65536, (24, 32), dtype=np.uint16))
+    if mode == 'LA':
+        return Image.fromarray(rng.integers(0, 256, (24, 32, 2), dtype=np.uint8), 'LA')
+    if mode == 'P':
+        return Image.fromarray(gray).convert('P')
+    if mode == 'F':
+        return Image.fromarray(rng.random((24, 32), dtype=np.float32))
+    raise ValueError(mode)
+
+MODES = ['L', 'LA', 'RGB', 'RGBA', 'I;16', 'P', 'F']
+
+PIPELINES = {
+    "pontuais": [
+        Operation("negative"),
+        Operation("power_transform", gamma=0.5),
+        Operation("contrast_stretching", r1=50, s1=20, r2=200, s2=230),
+    ],
+    "identidade": [
+        Operation("negative"),
+        Operation("negative"),
+    ],
+    "janela_1x1": [
+        Operation("negative"),
+        Operation("mean_filter", kernel_size=1),
+        Operation("median_filter", kernel_size=1),
+        Operation("negative"),
+    ],
+    "janela_1x1_inicial": [
+        Operation("min_filter", kernel_size=1),
+        Operation("negative"),
+    ],
+    "misto": [
+        Operation("power_transform", gamma=2.0),
+        Operation("median_filter", kernel_size=3),
+        Operation("negative"),
+        Operation("zero_intensity"),
+        Operation("max_filter", kernel_size=1),
+    ],
+}
+
+
+def _apply_steps(operations, image):
+    """Aplica as operações uma a uma, sem otimizações"""
+    for operation in operations:
+        image = operation.apply(image)
+    return image
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("name", sorted(PIPELINES))
+def test_pipeline_matches_step_by_step(mode, name):
+    operations = PIPELINES[name]
+    image = _make_image(mode)
+    
+    expected = _apply_steps(operations, image)
+    result = Pipeline(operations).apply(image)
+    
+    assert result.mode == expected.mode
+    assert result.size == expected.size
+    assert result.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_pipeline_reuses_composed_tables(mode):
+    operations = PIPELINES["pontuais"]
+    pipeline = Pipeline(operations)
+    image = _make_image(mode)
+    
+    first = pipeline.apply(image)
+    second = pipeline.apply(image)
+    
+    assert first.mode == second.mode
+    assert first.tobytes() == second.tobytes()
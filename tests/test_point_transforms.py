@@ -0,0 +1,124 @@
+"""
+Testes das transformações pontuais em imagens de 16 bits (modos I;16 e I):
+as tabelas de busca devem produzir o mesmo resultado da fórmula aplicada a
+cada pixel, sem reduzir a imagem para 8 bits
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.tools.contrast_stretching import contrast_stretching
+from henpixy.tools.histogram import equalize_histogram
+from henpixy.tools.negative import negative
+from henpixy.tools.power import power_transform
+
+
+def _make_array():
+    """Cria intensidades de 16 bits pequenas e determinísticas"""
+    rng = np.random.default_rng(16)
+    array = rng.integers(0, 65536, (24, 32), dtype=np.uint16)
+    # Garante os extremos do intervalo
+    array[0, 0] = 0
+    array[0, 1] = 65535
+    return array
+
+
+def _make_image(mode, array):
+    """Cria uma imagem de 16 bits no modo dado (I;16 ou I)"""
+    if mode == 'I;16':
+        return Image.fromarray(array)
+    return Image.fromarray(array.astype(np.int32))
+
+MODES = ['I;16', 'I']
+
+
+def _pixels(image):
+    """Retorna as intensidades da imagem como inteiros de 64 bits"""
+    return np.asarray(image).astype(np.int64)
+
+
+def _expected_power(array, gamma, c=1.0):
+    """Aplica S = c * r^γ diretamente em cada pixel"""
+    normalized = array.astype(np.float32) / np.float32(65535)
+    transformed = np.float32(c) * np.power(normalized, np.float32(gamma)) * np.float32(65535)
+    return np.clip(transformed, 0, 65535).astype(np.uint16)
+
+
+def _expected_contrast(array, r1, s1, r2, s2):
+    """Aplica o alargamento de contraste diretamente em cada pixel"""
+    scale = 65535 / 255.0
+    r1, s1, r2, s2 = r1 * scale, s1 * scale, r2 * scale, s2 * scale
+    a1 = s1 / r1
+    a2 = (s2 - s1) / (r2 - r1)
+    a3 = (65535 - s2) / (65535 - r2)
+    values = array.astype(np.float32)
+    transformed = np.where(
+        values <= r1,
+        a1 * values,
+        np.where(values <= r2, a2 * values + (s1 - a2 * r1), a3 * values + (s2 - a3 * r2))
+    )
+    return np.clip(transformed, 0, 65535).astype(np.uint16)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_negative_keeps_16_bits(mode):
+    array = _make_array()
+    
+    result = negative(_make_image(mode, array))
+    
+    assert result.mode == mode
+    np.testing.assert_array_equal(_pixels(result), 65535 - array.astype(np.int64))
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("gamma", [0.4, 1.0, 2.2])
+def test_power_transform_matches_formula(mode, gamma):
+    array = _make_array()
+    
+    result = power_transform(_make_image(mode, array), gamma)
+    
+    assert result.mode == mode
+    np.testing.assert_array_equal(_pixels(result), _expected_power(array, gamma))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_contrast_stretching_matches_formula(mode):
+    array = _make_array()
+    params = dict(r1=60, s1=20, r2=190, s2=235)
+    
+    result = contrast_stretching(_make_image(mode, array), **params)
+    
+    assert result.mode == mode
+    np.testing.assert_array_equal(_pixels(result), _expected_contrast(array, **params))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_equalization_keeps_mode_and_levels(mode):
+    array = _make_array()
+    
+    result, original_histogram, equalized_histogram, _, _ = equalize_histogram(_make_image(mode, array))
+    
+    assert result.mode == mode
+    assert len(original_histogram) == len(equalized_histogram) == 65536
+    
+    cdf = np.cumsum(np.bincount(array.ravel(), minlength=65536) / array.size)
+    expected = np.round(65535 * cdf).astype(np.uint16)[array]
+    np.testing.assert_array_equal(_pixels(result), expected)
+    np.testing.assert_array_equal(equalized_histogram, np.bincount(expected.ravel(), minlength=65536))
+
+
+def test_mode_i_out_of_range_is_clipped_with_warning(capsys):
+    array = np.array([[-10, 0, 1000], [65535, 70000, 123]], dtype=np.int32)
+    
+    result = negative(Image.fromarray(array))
+    
+    assert "fora do intervalo de 16 bits" in capsys.readouterr().out
+    assert result.mode == 'I'
+    np.testing.assert_array_equal(_pixels(result), 65535 - np.clip(array, 0, 65535))
+
+
+def test_mode_i_in_range_has_no_warning(capsys):
+    negative(_make_image('I', _make_array()))
+    
+    assert "fora do intervalo" not in capsys.readouterr().out
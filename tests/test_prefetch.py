@@ -0,0 +1,162 @@
+"""
+Testes da leitura antecipada: acertos, faltas e cancelamentos do PrefetchCache
+e a ordem e o limite de imagens prontas do PrefetchReader
+"""
+
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from henpixy.core.prefetch import PrefetchCache, PrefetchReader
+
+# Tempo máximo (segundos) de espera pelas threads de leitura
+TIMEOUT = 10
+
+
+class FakeLoader:
+    """Carregador que registra os arquivos lidos e pode bloquear a leitura de alguns deles"""
+    
+    def __init__(self, blocked=(), failing=()):
+        self.loaded = []
+        self.started = {path: threading.Event() for path in blocked}
+        self.release = {path: threading.Event() for path in blocked}
+        self.failing = set(failing)
+        self._lock = threading.Lock()
+    
+    def __call__(self, path):
+        if path in self.started:
+            self.started[path].set()
+            assert self.release[path].wait(TIMEOUT)
+        with self._lock:
+            self.loaded.append(path)
+        if path in self.failing:
+            raise OSError(f"falha simulada: {path}")
+        return Image.new('L', (4, 4), len(self.loaded))
+
+
+@pytest.fixture
+def make_cache():
+    """Cria caches de leitura antecipada encerrados ao fim do teste"""
+    caches = []
+    
+    def make(loader):
+        cache = PrefetchCache(loader)
+        caches.append(cache)
+        return cache
+    
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_prefetched_image_is_a_hit(make_cache):
+    loader = FakeLoader()
+    cache = make_cache(loader)
+    
+    cache.prefetch(["a.png", "b.png"])
+    
+    assert cache.take("a.png").size == (4, 4)
+    assert cache.take("b.png").size == (4, 4)
+    assert loader.loaded == ["a.png", "b.png"]
+
+
+def test_unscheduled_or_taken_image_is_a_miss(make_cache):
+    cache = make_cache(FakeLoader())
+    
+    cache.prefetch(["a.png"])
+    
+    assert cache.take("outro.png") is None
+    assert cache.take("a.png") is not None
+    assert cache.take("a.png") is None
+
+
+def test_failed_read_is_a_miss(make_cache):
+    cache = make_cache(FakeLoader(failing=["a.png"]))
+    
+    cache.prefetch(["a.png"])
+    
+    assert cache.take("a.png") is None
+
+
+def test_take_waits_for_read_in_progress(make_cache):
+    loader = FakeLoader(blocked=["a.png"])
+    cache = make_cache(loader)
+    cache.prefetch(["a.png"])
+    assert loader.started["a.png"].wait(TIMEOUT)
+    
+    results = []
+    taker = threading.Thread(target=lambda: results.append(cache.take("a.png")))
+    taker.start()
+    time.sleep(0.05)
+    assert taker.is_alive()
+    
+    loader.release["a.png"].set()
+    taker.join(TIMEOUT)
+    
+    assert results[0] is not None
+    assert loader.loaded == ["a.png"]
+
+
+def test_new_request_cancels_pending_reads(make_cache):
+    loader = FakeLoader(blocked=["a.png"])
+    cache = make_cache(loader)
+    cache.prefetch(["a.png", "b.png"])
+    assert loader.started["a.png"].wait(TIMEOUT)
+    
+    # b.png ainda não começou a ser lida e deixa de ser necessária
+    cache.prefetch(["a.png", "c.png"])
+    loader.release["a.png"].set()
+    
+    assert cache.take("b.png") is None
+    assert cache.take("a.png") is not None
+    assert cache.take("c.png") is not None
+    assert loader.loaded == ["a.png", "c.png"]
+
+
+def test_repeated_request_does_not_reload(make_cache):
+    loader = FakeLoader()
+    cache = make_cache(loader)
+    
+    cache.prefetch(["a.png"])
+    cache.prefetch(["a.png"])
+    
+    assert cache.take("a.png") is not None
+    assert loader.loaded == ["a.png"]
+
+
+def test_reader_keeps_order_and_reports_errors():
+    paths = [f"{index}.png" for index in range(6)]
+    loader = FakeLoader(failing=["2.png"])
+    
+    with PrefetchReader(paths, loader) as reader:
+        entries = list(reader)
+    
+    assert [path for path, _, _ in entries] == paths
+    assert all(image is not None and error is None for path, image, error in entries if path != "2.png")
+    _, image, error = entries[2]
+    assert image is None and isinstance(error, OSError)
+
+
+def test_reader_limits_images_ahead():
+    paths = [f"{index}.png" for index in range(10)]
+    loader = FakeLoader()
+    
+    with PrefetchReader(paths, loader, depth=2) as reader:
+        next(iter(reader))
+        time.sleep(0.2)
+        # Uma imagem entregue, duas na fila e uma aguardando espaço na fila
+        assert len(loader.loaded) <= 4
+
+
+def test_reader_close_stops_reading():
+    paths = [f"{index}.png" for index in range(10)]
+    loader = FakeLoader()
+    
+    reader = PrefetchReader(paths, loader, depth=1)
+    next(iter(reader))
+    reader.close()
+    
+    assert not reader._thread.is_alive()
+    assert len(loader.loaded) < len(paths)
@@ -0,0 +1,118 @@
+"""
+Testes do cache de resultados: acertos pelo conteúdo da imagem, faltas para
+entradas diferentes, descarte LRU e invalidação dos resumos memorizados
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.core.image_handle import ImageHandle
+from henpixy.core.operations import Operation
+from henpixy.core.result_cache import ResultCache, image_digest
+
+
+def _make_image(seed=38, mode='L'):
+    """Cria uma imagem de teste pequena e determinística"""
+    rng = np.random.default_rng(seed)
+    if mode == 'RGB':
+        return Image.fromarray(rng.integers(0, 256, (24, 32, 3), dtype=np.uint8))
+    return Image.fromarray(rng.integers(0, 256, (24, 32), dtype=np.uint8))
+
+
+def test_same_content_is_a_hit():
+    cache = ResultCache()
+    operation = Operation("power_transform", gamma=0.5)
+    image = _make_image()
+    
+    first = cache.apply(operation, image)
+    # Outra imagem com o mesmo conteúdo também encontra o resultado
+    second = cache.apply(operation, image.copy())
+    
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.tobytes() == second.tobytes() == operation.apply(image).tobytes()
+
+
+@pytest.mark.parametrize("other_operation, other_seed", [
+    (Operation("power_transform", gamma=2.0), 38),
+    (Operation("negative"), 38),
+    (Operation("power_transform", gamma=0.5), 39),
+])
+def test_different_input_is_a_miss(other_operation, other_seed):
+    cache = ResultCache()
+    cache.apply(Operation("power_transform", gamma=0.5), _make_image())
+    
+    result = cache.apply(other_operation, _make_image(other_seed))
+    
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert result.tobytes() == other_operation.apply(_make_image(other_seed)).tobytes()
+
+
+def test_least_recently_used_is_evicted():
+    image_bytes = 24 * 32
+    cache = ResultCache(max_bytes=2 * image_bytes)
+    operations = [Operation("power_transform", gamma=gamma) for gamma in (0.5, 1.5, 2.5)]
+    image = _make_image()
+    
+    cache.apply(operations[0], image)
+    cache.apply(operations[1], image)
+    cache.apply(operations[0], image)  # operations[1] passa a ser o menos recente
+    cache.apply(operations[2], image)
+    
+    assert len(cache) == 2
+    assert cache.total_bytes == 2 * image_bytes
+    
+    cache.apply(operations[0], image)
+    assert cache.hits == 2
+    cache.apply(operations[1], image)
+    assert cache.misses == 4
+
+
+def test_result_larger_than_limit_is_not_stored():
+    cache = ResultCache(max_bytes=10)
+    
+    cache.apply(Operation("negative"), _make_image())
+    
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_changing_result_does_not_affect_cache():
+    cache = ResultCache()
+    operation = Operation("negative")
+    image = _make_image(mode='RGB')
+    
+    result = cache.apply(operation, image)
+    expected = result.tobytes()
+    result.paste((0, 0, 0), (0, 0, 10, 10))
+    
+    assert cache.apply(operation, image).tobytes() == expected
+
+
+@pytest.mark.parametrize("mode", ['L', 'RGB'])
+def test_digest_follows_in_place_changes(mode):
+    # A cópia é uma imagem comum, que pode ser alterada no lugar
+    image = _make_image(mode=mode).copy()
+    view = ImageHandle(image).view()
+    
+    original = image_digest(view)
+    assert image_digest(image) == original
+    assert image_digest(view) == original
+    
+    # A alteração no lugar de uma view somente leitura substitui seu núcleo
+    view.paste(0, (0, 0, 4, 4))
+    assert image_digest(view) != original
+    
+    # Imagens comuns não têm o resumo memorizado
+    image.load()[0, 0] = (255 - image.getpixel((0, 0))) if mode == 'L' else (1, 2, 3)
+    assert image_digest(image) != original
+
+
+def test_digest_follows_palette_changes():
+    image = _make_image().convert('P')
+    original = image_digest(image)
+    
+    palette = image.getpalette()
+    image.putpalette(palette[3:] + palette[:3])
+    
+    assert image_digest(image) != original
@@ -0,0 +1,155 @@
+"""
+Testes das sessões do histórico: cada instância trava o próprio diretório,
+sessões encerradas são reaproveitadas e as sobras de remoções e criações
+interrompidas são coletadas
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from henpixy.core.session import (
+    CREATING_PREFIX,
+    LOCK_FILENAME,
+    TOMBSTONE_PREFIX,
+    HistorySession,
+    _try_lock,
+)
+
+
+@pytest.fixture
+def sessions_dir(tmp_path):
+    """Diretório de sessões em um diretório temporário do teste"""
+    return str(tmp_path / "sessions")
+
+
+def _make_stale_session(sessions_dir, name, modified):
+    """Cria o diretório de uma sessão encerrada, com histórico modificado no instante dado"""
+    session_path = os.path.join(sessions_dir, name)
+    os.makedirs(session_path)
+    open(os.path.join(session_path, LOCK_FILENAME), "w").close()
+    journal_path = os.path.join(session_path, "history.journal")
+    open(journal_path, "w").close()
+    os.utime(journal_path, (modified, modified))
+    return session_path
+
+
+def test_sessions_in_use_are_exclusive(sessions_dir):
+    first = HistorySession.acquire(sessions_dir)
+    second = HistorySession.acquire(sessions_dir)
+    try:
+        assert first.path != second.path
+        assert os.path.isdir(first.path) and os.path.isdir(second.path)
+        
+        # A trava de uma sessão em uso não pode ser obtida por outra abertura do arquivo
+        with open(os.path.join(first.path, LOCK_FILENAME), "r+") as lock_file:
+            assert not _try_lock(lock_file)
+    finally:
+        first.release()
+        second.release()
+
+
+def test_released_session_is_reused(sessions_dir):
+    first = HistorySession.acquire(sessions_dir)
+    first.release()
+    
+    second = HistorySession.acquire(sessions_dir)
+    try:
+        assert second.path == first.path
+    finally:
+        second.release()
+
+
+def test_most_recent_stale_session_is_adopted_and_others_removed(sessions_dir):
+    now = time.time()
+    oldest = _make_stale_session(sessions_dir, "antiga", now - 200)
+    newest = _make_stale_session(sessions_dir, "recente", now)
+    middle = _make_stale_session(sessions_dir, "media", now - 100)
+    
+    session = HistorySession.acquire(sessions_dir)
+    try:
+        assert session.path == newest
+        assert not os.path.exists(oldest)
+        assert not os.path.exists(middle)
+        assert os.listdir(sessions_dir) == ["recente"]
+    finally:
+        session.release()
+
+
+def test_interrupted_removals_and_creations_are_collected(sessions_dir):
+    tombstone = os.path.join(sessions_dir, f"{TOMBSTONE_PREFIX}abc")
+    os.makedirs(os.path.join(tombstone, "dados"))
+    creating = _make_stale_session(sessions_dir, f"{CREATING_PREFIX}interrompida", time.time())
+    
+    session = HistorySession.acquire(sessions_dir)
+    try:
+        assert not os.path.exists(tombstone)
+        assert not os.path.exists(creating)
+        assert os.listdir(sessions_dir) == [os.path.basename(session.path)]
+    finally:
+        session.release()
+
+
+def test_creation_in_progress_is_not_touched(sessions_dir):
+    creating = _make_stale_session(sessions_dir, f"{CREATING_PREFIX}em-andamento", time.time())
+    lock_file = open(os.path.join(creating, LOCK_FILENAME), "r+")
+    assert _try_lock(lock_file)
+    
+    session = HistorySession.acquire(sessions_dir)
+    try:
+        # Uma criação travada pertence a outra instância: não é adotada nem removida
+        assert session.path != creating
+        assert os.path.isdir(creating)
+    finally:
+        session.release()
+        lock_file.close()
+
+
+def test_legacy_directory_is_adopted(sessions_dir, tmp_path):
+    legacy_dir = tmp_path / "history"
+    legacy_dir.mkdir()
+    (legacy_dir / "history.json").write_text("{}")
+    
+    session = HistorySession.acquire(sessions_dir, legacy_dir=str(legacy_dir))
+    try:
+        assert not legacy_dir.exists()
+        assert os.path.exists(os.path.join(session.path, "history.json"))
+        assert not os.path.basename(session.path).startswith(CREATING_PREFIX)
+    finally:
+        session.release()
+
+
+def test_session_of_finished_process_is_reused(sessions_dir):
+    # Outro processo obtém uma sessão e a mantém até receber uma linha
+    script = (
+        "import sys\n"
+        "from henpixy.core.session import HistorySession\n"
+        f"session = HistorySession.acquire({sessions_dir!r})\n"
+        "print(session.path, flush=True)\n"
+        "sys.stdin.readline()\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    process = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, text=True, env=env)
+    try:
+        other_path = process.stdout.readline().strip()
+        
+        session = HistorySession.acquire(sessions_dir)
+        assert session.path != other_path
+        session.release()
+    finally:
+        # Encerrado o processo, o sistema libera a trava de sua sessão
+        process.communicate("\n", timeout=30)
+    
+    # A sessão com histórico mais recente é a adotada
+    open(os.path.join(other_path, "history.journal"), "w").close()
+    
+    reused = HistorySession.acquire(sessions_dir)
+    try:
+        assert reused.path == other_path
+    finally:
+        reused.release()
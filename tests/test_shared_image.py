@@ -0,0 +1,107 @@
+"""
+Testes da transferência de imagens por memória compartilhada: process_images
+deve entregar os mesmos resultados do pipeline e liberar todos os blocos,
+inclusive quando é interrompido ou um processo falha
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.batch import process_images
+from henpixy.core.operations import Operation
+from henpixy.core.pipeline import Pipeline
+from henpixy.core.shared_image import SharedImage
+
+PIPELINE = Pipeline([
+    Operation("negative"),
+    Operation("mean_filter", kernel_size=3),
+])
+
+# Blocos de memória compartilhada do sistema (Linux)
+SHM_DIR = "/dev/shm"
+
+
+def _make_image(seed, mode='RGB'):
+    """Cria uma imagem de teste pequena e determinística no modo dado"""
+    rng = np.random.default_rng(seed)
+    if mode == 'RGB':
+        return Image.fromarray(rng.integers(0, 256, (24, 32, 3), dtype=np.uint8))
+    if mode == 'I;16':
+        return Image.fromarray(rng.integers(0, 65536, (24, 32), dtype=np.uint16))
+    if mode == 'F':
+        return Image.fromarray(rng.random((24, 32), dtype=np.float32))
+    return Image.fromarray(rng.integers(0, 256, (24, 32), dtype=np.uint8)).convert(mode)
+
+
+@pytest.fixture
+def shm_blocks():
+    """Verifica, ao fim do teste, que nenhum bloco de memória compartilhada ficou no sistema"""
+    if not os.path.isdir(SHM_DIR):
+        pytest.skip("Blocos de memória compartilhada não são listáveis neste sistema")
+    
+    def list_blocks():
+        return {name for name in os.listdir(SHM_DIR) if name.startswith("psm_")}
+    
+    before = list_blocks()
+    yield
+    assert list_blocks() - before == set()
+
+
+@pytest.mark.parametrize("mode", ['L', 'LA', 'RGB', 'RGBA', 'I;16', 'F'])
+def test_shared_image_round_trip(shm_blocks, mode):
+    image = _make_image(0, mode)
+    
+    shared = SharedImage.create(image)
+    attached = SharedImage.attach(shared.descriptor)
+    try:
+        result = attached.read_image()
+    finally:
+        attached.close()
+        shared.unlink()
+    
+    assert result.mode == image.mode
+    assert result.tobytes() == image.tobytes()
+
+
+def test_unsupported_mode_is_rejected():
+    with pytest.raises(ValueError):
+        SharedImage.create(_make_image(0, 'P'))
+
+
+def test_results_match_pipeline(shm_blocks):
+    images = [_make_image(seed) for seed in range(6)]
+    
+    results = list(process_images(PIPELINE, images, workers=2))
+    
+    assert len(results) == len(images)
+    for image, result in zip(images, results):
+        assert result.tobytes() == PIPELINE.apply(image).tobytes()
+
+
+def test_interrupted_iteration_releases_blocks(shm_blocks):
+    images = [_make_image(seed) for seed in range(8)]
+    
+    results = process_images(PIPELINE, images, workers=2)
+    first = next(results)
+    results.close()
+    
+    assert first.tobytes() == PIPELINE.apply(images[0]).tobytes()
+
+
+def test_worker_error_releases_blocks(shm_blocks):
+    # Três fatias exigem quatro cores: a operação falha nos processos do pool
+    pipeline = Pipeline([Operation("intensity_slicing", slices=[64, 128, 192], colors=[[0, 0, 0]])])
+    images = [_make_image(seed, 'L') for seed in range(4)]
+    
+    with pytest.raises(ValueError):
+        list(process_images(pipeline, images, workers=2))
+
+
+def test_unsupported_image_releases_blocks(shm_blocks):
+    images = [_make_image(0), _make_image(1, 'P'), _make_image(2)]
+    
+    with pytest.raises(ValueError):
+        list(process_images(PIPELINE, images, workers=2))
@@ -0,0 +1,124 @@
+"""
+Testes do formato de instantâneos: gravar e ler uma imagem deve preservar o
+modo, os pixels, a paleta e a transparência
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.core.snapshot import (
+    is_snapshot,
+    open_snapshot_array,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+def _make_image(mode):
+    """Cria uma imagem de teste pequena e determinística no modo dado"""
+    rng = np.random.default_rng(34)
+    gray = rng.integers(0, 256, (24, 32), dtype=np.uint8)
+    
+    if mode in ('1', 'L', 'LA', 'RGB', 'RGBA', 'CMYK'):
+        image = Image.fromarray(rng.integers(0, 256, (24, 32, 4), dtype=np.uint8), 'RGBA')
+        return image.convert(mode)
+    if mode == 'P':
+        return Image.fromarray(gray).convert('RGB').quantize(16)
+    if mode == 'PA':
+        image = _make_image('P').convert('PA')
+        image.putalpha(Image.fromarray(gray))
+        return image
+    if mode in ('I;16', 'I;16B'):
+        return Image.fromarray(rng.integers(0, 65536, (24, 32), dtype=np.uint16)).convert(mode)
+    if mode == 'I':
+        return Image.fromarray(rng.integers(-2 ** 20, 2 ** 20, (24, 32), dtype=np.int32))
+    if mode == 'F':
+        return Image.fromarray(rng.random((24, 32), dtype=np.float32))
+    raise ValueError(mode)
+
+MODES = ['1', 'L', 'P', 'PA', 'LA', 'RGB', 'RGBA', 'CMYK', 'I;16', 'I;16B', 'I', 'F']
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip_preserves_pixels(tmp_path, mode, compress):
+    image = _make_image(mode)
+    filepath = str(tmp_path / "imagem.hpxs")
+    
+    write_snapshot(image, filepath, compress)
+    result = read_snapshot(filepath)
+    
+    assert is_snapshot(filepath)
+    assert result.mode == image.mode
+    assert result.size == image.size
+    assert result.tobytes() == image.tobytes()
+    assert not os.path.exists(filepath + ".tmp")
+
+
+@pytest.mark.parametrize("mode", ['P', 'PA'])
+def test_round_trip_preserves_palette(tmp_path, mode):
+    image = _make_image(mode)
+    filepath = str(tmp_path / "imagem.hpxs")
+    
+    write_snapshot(image, filepath)
+    result = read_snapshot(filepath)
+    
+    assert result.palette.mode == image.palette.mode
+    assert result.getpalette(image.palette.mode) == image.getpalette(image.palette.mode)
+    assert result.convert('RGBA').tobytes() == image.convert('RGBA').tobytes()
+
+
+@pytest.mark.parametrize("mode, transparency", [
+    ('P', bytes(range(0, 256, 16))),
+    ('P', 3),
+    ('L', 128),
+    ('RGB', (10, 20, 30)),
+])
+def test_round_trip_preserves_transparency(tmp_path, mode, transparency):
+    image = _make_image(mode)
+    image.info["transparency"] = transparency
+    filepath = str(tmp_path / "imagem.hpxs")
+    
+    write_snapshot(image, filepath)
+    result = read_snapshot(filepath)
+    
+    assert result.info["transparency"] == transparency
+    assert result.convert('RGBA').tobytes() == image.convert('RGBA').tobytes()
+
+
+@pytest.mark.parametrize("mode", ['L', 'LA', 'RGB', 'RGBA', 'I;16', 'I;16B', 'I', 'F'])
+def test_snapshot_array_matches_pixels(tmp_path, mode):
+    image = _make_image(mode)
+    filepath = str(tmp_path / "imagem.hpxs")
+    
+    write_snapshot(image, filepath)
+    array = open_snapshot_array(filepath)
+    
+    np.testing.assert_array_equal(array, np.asarray(image))
+
+
+def test_compressed_snapshot_cannot_be_mapped(tmp_path):
+    filepath = str(tmp_path / "imagem.hpxs")
+    write_snapshot(_make_image('L'), filepath, compress=True)
+    
+    with pytest.raises(ValueError):
+        open_snapshot_array(filepath)
+
+
+def test_failed_write_keeps_previous_snapshot(tmp_path, monkeypatch):
+    image = _make_image('RGB')
+    filepath = str(tmp_path / "imagem.hpxs")
+    write_snapshot(image, filepath)
+    
+    def failing_fsync(fd):
+        raise OSError("falha simulada")
+    
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        write_snapshot(_make_image('L'), filepath)
+    
+    assert read_snapshot(filepath).tobytes() == image.tobytes()
+    assert not os.path.exists(filepath + ".tmp")
@@ -0,0 +1,120 @@
+"""
+Testes do processamento por blocos: process_tiled deve produzir o mesmo
+resultado da operação aplicada à imagem inteira
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from henpixy.core.operations import Operation
+from henpixy.core.tiled import TiledImage, process_tiled
+from henpixy.tools.cancellation import CancellationToken, OperationCancelled
+from henpixy.tools.image_utils import get_native_array
+
+# Blocos pequenos, que não dividem a imagem igualmente
+TILE_SIZE = 16
+
+
+def _make_image(mode):
+    """Cria uma imagem de teste pequena e determinística no modo dado"""
+    rng = np.random.default_rng(46)
+    
+    if mode == 'L':
+        return Image.fromarray(rng.integers(0, 256, (37, 50), dtype=np.uint8))
+    if mode == 'LA':
+        return Image.fromarray(rng.integers(0, 256, (37, 50, 2), dtype=np.uint8), 'LA')
+    if mode == 'RGB':
+        return Image.fromarray(rng.integers(0, 256, (37, 50, 3), dtype=np.uint8))
+    if mode == 'RGBA':
+        return Image.fromarray(rng.integers(0, 256, (37, 50, 4), dtype=np.uint8))
+    if mode == 'I;16':
+        return Image.fromarray(rng.integers(0, 65536, (37, 50), dtype=np.uint16))
+    raise ValueError(mode)
+
+MODES = ['L', 'LA', 'RGB', 'RGBA', 'I;16']
+
+OPERATIONS = [
+    Operation("negative"),
+    Operation("zero_intensity"),
+    Operation("power_transform", gamma=0.5),
+    Operation("contrast_stretching", r1=50, s1=20, r2=200, s2=230),
+    Operation("intensity_slicing", slices=[64, 128, 192],
+              colors=[[0, 0, 255], [0, 255, 0], [255, 0, 0], [255, 255, 0]]),
+    Operation("mean_filter", kernel_size=3),
+    Operation("mean_filter", kernel_size=5),
+    Operation("min_filter", kernel_size=3),
+    Operation("max_filter", kernel_size=5),
+    Operation("median_filter", kernel_size=3),
+    Operation("laplacian_filter"),
+    Operation("laplacian_filter", include_diagonals=False, sharpen_image=True),
+    Operation("equalize_histogram"),
+]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("operation", OPERATIONS, ids=repr)
+def test_tiled_matches_whole_image(mode, operation):
+    image = _make_image(mode)
+    expected = get_native_array(operation.apply(image))
+    
+    source = TiledImage.from_image(image)
+    output = process_tiled(source, operation, tile_size=TILE_SIZE)
+    try:
+        np.testing.assert_array_equal(np.asarray(output.array), expected)
+    finally:
+        output.close()
+        source.close()
+
+
+def test_output_file_is_kept(tmp_path):
+    image = _make_image('L')
+    output_path = str(tmp_path / "saida.npy")
+    source = TiledImage.from_image(image)
+    
+    output = process_tiled(source, Operation("negative"), output_path, tile_size=TILE_SIZE)
+    output.close()
+    source.close()
+    
+    np.testing.assert_array_equal(np.load(output_path), 255 - np.asarray(image))
+
+
+def test_bit_plane_operation_is_rejected():
+    source = TiledImage.from_image(_make_image('L'))
+    try:
+        with pytest.raises(ValueError):
+            process_tiled(source, Operation("extract_bit_plane", plane=7))
+    finally:
+        source.close()
+
+
+def test_floating_point_image_is_rejected():
+    image = Image.fromarray(np.zeros((4, 4), dtype=np.float32))
+    
+    with pytest.raises(ValueError):
+        TiledImage.from_image(image)
+
+
+def test_cancelled_processing_removes_output(tmp_path, monkeypatch):
+    # Os arquivos temporários dos blocos são criados no diretório do teste
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    source = TiledImage.from_image(_make_image('L'))
+    token = CancellationToken()
+    
+    def progress(fraction):
+        # Cancela depois do primeiro bloco, com o arquivo de saída já criado
+        if fraction > 0:
+            token.cancel()
+    
+    try:
+        with pytest.raises(OperationCancelled):
+            process_tiled(source, Operation("negative"), tile_size=TILE_SIZE,
+                          progress=progress, cancel_token=token)
+        assert os.listdir(tmp_path) == [os.path.basename(source.path)]
+    finally:
+        source.close()
+    
+    assert os.listdir(tmp_path) == []